@@ -0,0 +1,26 @@
+"""add_progress_analytics_index
+
+Revision ID: a6d4e2f8c137
+Revises: f3a8b1c7d925
+Create Date: 2026-10-18 20:26:51.207394
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6d4e2f8c137'
+down_revision = 'f3a8b1c7d925'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 进展速度分析按 progress_date 范围扫描并按跟踪人分组，可走仅索引扫描
+    op.create_index('ix_progress_progress_date_tracking_user_id', 'progress', ['progress_date', 'tracking_user_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_progress_progress_date_tracking_user_id', table_name='progress')
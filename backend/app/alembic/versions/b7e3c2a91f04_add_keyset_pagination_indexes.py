@@ -0,0 +1,28 @@
+"""add_keyset_pagination_indexes
+
+Revision ID: b7e3c2a91f04
+Revises: 954804867fbc
+Create Date: 2026-10-18 09:12:31.208114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e3c2a91f04'
+down_revision = '954804867fbc'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 游标分页按 (created_at, id) / (title, id) 定位，需要对应的复合索引
+    op.create_index('ix_project_created_at_id', 'project', ['created_at', 'id'], unique=False)
+    op.create_index('ix_item_title_id', 'item', ['title', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_item_title_id', table_name='item')
+    op.drop_index('ix_project_created_at_id', table_name='project')
@@ -0,0 +1,31 @@
+"""add_milestone_overdue_indexes
+
+Revision ID: b8e5f3a1d246
+Revises: a6d4e2f8c137
+Create Date: 2026-10-18 21:40:13.852716
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8e5f3a1d246'
+down_revision = 'a6d4e2f8c137'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 逾期检测只扫描正常状态的里程碑，标记延期后即移出索引
+    op.create_index('ix_milestone_pending_milestone_date', 'milestone', ['milestone_date'], unique=False,
+                    postgresql_where=sa.text("status = 'NORMAL'"))
+    # 逾期列表：未完成里程碑按 (milestone_date, id) 游标分页
+    op.create_index('ix_milestone_open_milestone_date_id', 'milestone', ['milestone_date', 'id'], unique=False,
+                    postgresql_where=sa.text("status <> 'COMPLETED'"))
+
+
+def downgrade():
+    op.drop_index('ix_milestone_open_milestone_date_id', table_name='milestone')
+    op.drop_index('ix_milestone_pending_milestone_date', table_name='milestone')
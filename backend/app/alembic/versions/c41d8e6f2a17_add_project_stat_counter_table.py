@@ -0,0 +1,50 @@
+"""add_project_stat_counter_table
+
+Revision ID: c41d8e6f2a17
+Revises: b7e3c2a91f04
+Create Date: 2026-10-18 10:03:47.561920
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41d8e6f2a17'
+down_revision = 'b7e3c2a91f04'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 项目统计计数表，由 ProjectService 增量维护
+    op.create_table('project_stat_counter',
+    sa.Column('location', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('project_type', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('status', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('product_name', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('project_count', sa.Integer(), nullable=False),
+    sa.Column('product_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('location', 'project_type', 'status', 'product_name')
+    )
+    # 用现有数据初始化计数（与 ProjectStatisticsService.rebuild 一致）
+    op.execute("""
+        INSERT INTO project_stat_counter
+            (location, project_type, status, product_name, project_count, product_count)
+        SELECT location, project_type, status, '', count(id), 0
+        FROM project
+        GROUP BY location, project_type, status
+    """)
+    op.execute("""
+        INSERT INTO project_stat_counter
+            (location, project_type, status, product_name, project_count, product_count)
+        SELECT p.location, p.project_type, p.status, pp.product_name,
+               count(DISTINCT p.id), count(pp.id)
+        FROM project p JOIN project_product pp ON pp.project_id = p.id
+        GROUP BY p.location, p.project_type, p.status, pp.product_name
+    """)
+
+
+def downgrade():
+    op.drop_table('project_stat_counter')
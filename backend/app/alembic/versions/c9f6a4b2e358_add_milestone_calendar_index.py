@@ -0,0 +1,26 @@
+"""add_milestone_calendar_index
+
+Revision ID: c9f6a4b2e358
+Revises: b8e5f3a1d246
+Create Date: 2026-10-18 22:31:44.097315
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9f6a4b2e358'
+down_revision = 'b8e5f3a1d246'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 跨项目里程碑日历：按日期窗口和状态过滤
+    op.create_index('ix_milestone_milestone_date_status', 'milestone', ['milestone_date', 'status'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_milestone_milestone_date_status', table_name='milestone')
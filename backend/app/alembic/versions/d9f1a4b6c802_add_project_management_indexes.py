@@ -0,0 +1,42 @@
+"""add_project_management_indexes
+
+Revision ID: d9f1a4b6c802
+Revises: c41d8e6f2a17
+Create Date: 2026-10-18 14:05:47.331902
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9f1a4b6c802'
+down_revision = 'c41d8e6f2a17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 外键索引：关系加载和按项目删除子表时使用
+    op.create_index(op.f('ix_project_product_project_id'), 'project_product', ['project_id'], unique=False)
+    op.create_index(op.f('ix_role_assignment_project_id'), 'role_assignment', ['project_id'], unique=False)
+    op.create_index(op.f('ix_milestone_project_id'), 'milestone', ['project_id'], unique=False)
+    op.create_index(op.f('ix_progress_tracking_user_id'), 'progress', ['tracking_user_id'], unique=False)
+    # 进展时间线按 (project_id, progress_date) 排序，同时覆盖 progress.project_id 外键
+    op.create_index('ix_progress_project_id_progress_date', 'progress', ['project_id', 'progress_date'], unique=False)
+    # 看板筛选
+    op.create_index(op.f('ix_project_location'), 'project', ['location'], unique=False)
+    op.create_index('ix_project_status_location_project_type', 'project', ['status', 'location', 'project_type'], unique=False)
+    op.create_index('ix_project_product_product_name_project_id', 'project_product', ['product_name', 'project_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_project_product_product_name_project_id', table_name='project_product')
+    op.drop_index('ix_project_status_location_project_type', table_name='project')
+    op.drop_index(op.f('ix_project_location'), table_name='project')
+    op.drop_index('ix_progress_project_id_progress_date', table_name='progress')
+    op.drop_index(op.f('ix_progress_tracking_user_id'), table_name='progress')
+    op.drop_index(op.f('ix_milestone_project_id'), table_name='milestone')
+    op.drop_index(op.f('ix_role_assignment_project_id'), table_name='role_assignment')
+    op.drop_index(op.f('ix_project_product_project_id'), table_name='project_product')
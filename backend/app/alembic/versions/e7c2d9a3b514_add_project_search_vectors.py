@@ -0,0 +1,57 @@
+"""add_project_search_vectors
+
+Revision ID: e7c2d9a3b514
+Revises: d9f1a4b6c802
+Create Date: 2026-10-18 16:22:09.874512
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7c2d9a3b514'
+down_revision = 'd9f1a4b6c802'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 全文检索列由数据库生成并维护，应用代码无需写入；'simple' 配置不做词干处理，适合中英文混排
+    op.execute("""
+        ALTER TABLE project ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(background, '')), 'B')
+        ) STORED
+    """)
+    op.execute("""
+        ALTER TABLE progress ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            to_tsvector('simple', coalesce(description, ''))
+        ) STORED
+    """)
+    op.execute("""
+        ALTER TABLE milestone ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            to_tsvector('simple', coalesce(description, ''))
+        ) STORED
+    """)
+    op.create_index('ix_project_search_vector', 'project', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index('ix_progress_search_vector', 'progress', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index('ix_milestone_search_vector', 'milestone', ['search_vector'], unique=False, postgresql_using='gin')
+
+    # 中文项目名没有空格分词，用三元组索引支持子串匹配
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index(
+        'ix_project_name_trgm', 'project', ['name'], unique=False,
+        postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'},
+    )
+
+
+def downgrade():
+    op.drop_index('ix_project_name_trgm', table_name='project')
+    op.drop_index('ix_milestone_search_vector', table_name='milestone')
+    op.drop_index('ix_progress_search_vector', table_name='progress')
+    op.drop_index('ix_project_search_vector', table_name='project')
+    op.drop_column('milestone', 'search_vector')
+    op.drop_column('progress', 'search_vector')
+    op.drop_column('project', 'search_vector')
@@ -0,0 +1,30 @@
+"""add_data_version_table
+
+Revision ID: f3a8b1c7d925
+Revises: e7c2d9a3b514
+Create Date: 2026-10-18 19:12:08.614207
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a8b1c7d925'
+down_revision = 'e7c2d9a3b514'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 数据版本计数表，项目相关写操作在同一事务内递增，用于生成 ETag
+    op.create_table('data_version',
+    sa.Column('name', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade():
+    op.drop_table('data_version')
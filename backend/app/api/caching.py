@@ -0,0 +1,58 @@
+import hashlib
+
+from fastapi import Request, Response
+
+from app.core.compression import strip_etag_coding
+from app.core.config import settings
+
+
+def make_etag(*parts: object) -> str:
+    """Strong ETag derived from the parts that identify a representation."""
+    digest = hashlib.sha1(":".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def matching_etag(request: Request, etag: str) -> str | None:
+    """
+    The ``If-None-Match`` tag that matches ``etag`` under weak comparison
+    (RFC 9110 13.1.2), or None.
+
+    Compressed bodies carry ``etag`` with the content coding appended, so a
+    client holding the gzip representation matches too.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    if header.strip() == "*":
+        return etag
+    for tag in header.split(","):
+        candidate = tag.strip()
+        if strip_etag_coding(candidate.removeprefix("W/")) == etag:
+            return candidate
+    return None
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    return matching_etag(request, etag) is not None
+
+
+def cache_headers(etag: str) -> dict[str, str]:
+    # Responses depend on the caller being authenticated, so shared caches must not keep them
+    return {
+        "ETag": etag,
+        "Cache-Control": f"private, max-age={settings.HTTP_CACHE_MAX_AGE_SECONDS}, must-revalidate",
+    }
+
+
+def check_not_modified(request: Request, response: Response, etag: str) -> Response | None:
+    """
+    Return a 304 response when the client already holds ``etag``.
+
+    Otherwise set the caching headers on ``response`` and return None, so the
+    endpoint goes on to build the body.
+    """
+    if matched := matching_etag(request, etag):
+        # Echo the representation the client holds, including its content coding
+        return Response(status_code=304, headers=cache_headers(matched))
+    response.headers.update(cache_headers(etag))
+    return None
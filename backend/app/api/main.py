@@ -4,6 +4,8 @@ from app.api.routes import items, login, private, users, utils
 from app.api.routes.rbac import router as rbac_router
 from app.api.routes.projects import router as projects_router
 from app.api.routes.product_dict import router as product_dict_router
+from app.api.routes.analytics import router as analytics_router
+from app.api.routes.milestones import router as milestones_router
 from app.core.config import settings
 
 api_router = APIRouter()
@@ -14,6 +16,8 @@ api_router.include_router(items.router)
 api_router.include_router(rbac_router)
 api_router.include_router(projects_router, prefix="/projects", tags=["projects"])
 api_router.include_router(product_dict_router, prefix="/product-dict", tags=["product-dict"])
+api_router.include_router(analytics_router, prefix="/analytics", tags=["analytics"])
+api_router.include_router(milestones_router, prefix="/milestones", tags=["milestones"])
 
 
 if settings.ENVIRONMENT == "local":
@@ -0,0 +1,96 @@
+from datetime import datetime
+from typing import Any, Optional
+
+from fastapi import APIRouter, Depends, Request, Response
+
+from app.api.caching import check_not_modified, make_etag
+from app.api.deps import SessionDep, get_current_user
+from app.services.analytics_service import ProjectAnalyticsService
+from app.services.data_version import PROJECTS_DATA_VERSION, USERS_DATA_VERSION, get_data_version
+from app.schemas_pm import (
+    AnalyticsGranularity, ProjectAnalyticsFilter,
+    ProjectsCreatedSeries, MilestoneRateSeries, ProgressVelocitySeries,
+)
+
+# 所有分析接口都要求登录
+router = APIRouter(dependencies=[Depends(get_current_user)])
+
+
+def _analytics_etag(
+    session: SessionDep, request: Request, versions: tuple[str, ...] = (PROJECTS_DATA_VERSION,)
+) -> str:
+    # 序列只随所列数据版本变化，版本号加查询参数即可标识
+    return make_etag(
+        request.url.path, request.url.query, *(get_data_version(session, name) for name in versions)
+    )
+
+
+@router.get("/projects-created", response_model=ProjectsCreatedSeries)
+def read_projects_created(
+    *,
+    session: SessionDep,
+    request: Request,
+    response: Response,
+    granularity: AnalyticsGranularity = "week",
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    location: Optional[str] = None,
+    project_type: Optional[str] = None,
+) -> Any:
+    """
+    按时间桶和属地统计新建项目数，start_date/end_date 作用于创建时间
+    """
+    if not_modified := check_not_modified(request, response, _analytics_etag(session, request)):
+        return not_modified
+    filters = ProjectAnalyticsFilter(
+        start_date=start_date, end_date=end_date, location=location, project_type=project_type
+    )
+    return ProjectAnalyticsService(session).projects_created(granularity, filters)
+
+
+@router.get("/milestone-rates", response_model=MilestoneRateSeries)
+def read_milestone_rates(
+    *,
+    session: SessionDep,
+    request: Request,
+    response: Response,
+    granularity: AnalyticsGranularity = "month",
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    location: Optional[str] = None,
+    project_type: Optional[str] = None,
+) -> Any:
+    """
+    按里程碑日期分桶统计完成率和延期率，start_date/end_date 作用于里程碑日期
+    """
+    if not_modified := check_not_modified(request, response, _analytics_etag(session, request)):
+        return not_modified
+    filters = ProjectAnalyticsFilter(
+        start_date=start_date, end_date=end_date, location=location, project_type=project_type
+    )
+    return ProjectAnalyticsService(session).milestone_rates(granularity, filters)
+
+
+@router.get("/progress-velocity", response_model=ProgressVelocitySeries)
+def read_progress_velocity(
+    *,
+    session: SessionDep,
+    request: Request,
+    response: Response,
+    granularity: AnalyticsGranularity = "week",
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    location: Optional[str] = None,
+    project_type: Optional[str] = None,
+) -> Any:
+    """
+    按时间桶和跟踪人统计进展录入数，start_date/end_date 作用于进展时间
+    """
+    # 序列带有跟踪人的显示名，用户资料变更也要让 ETag 失效
+    etag = _analytics_etag(session, request, (PROJECTS_DATA_VERSION, USERS_DATA_VERSION))
+    if not_modified := check_not_modified(request, response, etag):
+        return not_modified
+    filters = ProjectAnalyticsFilter(
+        start_date=start_date, end_date=end_date, location=location, project_type=project_type
+    )
+    return ProjectAnalyticsService(session).progress_velocity(granularity, filters)
@@ -2,9 +2,10 @@ import uuid
 from typing import Any
 
 from fastapi import APIRouter, HTTPException
-from sqlmodel import func, select
+from sqlmodel import col, func, select
 
 from app.api.deps import CurrentUser, SessionDep
+from app.core.pagination import keyset_paginate, split_page
 from app.models import Item, ItemCreate, ItemPublic, ItemsPublic, ItemUpdate, Message
 
 router = APIRouter(prefix="/items", tags=["items"])
@@ -12,17 +13,23 @@ router = APIRouter(prefix="/items", tags=["items"])
 
 @router.get("/", response_model=ItemsPublic)
 def read_items(
-    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+    session: SessionDep,
+    current_user: CurrentUser,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
 ) -> Any:
     """
     Retrieve items.
+
+    Pass the previous page's ``next_cursor`` as ``cursor`` to seek by
+    (title, id) instead of skipping rows.
     """
 
     if current_user.is_superuser:
         count_statement = select(func.count()).select_from(Item)
         count = session.exec(count_statement).one()
-        statement = select(Item).offset(skip).limit(limit)
-        items = session.exec(statement).all()
+        statement = select(Item)
     else:
         count_statement = (
             select(func.count())
@@ -30,15 +37,18 @@ def read_items(
             .where(Item.owner_id == current_user.id)
         )
         count = session.exec(count_statement).one()
-        statement = (
-            select(Item)
-            .where(Item.owner_id == current_user.id)
-            .offset(skip)
-            .limit(limit)
-        )
-        items = session.exec(statement).all()
+        statement = select(Item).where(Item.owner_id == current_user.id)
+
+    statement = keyset_paginate(
+        statement, [col(Item.title), col(Item.id)], cursor=cursor, limit=limit
+    )
+    if not cursor:
+        statement = statement.offset(skip)
+    items, next_cursor = split_page(
+        session.exec(statement).all(), limit, lambda item: (item.title, item.id)
+    )
 
-    return ItemsPublic(data=items, count=count)
+    return ItemsPublic(data=items, count=count, next_cursor=next_cursor)
 
 
 @router.get("/{id}", response_model=ItemPublic)
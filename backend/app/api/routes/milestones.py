@@ -0,0 +1,71 @@
+from datetime import datetime
+from typing import Any, List, Optional
+
+from fastapi import APIRouter, Depends, Query
+
+from app.api.deps import SessionDep, get_current_user
+from app.decorators.permissions import require_superuser
+from app.services.milestone_service import MilestoneService
+from app.models_pm import MilestoneStatus
+from app.schemas_pm import OverdueMilestonePage, ProjectMilestonePage
+
+router = APIRouter()
+
+
+@router.get("/", response_model=ProjectMilestonePage, dependencies=[Depends(get_current_user)])
+def read_milestones(
+    *,
+    session: SessionDep,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    status: Optional[List[MilestoneStatus]] = Query(default=None),
+    location: Optional[str] = None,
+    project_type: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+) -> Any:
+    """
+    跨项目的里程碑日历
+
+    返回日期窗口 [start_date, end_date) 内所有项目的里程碑，可按状态（可多选）、属地、项目类型过滤，
+    每条里程碑带所属项目名称；按 (milestone_date, id) 游标分页（空 cursor 表示第一页）
+    """
+    milestones, next_cursor = MilestoneService(session).get_milestones(
+        cursor=cursor,
+        limit=limit,
+        start_date=start_date,
+        end_date=end_date,
+        statuses=status,
+        location=location,
+        project_type=project_type,
+    )
+    return ProjectMilestonePage(data=milestones, next_cursor=next_cursor)
+
+
+@router.get(
+    "/overdue", response_model=OverdueMilestonePage, dependencies=[Depends(get_current_user)]
+)
+def read_overdue_milestones(
+    *,
+    session: SessionDep,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    location: Optional[str] = None,
+    project_type: Optional[str] = None,
+) -> Any:
+    """
+    获取所有项目中已过期未完成的里程碑，从最早到期开始游标分页（空 cursor 表示第一页）
+    """
+    milestones, next_cursor = MilestoneService(session).get_overdue(
+        cursor=cursor, limit=limit, location=location, project_type=project_type
+    )
+    return OverdueMilestonePage(data=milestones, next_cursor=next_cursor)
+
+
+@router.post("/overdue/mark", dependencies=[Depends(require_superuser)])
+def mark_overdue_milestones(*, session: SessionDep) -> Any:
+    """
+    立即执行一次逾期检测，把已过期的正常里程碑标记为延期（仅超级用户）
+    """
+    marked = MilestoneService(session).mark_overdue()
+    return {"marked": marked}
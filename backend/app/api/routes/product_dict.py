@@ -1,11 +1,11 @@
-from typing import List
+from typing import List, Optional, Union
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException
 from sqlmodel import Session
 
 from app.api.deps import SessionDep, CurrentUser
 from app.services.product_dict_service import ProductDictService
-from app.schemas_pm import ProductDict, ProductDictCreate, ProductDictUpdate
+from app.schemas_pm import ProductDict, ProductDictCreate, ProductDictPage, ProductDictUpdate
 
 router = APIRouter()
 
@@ -24,18 +24,24 @@ def create_product_dict(
     return product_dict_service.create_product_dict(product_dict_in)
 
 
-@router.get("/", response_model=List[ProductDict])
+@router.get("/", response_model=Union[List[ProductDict], ProductDictPage])
 def read_product_dicts(
     *,
     session: SessionDep,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: CurrentUser,
-) -> List[ProductDict]:
+) -> Union[List[ProductDict], ProductDictPage]:
     """
     获取产品字典列表
+
+    传入 cursor 时使用游标分页（空字符串表示第一页），返回 data 和 next_cursor
     """
     product_dict_service = ProductDictService(session)
+    if cursor is not None:
+        product_dicts, next_cursor = product_dict_service.get_product_dicts_page(cursor=cursor, limit=limit)
+        return ProductDictPage(data=product_dicts, next_cursor=next_cursor)
     return product_dict_service.get_product_dicts(skip=skip, limit=limit)
 
 
@@ -1,150 +1,342 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Literal, Optional, Dict, Any, Union
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Query
+from datetime import datetime
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
 from sqlmodel import Session
 
-from app.api.deps import SessionDep, CurrentUser
-from app.services.project_service import ProjectService
+from app.api.caching import check_not_modified, make_etag
+from app.api.deps import AsyncCurrentUser, AsyncSessionDep, CurrentUser, SessionDep
+from app.models_pm import ProgressType
+from app.services.async_project_service import AsyncProjectService
+from app.services.project_export_service import ProjectExportService
+from app.services.project_service import PROJECT_CURSOR_SORT_KEYS
+from app.services.project_import_service import (
+    ProjectImportService, iter_csv_rows, iter_jsonl_rows
+)
 from app.schemas_pm import (
-    Project, ProjectCreate, ProjectUpdate,
+    Project, ProjectCreate, ProjectUpdate, ProjectPage, ProjectBulkDelete, ProjectImportResult,
+    ProjectFilter, ProjectSortKey, ProjectSearchPage,
+    ProjectSummary, ProjectSummaryPage, ProjectView,
     ProjectProduct, ProjectProductCreate,
     RoleAssignment, RoleAssignmentCreate,
     Milestone, MilestoneCreate, MilestoneUpdate,
     Progress, ProgressCreate, ProgressUpdate,
-    ProjectStatistics
+    ProjectStatistics, ProjectDashboard
 )
 
 router = APIRouter()
 
 
 @router.post("/", response_model=Project)
-def create_project(
+async def create_project(
     *,
-    session: SessionDep,
-    current_user: CurrentUser,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
     project_in: ProjectCreate,
 ) -> Any:
     """
     创建新项目
     """
-    project_service = ProjectService(session)
-    project = project_service.create_project(project_in)
+    project_service = AsyncProjectService(session)
+    project = await project_service.create_project(project_in)
     return project
 
 
-@router.get("/", response_model=List[Project])
-def read_projects(
+@router.get(
+    "/",
+    response_model=Union[List[Project], List[ProjectSummary], ProjectPage, ProjectSummaryPage],
+)
+async def read_projects(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    current_user: CurrentUser,
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    project_type: Optional[str] = None,
+    location: Optional[str] = None,
+    product: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    min_amount: Optional[float] = None,
+    max_amount: Optional[float] = None,
+    sort: ProjectSortKey = "-created_at",
+    view: ProjectView = "full",
+    current_user: AsyncCurrentUser,
 ) -> Any:
     """
     获取项目列表
-    """
-    project_service = ProjectService(session)
-    projects = project_service.get_projects(skip=skip, limit=limit)
+
+    支持按状态、类型、属地、产品、创建日期范围、合同金额范围过滤，sort 指定排序键（前缀 - 为倒序）。
+    过滤后的总数通过 X-Total-Count 响应头返回。
+    传入 cursor 时使用游标分页（空字符串表示第一页），返回 data 和 next_cursor，总数只在第一页计算；
+    否则保持原有的 skip/limit 分页。
+    view=summary 时只返回摘要列和产品名称，不加载里程碑、角色和进展
+    """
+    filters = ProjectFilter(
+        status=status,
+        project_type=project_type,
+        location=location,
+        product=product,
+        start_date=start_date,
+        end_date=end_date,
+        min_amount=min_amount,
+        max_amount=max_amount,
+    )
+    project_service = AsyncProjectService(session)
+    summary = view == "summary"
+    if cursor is not None:
+        if sort.lstrip("-") not in PROJECT_CURSOR_SORT_KEYS:
+            raise HTTPException(status_code=400, detail=f"Cursor pagination does not support sort={sort}")
+        get_page = (
+            project_service.get_project_summaries_page if summary else project_service.get_projects_page
+        )
+        projects, next_cursor = await get_page(cursor=cursor, limit=limit, filters=filters, sort=sort)
+        total = await project_service.count_projects(filters) if not cursor else None
+        if total is not None:
+            response.headers["X-Total-Count"] = str(total)
+        page_model = ProjectSummaryPage if summary else ProjectPage
+        return page_model(data=projects, next_cursor=next_cursor, total=total)
+    get_list = project_service.get_project_summaries if summary else project_service.get_projects_with_total
+    projects, total = await get_list(skip=skip, limit=limit, filters=filters, sort=sort)
+    response.headers["X-Total-Count"] = str(total)
     return projects
 
 
-@router.get("/statistics", response_model=ProjectStatistics)
-def get_project_statistics(
+@router.post("/bulk-delete")
+async def bulk_delete_projects(
+    *,
+    session: AsyncSessionDep,
+    bulk_in: ProjectBulkDelete,
+    current_user: AsyncCurrentUser,
+) -> Any:
+    """
+    批量删除项目，所有项目在一个事务内删除，不存在的 id 会被忽略
+    """
+    project_service = AsyncProjectService(session)
+    deleted = await project_service.delete_projects(bulk_in.project_ids)
+    return {"status": "success", "deleted": deleted}
+
+
+@router.post("/import", response_model=ProjectImportResult)
+def import_projects(
     *,
     session: SessionDep,
+    file: UploadFile = File(...),
+    format: Optional[Literal["csv", "jsonl"]] = None,
+    batch_size: int = Query(default=500, ge=1, le=5000),
     current_user: CurrentUser,
+) -> Any:
+    """
+    批量导入项目
+
+    上传 CSV 或 JSON Lines 文件（未指定 format 时按扩展名判断），逐行按 ProjectCreate 校验，
+    合法行分批写入，返回导入数量和逐行错误。CSV 的 products / milestones / role_assignments 列填写 JSON 数组。
+    导入是长时间的同步 I/O，因此使用同步会话在线程池中执行。
+    """
+    if format is None:
+        filename = (file.filename or "").lower()
+        format = "jsonl" if filename.endswith((".jsonl", ".ndjson")) else "csv"
+    rows = iter_jsonl_rows(file.file) if format == "jsonl" else iter_csv_rows(file.file)
+    import_service = ProjectImportService(session)
+    return import_service.import_rows(rows, batch_size=batch_size)
+
+
+@router.get("/export")
+async def export_projects(
+    *,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    include_progresses: bool = False,
+    status: Optional[str] = None,
+    location: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    current_user: AsyncCurrentUser,
+) -> Any:
+    """
+    流式导出项目及其产品、里程碑、角色分配（可选包含进展）
+
+    NDJSON 每行一个项目；CSV 每行一个项目，子表列为 JSON 数组，可直接用导入接口重新导入。
+    日期范围按项目创建时间过滤。
+    """
+    filters = ProjectFilter(status=status, location=location, start_date=start_date, end_date=end_date)
+    export_service = ProjectExportService(filters, include_progresses=include_progresses)
+    if format == "csv":
+        content, media_type = export_service.iter_csv(), "text/csv; charset=utf-8"
+    else:
+        content, media_type = export_service.iter_ndjson(), "application/x-ndjson"
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="projects.{format}"'},
+    )
+
+
+@router.get("/search", response_model=ProjectSearchPage)
+async def search_projects(
+    *,
+    session: AsyncSessionDep,
+    q: str = Query(min_length=1, max_length=200),
+    limit: int = Query(default=20, ge=1, le=100),
+    offset: int = Query(default=0, ge=0),
+    current_user: AsyncCurrentUser,
+) -> Any:
+    """
+    检索项目名称、背景、进展描述和里程碑描述，按相关度排序分页返回命中片段
+    """
+    project_service = AsyncProjectService(session)
+    return await project_service.search_projects(q, limit=limit, offset=offset)
+
+
+@router.get("/dashboard", response_model=ProjectDashboard)
+async def get_project_dashboard(
+    *,
+    session: AsyncSessionDep,
+    request: Request,
+    response: Response,
+    current_user: AsyncCurrentUser,
+) -> Any:
+    """
+    获取统计看板数据：属地、产品、类型统计，属地-产品桑基图和产品-类型矩阵
+
+    一条 GROUPING SETS 查询算出全部结果，替代 /statistics 下的三个接口
+    """
+    project_service = AsyncProjectService(session)
+    etag = make_etag(request.url.path, await project_service.get_data_version())
+    if not_modified := check_not_modified(request, response, etag):
+        return not_modified
+    return await project_service.get_dashboard()
+
+
+@router.get("/statistics", response_model=ProjectStatistics)
+async def get_project_statistics(
+    *,
+    session: AsyncSessionDep,
+    request: Request,
+    response: Response,
+    current_user: AsyncCurrentUser,
 ) -> Any:
     """
     获取项目统计信息
+
+    ETag 由项目数据版本生成，If-None-Match 命中时直接返回 304，不做统计查询
     """
-    project_service = ProjectService(session)
-    statistics = project_service.get_project_statistics()
+    project_service = AsyncProjectService(session)
+    etag = make_etag(request.url.path, await project_service.get_data_version())
+    if not_modified := check_not_modified(request, response, etag):
+        return not_modified
+    statistics = await project_service.get_project_statistics()
     return statistics
 
 
 @router.get("/statistics/location-product-relationship")
-def get_location_product_relationship(
+async def get_location_product_relationship(
     *,
-    session: SessionDep,
-    current_user: CurrentUser,
+    session: AsyncSessionDep,
+    request: Request,
+    response: Response,
+    current_user: AsyncCurrentUser,
 ) -> Any:
     """
     获取区域-产品关联数据，用于桑基图
+
+    ETag 由项目数据版本生成，If-None-Match 命中时直接返回 304，不做统计查询
     """
-    project_service = ProjectService(session)
-    relationship_data = project_service.get_location_product_relationship()
+    project_service = AsyncProjectService(session)
+    etag = make_etag(request.url.path, await project_service.get_data_version())
+    if not_modified := check_not_modified(request, response, etag):
+        return not_modified
+    relationship_data = await project_service.get_location_product_relationship()
     return relationship_data
 
 
 @router.get("/statistics/product-type")
-def get_product_type_statistics(
+async def get_product_type_statistics(
     *,
-    session: SessionDep,
-    current_user: CurrentUser,
+    session: AsyncSessionDep,
+    request: Request,
+    response: Response,
+    current_user: AsyncCurrentUser,
 ) -> Any:
     """
     获取按产品和项目类型的统计数据
+
+    ETag 由项目数据版本生成，If-None-Match 命中时直接返回 304，不做统计查询
     """
-    project_service = ProjectService(session)
-    statistics = project_service.get_product_type_statistics()
+    project_service = AsyncProjectService(session)
+    etag = make_etag(request.url.path, await project_service.get_data_version())
+    if not_modified := check_not_modified(request, response, etag):
+        return not_modified
+    statistics = await project_service.get_product_type_statistics()
     return statistics
 
 
-@router.get("/{project_id}", response_model=Project)
-def read_project(
+@router.get("/{project_id}", response_model=Union[Project, ProjectSummary])
+async def read_project(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
     project_id: UUID,
-    current_user: CurrentUser,
+    view: ProjectView = "full",
+    request: Request,
+    response: Response,
+    current_user: AsyncCurrentUser,
 ) -> Any:
     """
-    获取项目详情
+    获取项目详情，view=summary 时只返回摘要
+
+    ETag 由项目数据版本生成，If-None-Match 命中时直接返回 304，不查询项目
     """
-    project_service = ProjectService(session)
-    project = project_service.get_project(project_id)
+    project_service = AsyncProjectService(session)
+    etag = make_etag(request.url.path, view, await project_service.get_data_version())
+    if not_modified := check_not_modified(request, response, etag):
+        return not_modified
+    if view == "summary":
+        project = await project_service.get_project_summary(project_id)
+    else:
+        project = await project_service.get_project(project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     return project
 
 
 @router.put("/{project_id}", response_model=Project)
-def update_project(
+async def update_project(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
     project_id: UUID,
     project_in: ProjectUpdate,
-    current_user: CurrentUser,
+    current_user: AsyncCurrentUser,
 ) -> Any:
     """
     更新项目信息
     """
-    project_service = ProjectService(session)
-    project = project_service.get_project(project_id)
-    if not project:
+    project_service = AsyncProjectService(session)
+    if not await project_service.project_exists(project_id):
         raise HTTPException(status_code=404, detail="Project not found")
-    project = project_service.update_project(project_id, project_in)
+    project = await project_service.update_project(project_id, project_in)
     return project
 
 
 @router.post("/{project_id}/close")
-def close_project(
+async def close_project(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
     project_id: UUID,
-    current_user: CurrentUser,
+    current_user: AsyncCurrentUser,
 ) -> Any:
     """
     关闭项目（将项目状态设置为"关闭"）
     """
-    project_service = ProjectService(session)
-    project = project_service.get_project(project_id)
-    if not project:
+    project_service = AsyncProjectService(session)
+    if not await project_service.project_exists(project_id):
         raise HTTPException(status_code=404, detail="Project not found")
     
     # 更新项目状态为"关闭"
     from app.schemas_pm import ProjectUpdate
     project_update = ProjectUpdate(status="关闭")
-    updated_project = project_service.update_project(project_id, project_update)
+    updated_project = await project_service.update_project(project_id, project_update)
     
     if not updated_project:
         raise HTTPException(status_code=500, detail="Failed to close project")
@@ -153,24 +345,23 @@ def close_project(
 
 
 @router.post("/{project_id}/complete")
-def complete_project(
+async def complete_project(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
     project_id: UUID,
-    current_user: CurrentUser,
+    current_user: AsyncCurrentUser,
 ) -> Any:
     """
     完成项目（将项目状态设置为"完成"）
     """
-    project_service = ProjectService(session)
-    project = project_service.get_project(project_id)
-    if not project:
+    project_service = AsyncProjectService(session)
+    if not await project_service.project_exists(project_id):
         raise HTTPException(status_code=404, detail="Project not found")
     
     # 更新项目状态为"完成"
     from app.schemas_pm import ProjectUpdate
     project_update = ProjectUpdate(status="完成")
-    updated_project = project_service.update_project(project_id, project_update)
+    updated_project = await project_service.update_project(project_id, project_update)
     
     if not updated_project:
         raise HTTPException(status_code=500, detail="Failed to complete project")
@@ -179,56 +370,54 @@ def complete_project(
 
 
 @router.delete("/{project_id}")
-def delete_project(
+async def delete_project(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
     project_id: UUID,
-    current_user: CurrentUser,
+    current_user: AsyncCurrentUser,
 ) -> Any:
     """
     删除项目
     """
-    project_service = ProjectService(session)
-    project = project_service.get_project(project_id)
-    if not project:
+    project_service = AsyncProjectService(session)
+    if not await project_service.project_exists(project_id):
         raise HTTPException(status_code=404, detail="Project not found")
-    project_service.delete_project(project_id)
+    await project_service.delete_project(project_id)
     return {"status": "success"}
 
 
 # 角色分配路由
 @router.post("/{project_id}/roles", response_model=RoleAssignment)
-def create_role_assignment(
+async def create_role_assignment(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
     project_id: UUID,
     role_in: RoleAssignmentCreate,
-    current_user: CurrentUser,
+    current_user: AsyncCurrentUser,
 ) -> Any:
     """
     添加角色分配
     """
-    project_service = ProjectService(session)
-    project = project_service.get_project(project_id)
-    if not project:
+    project_service = AsyncProjectService(session)
+    if not await project_service.project_exists(project_id):
         raise HTTPException(status_code=404, detail="Project not found")
-    role_assignment = project_service.add_role_assignment(project_id, role_in)
+    role_assignment = await project_service.add_role_assignment(project_id, role_in)
     return role_assignment
 
 
 @router.delete("/{project_id}/roles/{role_id}")
-def delete_role_assignment(
+async def delete_role_assignment(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
     project_id: UUID,
     role_id: UUID,
-    current_user: CurrentUser,
+    current_user: AsyncCurrentUser,
 ) -> Any:
     """
     删除角色分配
     """
-    project_service = ProjectService(session)
-    success = project_service.delete_role_assignment(role_id)
+    project_service = AsyncProjectService(session)
+    success = await project_service.delete_role_assignment(role_id)
     if not success:
         raise HTTPException(status_code=404, detail="Role assignment not found")
     return {"status": "success"}
@@ -236,81 +425,77 @@ def delete_role_assignment(
 
 # 里程碑路由
 @router.post("/{project_id}/milestones", response_model=Milestone)
-def create_milestone(
+async def create_milestone(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
     project_id: UUID,
     milestone_in: MilestoneCreate,
-    current_user: CurrentUser,
+    current_user: AsyncCurrentUser,
 ) -> Any:
     """
     添加里程碑
     """
-    project_service = ProjectService(session)
-    project = project_service.get_project(project_id)
-    if not project:
+    project_service = AsyncProjectService(session)
+    if not await project_service.project_exists(project_id):
         raise HTTPException(status_code=404, detail="Project not found")
-    milestone = project_service.add_milestone(project_id, milestone_in)
+    milestone = await project_service.add_milestone(project_id, milestone_in)
     return milestone
 
 
 @router.put("/{project_id}/milestones/{milestone_id}", response_model=Milestone)
-def update_milestone(
+async def update_milestone(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
     project_id: UUID,
     milestone_id: UUID,
     milestone_in: MilestoneUpdate,
-    current_user: CurrentUser,
+    current_user: AsyncCurrentUser,
 ) -> Any:
     """
     更新里程碑
     """
-    project_service = ProjectService(session)
-    project = project_service.get_project(project_id)
-    if not project:
+    project_service = AsyncProjectService(session)
+    if not await project_service.project_exists(project_id):
         raise HTTPException(status_code=404, detail="Project not found")
     milestone_data = milestone_in.dict(exclude_unset=True)
-    milestone = project_service.update_milestone(milestone_id, milestone_data)
+    milestone = await project_service.update_milestone(milestone_id, milestone_data)
     if not milestone:
         raise HTTPException(status_code=404, detail="Milestone not found")
     return milestone
 
 
 @router.get("/{project_id}/milestones", response_model=List[Milestone])
-def read_project_milestones(
+async def read_project_milestones(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
     project_id: UUID,
-    current_user: CurrentUser,
+    current_user: AsyncCurrentUser,
 ) -> Any:
     """
     获取项目里程碑列表
     """
-    project_service = ProjectService(session)
-    project = project_service.get_project(project_id)
-    if not project:
+    project_service = AsyncProjectService(session)
+    if not await project_service.project_exists(project_id):
         raise HTTPException(status_code=404, detail="Project not found")
-    milestones = project_service.get_project_milestones(project_id)
+    milestones = await project_service.get_project_milestones(project_id)
     return milestones
 
 
 @router.delete("/{project_id}/milestones/{milestone_id}")
-def delete_milestone(
+async def delete_milestone(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
     project_id: UUID,
     milestone_id: UUID,
-    current_user: CurrentUser,
+    current_user: AsyncCurrentUser,
 ) -> Any:
     """
     删除里程碑
     """
-    project_service = ProjectService(session)
-    project = project_service.get_project(project_id)
-    if not project:
+    project_service = AsyncProjectService(session)
+    if not await project_service.project_exists(project_id):
         raise HTTPException(status_code=404, detail="Project not found")
-    success = project_service.delete_milestone(milestone_id)
+    success = await project_service.delete_milestone(milestone_id)
     if not success:
         raise HTTPException(status_code=404, detail="Milestone not found")
     return {"status": "success"}
@@ -318,81 +503,87 @@ def delete_milestone(
 
 # 进展路由
 @router.post("/{project_id}/progresses", response_model=Progress)
-def create_progress(
+async def create_progress(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
     project_id: UUID,
     progress_in: ProgressCreate,
-    current_user: CurrentUser,
+    current_user: AsyncCurrentUser,
 ) -> Any:
     """
     添加进展
     """
-    project_service = ProjectService(session)
-    project = project_service.get_project(project_id)
-    if not project:
+    project_service = AsyncProjectService(session)
+    if not await project_service.project_exists(project_id):
         raise HTTPException(status_code=404, detail="Project not found")
-    progress = project_service.add_progress(project_id, progress_in)
+    progress = await project_service.add_progress(project_id, progress_in)
     return progress
 
 
 @router.put("/{project_id}/progresses/{progress_id}", response_model=Progress)
-def update_progress(
+async def update_progress(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
     project_id: UUID,
     progress_id: UUID,
     progress_in: ProgressUpdate,
-    current_user: CurrentUser,
+    current_user: AsyncCurrentUser,
 ) -> Any:
     """
     更新进展
     """
-    project_service = ProjectService(session)
-    project = project_service.get_project(project_id)
-    if not project:
+    project_service = AsyncProjectService(session)
+    if not await project_service.project_exists(project_id):
         raise HTTPException(status_code=404, detail="Project not found")
     progress_data = progress_in.dict(exclude_unset=True)
-    progress = project_service.update_progress(progress_id, progress_data)
+    progress = await project_service.update_progress(progress_id, progress_data)
     if not progress:
         raise HTTPException(status_code=404, detail="Progress not found")
     return progress
 
 
 @router.get("/{project_id}/progresses")
-def read_project_progresses(
+async def read_project_progresses(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
     project_id: UUID,
-    current_user: CurrentUser,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    progress_type: Optional[ProgressType] = None,
+    limit: Optional[int] = Query(default=None, ge=1),
+    current_user: AsyncCurrentUser,
 ) -> Any:
     """
-    获取项目进展列表
+    获取项目进展列表，按进展日期倒序，可按日期范围、进展类型过滤并限制条数
     """
-    project_service = ProjectService(session)
-    project = project_service.get_project(project_id)
-    if not project:
+    project_service = AsyncProjectService(session)
+    if not await project_service.project_exists(project_id):
         raise HTTPException(status_code=404, detail="Project not found")
-    progresses = project_service.get_project_progresses(project_id)
+    progresses = await project_service.get_project_progresses(
+        project_id,
+        start_date=start_date,
+        end_date=end_date,
+        progress_type=progress_type,
+        limit=limit,
+    )
     return progresses
 
 
 @router.delete("/{project_id}/progresses/{progress_id}")
-def delete_progress(
+async def delete_progress(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
     project_id: UUID,
     progress_id: UUID,
-    current_user: CurrentUser,
+    current_user: AsyncCurrentUser,
 ) -> Any:
     """
     删除进展
     """
-    project_service = ProjectService(session)
-    project = project_service.get_project(project_id)
-    if not project:
+    project_service = AsyncProjectService(session)
+    if not await project_service.project_exists(project_id):
         raise HTTPException(status_code=404, detail="Project not found")
-    success = project_service.delete_progress(progress_id)
+    success = await project_service.delete_progress(progress_id)
     if not success:
         raise HTTPException(status_code=404, detail="Progress not found")
     return {"status": "success"}
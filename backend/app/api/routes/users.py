@@ -11,6 +11,7 @@ from app.api.deps import (
     get_current_active_superuser,
 )
 from app.core.config import settings
+from app.core.pagination import keyset_paginate, split_page
 from app.core.security import get_password_hash, verify_password
 from app.models import (
     Item,
@@ -24,6 +25,7 @@ from app.models import (
     UserUpdate,
     UserUpdateMe,
 )
+from app.services.user_cache import invalidate_user
 from app.utils import generate_new_account_email, send_email
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -34,18 +36,29 @@ router = APIRouter(prefix="/users", tags=["users"])
     dependencies=[Depends(get_current_active_superuser)],
     response_model=UsersPublic,
 )
-def read_users(session: SessionDep, skip: int = 0, limit: int = 100) -> Any:
+def read_users(
+    session: SessionDep, skip: int = 0, limit: int = 100, cursor: str | None = None
+) -> Any:
     """
     Retrieve users.
+
+    Pass the previous page's ``next_cursor`` as ``cursor`` to seek by
+    (email, id) instead of skipping rows.
     """
 
     count_statement = select(func.count()).select_from(User)
     count = session.exec(count_statement).one()
 
-    statement = select(User).offset(skip).limit(limit)
-    users = session.exec(statement).all()
+    statement = keyset_paginate(
+        select(User), [col(User.email), col(User.id)], cursor=cursor, limit=limit
+    )
+    if not cursor:
+        statement = statement.offset(skip)
+    users, next_cursor = split_page(
+        session.exec(statement).all(), limit, lambda user: (user.email, user.id)
+    )
 
-    return UsersPublic(data=users, count=count)
+    return UsersPublic(data=users, count=count, next_cursor=next_cursor)
 
 
 @router.post(
@@ -93,6 +106,7 @@ def update_user_me(
     current_user.sqlmodel_update(user_data)
     session.add(current_user)
     session.commit()
+    invalidate_user(session, current_user.id)
     session.refresh(current_user)
     return current_user
 
@@ -114,6 +128,7 @@ def update_password_me(
     current_user.hashed_password = hashed_password
     session.add(current_user)
     session.commit()
+    invalidate_user(session, current_user.id)
     return Message(message="Password updated successfully")
 
 
@@ -136,6 +151,7 @@ def delete_user_me(session: SessionDep, current_user: CurrentUser) -> Any:
         )
     session.delete(current_user)
     session.commit()
+    invalidate_user(session, current_user.id)
     return Message(message="User deleted successfully")
 
 
@@ -223,4 +239,5 @@ def delete_user(
     session.exec(statement)  # type: ignore
     session.delete(user)
     session.commit()
+    invalidate_user(session, user_id)
     return Message(message="User deleted successfully")
@@ -2,7 +2,17 @@ from fastapi import APIRouter, Depends
 from pydantic.networks import EmailStr
 
 from app.api.deps import get_current_active_superuser
-from app.models import Message
+from app.core.db import async_engine, engine
+from app.core.security import password_hasher
+from app.models import (
+    CacheStats,
+    CacheStatsReport,
+    DatabasePoolStats,
+    Message,
+    PasswordHasherStats,
+)
+from app.services.permission_cache import permission_cache
+from app.services.user_cache import user_cache
 from app.utils import generate_test_email, send_email
 
 router = APIRouter(prefix="/utils", tags=["utils"])
@@ -26,6 +36,48 @@ def test_email(email_to: EmailStr) -> Message:
     return Message(message="Test email sent")
 
 
+@router.get(
+    "/pool-stats/",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=DatabasePoolStats,
+)
+def pool_stats() -> DatabasePoolStats:
+    """
+    Database connection pool statistics for this worker process, for the sync and async engines.
+    """
+    return DatabasePoolStats(
+        sync_pool=engine.pool.stats(),  # type: ignore[attr-defined]
+        async_pool=async_engine.pool.stats(),  # type: ignore[attr-defined]
+    )
+
+
+@router.get(
+    "/cache-stats/",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=CacheStatsReport,
+)
+def cache_stats() -> CacheStatsReport:
+    """
+    In-process cache hit/miss counters for this worker process.
+    """
+    return CacheStatsReport(
+        user=CacheStats(**user_cache.stats()),
+        permission=CacheStats(**permission_cache.stats()),
+    )
+
+
+@router.get(
+    "/password-hasher-stats/",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=PasswordHasherStats,
+)
+def password_hasher_stats() -> PasswordHasherStats:
+    """
+    Password hashing pool load for this worker process.
+    """
+    return PasswordHasherStats(**password_hasher.stats())
+
+
 @router.get("/health-check/")
 async def health_check() -> bool:
     return True
@@ -0,0 +1,188 @@
+import zlib
+from typing import Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+
+CONTENT_CODINGS = ("br", "gzip")
+
+
+def etag_for_coding(etag: str, coding: str) -> str:
+    """
+    Strong ETag of the ``coding``-encoded body, e.g. ``"abc"`` -> ``"abc-gzip"``.
+
+    A strong validator promises byte-identical bodies, so the compressed
+    representation must not share it with the identity one. Weak ETags only
+    promise semantic equivalence and are returned unchanged.
+    """
+    if etag.startswith('"') and etag.endswith('"'):
+        return f'{etag[:-1]}-{coding}"'
+    return etag
+
+
+def strip_etag_coding(etag: str) -> str:
+    """Inverse of :func:`etag_for_coding`."""
+    for coding in CONTENT_CODINGS:
+        suffix = f'-{coding}"'
+        if etag.endswith(suffix):
+            return f'{etag[: -len(suffix)]}"'
+    return etag
+
+
+class Compressor(Protocol):
+    def process(self, data: bytes) -> bytes: ...
+
+    def finish(self) -> bytes: ...
+
+
+class GZipCompressor:
+    def __init__(self, level: int) -> None:
+        # wbits=31 writes a gzip header and trailer around the deflate stream
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def process(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class BrotliCompressor:
+    def __init__(self, quality: int) -> None:
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def process(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+def parse_accept_encoding(value: str) -> set[str]:
+    """Codings the client accepts, ignoring those it disables with q=0."""
+    accepted = set()
+    for part in value.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = params.strip().removeprefix("q=").strip() if params else "1"
+        try:
+            if float(q) <= 0:
+                continue
+        except ValueError:
+            continue
+        if coding:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+class CompressionMiddleware:
+    """
+    Compress HTTP responses with brotli or gzip, whichever the client prefers
+    and the server supports.
+
+    Bodies below ``minimum_size`` are passed through untouched, as are
+    responses that already carry a ``Content-Encoding``. Streaming responses
+    are compressed chunk by chunk without buffering the whole body.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1000,
+        gzip_level: int = 6,
+        brotli_enabled: bool = True,
+        brotli_quality: int = 4,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_enabled = brotli_enabled and brotli is not None
+        self.brotli_quality = brotli_quality
+
+    def choose_encoding(self, accept_encoding: str) -> str | None:
+        accepted = parse_accept_encoding(accept_encoding)
+        if self.brotli_enabled and "br" in accepted:
+            return "br"
+        if "gzip" in accepted:
+            return "gzip"
+        return None
+
+    def make_compressor(self, encoding: str) -> Compressor:
+        if encoding == "br":
+            return BrotliCompressor(self.brotli_quality)
+        return GZipCompressor(self.gzip_level)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            encoding = self.choose_encoding(Headers(scope=scope).get("Accept-Encoding", ""))
+            if encoding is not None:
+                responder = CompressionResponder(self.app, self, encoding)
+                await responder(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+class CompressionResponder:
+    def __init__(self, app: ASGIApp, middleware: CompressionMiddleware, encoding: str) -> None:
+        self.app = app
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send: Send
+        self.initial_message: Message = {}
+        self.started = False
+        self.passthrough = False
+        self.compressor: Compressor | None = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Hold the headers back until the first body chunk decides the encoding
+            self.initial_message = message
+            self.passthrough = "content-encoding" in Headers(raw=message["headers"])
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if not self.started:
+            self.started = True
+            if self.passthrough or (len(body) < self.middleware.minimum_size and not more_body):
+                self.passthrough = True
+                await self.send(self.initial_message)
+                await self.send(message)
+                return
+            self.compressor = self.middleware.make_compressor(self.encoding)
+            headers = MutableHeaders(raw=self.initial_message["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if "etag" in headers:
+                headers["ETag"] = etag_for_coding(headers["etag"], self.encoding)
+            if more_body:
+                del headers["Content-Length"]
+            message["body"] = self._compress(body, more_body)
+            if not more_body:
+                headers["Content-Length"] = str(len(message["body"]))
+            await self.send(self.initial_message)
+            await self.send(message)
+            return
+
+        if not self.passthrough:
+            message["body"] = self._compress(body, more_body)
+        await self.send(message)
+
+    def _compress(self, body: bytes, more_body: bool) -> bytes:
+        assert self.compressor is not None
+        data = self.compressor.process(body)
+        if not more_body:
+            data += self.compressor.finish()
+        return data
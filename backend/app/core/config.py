@@ -68,6 +68,35 @@ class Settings(BaseSettings):
             path=self.POSTGRES_DB,
         )
 
+    # Connection pool, per engine and worker process: the sync and async
+    # engines each keep one, so with `fastapi run --workers 4` the server sees
+    # up to 8 * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # 0 disables the server-side statement timeout
+    DB_STATEMENT_TIMEOUT_MS: int = 0
+    DB_APPLICATION_NAME: str = "backend"
+
+    # Responses smaller than the threshold are sent as-is. Brotli is preferred
+    # when the client accepts it and the optional `brotli` package is installed.
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1000
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_ENABLED: bool = True
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
+    # max-age for ETag-validated API responses; 0 makes clients revalidate
+    # with If-None-Match on every request, which is answered with a bodyless 304
+    HTTP_CACHE_MAX_AGE_SECONDS: int = 0
+
+    # Background job marking past-due milestones as delayed; 0 disables it.
+    # Every worker runs it, which is safe: batches lock rows with SKIP LOCKED.
+    MILESTONE_OVERDUE_INTERVAL_SECONDS: int = 3600
+    MILESTONE_OVERDUE_BATCH_SIZE: int = 1000
+
     SMTP_TLS: bool = True
     SMTP_SSL: bool = False
     SMTP_PORT: int = 587
@@ -90,6 +119,20 @@ class Settings(BaseSettings):
     def emails_enabled(self) -> bool:
         return bool(self.SMTP_HOST and self.EMAILS_FROM_EMAIL)
 
+    # In-process caches; entries in other workers expire after the TTL.
+    # User changes are also broadcast with NOTIFY, so the TTL only bounds staleness
+    # while a worker's listener is disconnected.
+    PERMISSION_CACHE_TTL_SECONDS: int = 60
+    PERMISSION_CACHE_MAX_SIZE: int = 10000
+    USER_CACHE_TTL_SECONDS: int = 30
+    USER_CACHE_MAX_SIZE: int = 10000
+
+    # Password hashing runs on a process pool; 0 processes hashes inline.
+    # Raising the bcrypt cost rehashes existing passwords on their next login.
+    PASSWORD_HASH_PROCESSES: int = 2
+    PASSWORD_HASH_MAX_CONCURRENCY: int = 8
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+
     EMAIL_TEST_USER: EmailStr = "test@example.com"
     FIRST_SUPERUSER: EmailStr
     FIRST_SUPERUSER_PASSWORD: str
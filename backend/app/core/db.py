@@ -1,10 +1,92 @@
+import threading
+import time
+from typing import Any
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from sqlmodel import Session, create_engine, select
 
 from app import crud
 from app.core.config import settings
-from app.models import User, UserCreate
+from app.models import PoolStats, User, UserCreate
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait for a connection."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            with self._stats_lock:
+                self.checkouts += 1
+                self.wait_time_total += waited
+                self.wait_time_max = max(self.wait_time_max, waited)
+
+    def stats(self) -> PoolStats:
+        with self._stats_lock:
+            return PoolStats(
+                size=self.size(),
+                checked_in=self.checkedin(),
+                checked_out=self.checkedout(),
+                overflow=max(self.overflow(), 0),
+                max_overflow=self._max_overflow,
+                timeout=self._timeout,
+                checkouts=self.checkouts,
+                timeouts=self.timeouts,
+                wait_time_total=self.wait_time_total,
+                wait_time_max=self.wait_time_max,
+            )
+
+
+class InstrumentedAsyncAdaptedQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """The same checkout statistics for the async engine's pool."""
+
+
+def get_connect_args() -> dict[str, Any]:
+    connect_args: dict[str, Any] = {"application_name": settings.DB_APPLICATION_NAME}
+    if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+    return connect_args
+
+
+engine = create_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI),
+    poolclass=InstrumentedQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    connect_args=get_connect_args(),
+)
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+# Async engine for async routes (psycopg async driver); it has its own pool
+async_engine = create_async_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI),
+    poolclass=InstrumentedAsyncAdaptedQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    connect_args=get_connect_args(),
+)
 
 
 # make sure all SQLModel models are imported (app.models) before initializing DB
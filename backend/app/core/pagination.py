@@ -0,0 +1,109 @@
+import base64
+import binascii
+import json
+import uuid
+from collections.abc import Callable, Sequence
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, TypeVar
+
+from fastapi import HTTPException
+from sqlalchemy import TypeDecorator, tuple_
+from sqlmodel.sql.expression import SelectOfScalar
+
+T = TypeVar("T")
+
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, uuid.UUID):
+        return {"uuid": str(value)}
+    return value
+
+
+def _load(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        return uuid.UUID(value["uuid"])
+    return value
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode the sort key of the last row of a page into an opaque cursor."""
+    raw = json.dumps([_dump(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _coerce(value: Any, expected: type) -> Any:
+    if value is None:
+        return None
+    if expected is float or expected is Decimal:
+        # bool is an int subclass but never a valid numeric sort key
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise TypeError(value)
+        return Decimal(str(value)) if expected is Decimal else float(value)
+    if not isinstance(value, expected):
+        raise TypeError(value)
+    return value
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> list[Any]:
+    """
+    Decode a cursor into one value per sort column.
+
+    Every value is checked against the Python type of its column, so a
+    tampered cursor is rejected with 400 instead of reaching the database.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list):
+            raise ValueError(cursor)
+        # strict: a cursor with too few or too many values raises ValueError
+        return [_coerce(_load(value), expected) for value, expected in zip(payload, types, strict=True)]
+    except (ValueError, TypeError, KeyError, AttributeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def column_python_type(column: Any) -> type:
+    """Python type of a sort column, looking through type decorators such as AutoString."""
+    column_type = column.type
+    if isinstance(column_type, TypeDecorator):
+        column_type = column_type.impl_instance
+    return column_type.python_type
+
+
+def keyset_paginate(
+    statement: SelectOfScalar[T],
+    columns: Sequence[Any],
+    *,
+    cursor: str | None,
+    limit: int,
+    descending: bool = False,
+) -> SelectOfScalar[T]:
+    """
+    Order ``statement`` by ``columns`` and seek past ``cursor``.
+
+    The last column must be unique (usually the primary key) so the order is
+    total. One extra row is fetched so :func:`split_page` can tell whether a
+    next page exists.
+    """
+    if cursor:
+        key = tuple_(*columns)
+        values = tuple_(*decode_cursor(cursor, [column_python_type(column) for column in columns]))
+        statement = statement.where(key < values if descending else key > values)
+    order_by = [column.desc() if descending else column.asc() for column in columns]
+    return statement.order_by(*order_by).limit(limit + 1)
+
+
+def split_page(
+    rows: Sequence[T], limit: int, key: Callable[[T], Sequence[Any]]
+) -> tuple[list[T], str | None]:
+    """Trim the look-ahead row and build the cursor for the next page."""
+    page = list(rows[:limit])
+    if len(rows) <= limit or not page:
+        return page, None
+    return page, encode_cursor(*key(page[-1]))
+
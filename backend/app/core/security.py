@@ -1,16 +1,28 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import Any, Callable, TypeVar
 
 import jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+)
 
 
 ALGORITHM = "HS256"
 
+T = TypeVar("T")
+
 
 def create_access_token(subject: str | Any, expires_delta: timedelta) -> str:
     expire = datetime.now(timezone.utc) + expires_delta
@@ -19,9 +31,176 @@ def create_access_token(subject: str | Any, expires_delta: timedelta) -> str:
     return encoded_jwt
 
 
+# Module-level so they can be pickled into the worker processes
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify_and_update(password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return pwd_context.verify_and_update(password, hashed_password)
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a bounded process pool so a login burst does not hold the
+    request workers' CPU. At most ``max_concurrency`` operations are queued
+    on the pool; further callers wait on a semaphore and are counted as
+    ``waiting``.
+
+    Async callers (login) wait on an ``asyncio.Semaphore`` and await the pool
+    future, so they hold no threadpool thread while bcrypt runs. Sync callers
+    (user administration) keep their own threading semaphore. A pool whose
+    worker died is replaced and the operation retried once.
+    """
+
+    def __init__(self, processes: int, max_concurrency: int) -> None:
+        self.processes = processes
+        self.max_concurrency = max(max_concurrency, 1)
+        self.completed = 0
+        self.in_flight = 0
+        self.waiting = 0
+        self.restarts = 0
+        self._executor: Executor | None = None
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._async_slots: asyncio.Semaphore | None = None
+        self._async_loop: asyncio.AbstractEventLoop | None = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a process that already runs threads is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _discard_executor(self, executor: Executor) -> None:
+        with self._lock:
+            if self._executor is not executor:
+                return  # another caller already replaced it
+            self._executor = None
+            self.restarts += 1
+        executor.shutdown(wait=False)
+
+    def _get_async_slots(self) -> asyncio.Semaphore:
+        # An asyncio.Semaphore belongs to one event loop
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            self._async_slots = asyncio.Semaphore(self.max_concurrency)
+            self._async_loop = loop
+        assert self._async_slots is not None
+        return self._async_slots
+
+    def _started(self) -> None:
+        with self._lock:
+            self.waiting -= 1
+            self.in_flight += 1
+
+    def _finished(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+
+    def _run(self, fn: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            self.waiting += 1
+        self._slots.acquire()
+        self._started()
+        try:
+            if self.processes <= 0:
+                return fn(*args)
+            executor = self._get_executor()
+            try:
+                return executor.submit(fn, *args).result()
+            except BrokenProcessPool:
+                # A worker died (e.g. killed for memory): replace the pool and retry once
+                self._discard_executor(executor)
+                return self._get_executor().submit(fn, *args).result()
+        finally:
+            self._slots.release()
+            self._finished()
+
+    async def _run_async(self, fn: Callable[..., T], *args: Any) -> T:
+        slots = self._get_async_slots()
+        with self._lock:
+            self.waiting += 1
+        try:
+            await slots.acquire()
+        except BaseException:
+            with self._lock:
+                self.waiting -= 1
+            raise
+        self._started()
+        try:
+            if self.processes <= 0:
+                return await asyncio.to_thread(fn, *args)
+            executor = self._get_executor()
+            try:
+                return await asyncio.wrap_future(executor.submit(fn, *args))
+            except BrokenProcessPool:
+                self._discard_executor(executor)
+                return await asyncio.wrap_future(self._get_executor().submit(fn, *args))
+        finally:
+            slots.release()
+            self._finished()
+
+    def hash(self, password: str) -> str:
+        return self._run(_hash, password)
+
+    def verify_and_update(self, password: str, hashed_password: str) -> tuple[bool, str | None]:
+        return self._run(_verify_and_update, password, hashed_password)
+
+    async def hash_async(self, password: str) -> str:
+        return await self._run_async(_hash, password)
+
+    async def verify_and_update_async(
+        self, password: str, hashed_password: str
+    ) -> tuple[bool, str | None]:
+        return await self._run_async(_verify_and_update, password, hashed_password)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "processes": self.processes,
+                "max_concurrency": self.max_concurrency,
+                "in_flight": self.in_flight,
+                "waiting": self.waiting,
+                "completed": self.completed,
+                "restarts": self.restarts,
+            }
+
+
+password_hasher = PasswordHasher(
+    processes=settings.PASSWORD_HASH_PROCESSES,
+    max_concurrency=settings.PASSWORD_HASH_MAX_CONCURRENCY,
+)
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    verified, _ = password_hasher.verify_and_update(plain_password, hashed_password)
+    return verified
+
+
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """Verify a password and return a new hash if the stored one is outdated."""
+    return password_hasher.verify_and_update(plain_password, hashed_password)
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    return await password_hasher.verify_and_update_async(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return password_hasher.hash(password)
@@ -2,9 +2,16 @@ import uuid
 from typing import Any
 
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core.security import get_password_hash, verify_password
+from app.core.security import (
+    get_password_hash,
+    verify_and_update_password,
+    verify_and_update_password_async,
+)
 from app.models import Item, ItemCreate, User, UserCreate, UserUpdate
+from app.services.permission_cache import permission_cache
+from app.services.user_cache import invalidate_user
 
 
 def create_user(*, session: Session, user_create: UserCreate) -> User:
@@ -27,6 +34,9 @@ def update_user(*, session: Session, db_user: User, user_in: UserUpdate) -> Any:
     db_user.sqlmodel_update(user_data, update=extra_data)
     session.add(db_user)
     session.commit()
+    # is_superuser is part of the compiled permission set
+    permission_cache.invalidate(str(db_user.id))
+    invalidate_user(session, db_user.id)
     session.refresh(db_user)
     return db_user
 
@@ -41,8 +51,33 @@ def authenticate(*, session: Session, email: str, password: str) -> User | None:
     db_user = get_user_by_email(session=session, email=email)
     if not db_user:
         return None
-    if not verify_password(password, db_user.hashed_password):
+    verified, new_hash = verify_and_update_password(password, db_user.hashed_password)
+    if not verified:
         return None
+    if new_hash:
+        # bcrypt cost changed since the hash was stored: rehash transparently
+        db_user.hashed_password = new_hash
+        session.add(db_user)
+        session.commit()
+        invalidate_user(session, db_user.id)
+        session.refresh(db_user)
+    return db_user
+
+
+async def authenticate_async(*, session: AsyncSession, email: str, password: str) -> User | None:
+    """authenticate for async routes: bcrypt is awaited on the hasher's process pool"""
+    statement = select(User).where(User.email == email)
+    db_user = (await session.exec(statement)).first()
+    if not db_user:
+        return None
+    verified, new_hash = await verify_and_update_password_async(password, db_user.hashed_password)
+    if not verified:
+        return None
+    if new_hash:
+        # The user cache does not hold password hashes, so nothing to invalidate
+        db_user.hashed_password = new_hash
+        session.add(db_user)
+        await session.commit()
     return db_user
 
 
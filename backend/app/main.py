@@ -1,10 +1,24 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
+
 import sentry_sdk
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.routing import APIRoute
+from sqlmodel import Session
 from starlette.middleware.cors import CORSMiddleware
 
 from app.api.main import api_router
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
+from app.core.db import async_engine, engine
+from app.core.security import password_hasher
+from app.services.milestone_service import MilestoneService
+from app.services.user_cache import listen_for_user_changes
+
+logger = logging.getLogger(__name__)
 
 
 def custom_generate_unique_id(route: APIRoute) -> str:
@@ -14,10 +28,53 @@ def custom_generate_unique_id(route: APIRoute) -> str:
 if settings.SENTRY_DSN and settings.ENVIRONMENT != "local":
     sentry_sdk.init(dsn=str(settings.SENTRY_DSN), enable_tracing=True)
 
+
+def mark_overdue_milestones() -> int:
+    with Session(engine) as session:
+        return MilestoneService(session).mark_overdue()
+
+
+async def mark_overdue_milestones_periodically(interval: float) -> None:
+    while True:
+        # Wait first so a restarting fleet does not run the job all at once
+        await asyncio.sleep(interval)
+        try:
+            marked = await asyncio.to_thread(mark_overdue_milestones)
+        except Exception:
+            logger.exception("Marking overdue milestones failed")
+        else:
+            if marked:
+                logger.info("Marked %d overdue milestones", marked)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    tasks = []
+    if settings.MILESTONE_OVERDUE_INTERVAL_SECONDS > 0:
+        tasks.append(asyncio.create_task(
+            mark_overdue_milestones_periodically(settings.MILESTONE_OVERDUE_INTERVAL_SECONDS)
+        ))
+    if settings.USER_CACHE_TTL_SECONDS > 0 and settings.USER_CACHE_MAX_SIZE > 0:
+        # Drops cache entries for users changed in other workers
+        tasks.append(asyncio.create_task(listen_for_user_changes()))
+    yield
+    for task in tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    # Async connections must not outlive the event loop that opened them
+    await async_engine.dispose()
+    password_hasher.shutdown()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     generate_unique_id_function=custom_generate_unique_id,
+    lifespan=lifespan,
+    # orjson serializes UUID, datetime and str enums natively and is several
+    # times faster than the stdlib encoder on large list payloads
+    default_response_class=ORJSONResponse,
 )
 
 # Set all CORS enabled origins
@@ -30,4 +87,13 @@ if settings.all_cors_origins:
         allow_headers=["*"],
     )
 
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_enabled=settings.COMPRESSION_BROTLI_ENABLED,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
@@ -0,0 +1,24 @@
+import logging
+
+from sqlmodel import Session
+
+from app.core.db import engine
+from app.services.milestone_service import MilestoneService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def mark_overdue() -> int:
+    with Session(engine) as session:
+        return MilestoneService(session).mark_overdue()
+
+
+def main() -> None:
+    logger.info("Marking overdue milestones as delayed")
+    marked = mark_overdue()
+    logger.info("Marked %d overdue milestones", marked)
+
+
+if __name__ == "__main__":
+    main()
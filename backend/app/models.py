@@ -1,6 +1,7 @@
 import uuid
 
 from pydantic import EmailStr
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship, SQLModel
 
 
@@ -54,6 +55,7 @@ class UserPublic(UserBase):
 class UsersPublic(SQLModel):
     data: list[UserPublic]
     count: int
+    next_cursor: str | None = None
 
 
 # Shared properties
@@ -74,6 +76,8 @@ class ItemUpdate(ItemBase):
 
 # Database model, database table inferred from class name
 class Item(ItemBase, table=True):
+    __table_args__ = (Index("ix_item_title_id", "title", "id"),)
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     owner_id: uuid.UUID = Field(
         foreign_key="user.id", nullable=False, ondelete="CASCADE"
@@ -90,6 +94,7 @@ class ItemPublic(ItemBase):
 class ItemsPublic(SQLModel):
     data: list[ItemPublic]
     count: int
+    next_cursor: str | None = None
 
 
 # Generic message
@@ -97,6 +102,48 @@ class Message(SQLModel):
     message: str
 
 
+# Database connection pool statistics
+class PoolStats(SQLModel):
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    max_overflow: int
+    timeout: float
+    checkouts: int
+    timeouts: int
+    wait_time_total: float
+    wait_time_max: float
+
+
+# Statistics for both engines' pools; each has its own connections
+class DatabasePoolStats(SQLModel):
+    sync_pool: PoolStats
+    async_pool: PoolStats
+
+
+# Hit/miss counters of an in-process cache
+class CacheStats(SQLModel):
+    hits: int
+    misses: int
+    size: int
+
+
+class CacheStatsReport(SQLModel):
+    user: CacheStats
+    permission: CacheStats
+
+
+# Password hashing process pool load
+class PasswordHasherStats(SQLModel):
+    processes: int
+    max_concurrency: int
+    in_flight: int
+    waiting: int
+    completed: int
+    restarts: int
+
+
 # JSON payload containing access token
 class Token(SQLModel):
     access_token: str
@@ -2,6 +2,7 @@ from typing import List, Optional
 from datetime import datetime
 from uuid import UUID, uuid4
 from enum import Enum
+from sqlalchemy import BigInteger, Index, text
 from sqlmodel import Field, SQLModel, Relationship
 
 
@@ -42,9 +43,12 @@ class ProductDict(SQLModel, table=True):
 class ProjectProduct(SQLModel, table=True):
     """项目产品表"""
     __tablename__ = "project_product"
+    __table_args__ = (
+        Index("ix_project_product_product_name_project_id", "product_name", "project_id"),  # 按产品筛选项目
+    )
     
     id: UUID = Field(default_factory=uuid4, primary_key=True)
-    project_id: UUID = Field(foreign_key="project.id")
+    project_id: UUID = Field(foreign_key="project.id", index=True)
     product_name: str = Field()  # 产品名称
     product_amount: Optional[float] = Field(default=None)  # 产品金额
     created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -58,7 +62,7 @@ class RoleAssignment(SQLModel, table=True):
     __tablename__ = "role_assignment"
     
     id: UUID = Field(default_factory=uuid4, primary_key=True)
-    project_id: UUID = Field(foreign_key="project.id")
+    project_id: UUID = Field(foreign_key="project.id", index=True)
     role_name: str = Field(index=True)  # 角色名称，如"行解"、"区解"、"市场"等
     user_name: str = Field()  # 用户姓名
     user_email: Optional[str] = Field(default=None)  # 用户邮箱
@@ -72,8 +76,17 @@ class RoleAssignment(SQLModel, table=True):
 
 class Milestone(SQLModel, table=True):
     """项目里程碑表"""
+    __table_args__ = (
+        # 只含未到期处理的正常里程碑，逾期检测标记延期后即移出索引，扫描量只与新逾期数相关
+        Index("ix_milestone_pending_milestone_date", "milestone_date",
+              postgresql_where=text("status = 'NORMAL'")),
+        # 未完成里程碑按日期排序，逾期列表按 (milestone_date, id) 游标分页
+        Index("ix_milestone_open_milestone_date_id", "milestone_date", "id",
+              postgresql_where=text("status <> 'COMPLETED'")),
+        Index("ix_milestone_milestone_date_status", "milestone_date", "status"),  # 跨项目里程碑日历
+    )
     id: UUID = Field(default_factory=uuid4, primary_key=True)
-    project_id: UUID = Field(foreign_key="project.id")
+    project_id: UUID = Field(foreign_key="project.id", index=True)
     milestone_date: datetime = Field()  # 里程碑日期
     description: str = Field()  # 里程碑描述
     status: MilestoneStatus = Field(default=MilestoneStatus.NORMAL)  # 里程碑状态
@@ -86,11 +99,16 @@ class Milestone(SQLModel, table=True):
 
 class Progress(SQLModel, table=True):
     """项目进展表"""
+    __table_args__ = (
+        Index("ix_progress_project_id_progress_date", "project_id", "progress_date"),  # 项目进展时间线
+        Index("ix_progress_progress_date_tracking_user_id", "progress_date", "tracking_user_id"),  # 进展速度分析
+    )
+
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     project_id: UUID = Field(foreign_key="project.id")
     description: str = Field()  # 进展描述
     progress_type: ProgressType = Field(default=ProgressType.DAILY)  # 进展类型
-    tracking_user_id: UUID = Field(foreign_key="user.id")  # 进展跟踪人
+    tracking_user_id: UUID = Field(foreign_key="user.id", index=True)  # 进展跟踪人
     progress_date: datetime = Field(default_factory=datetime.utcnow)  # 进展记录时间
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -101,10 +119,15 @@ class Progress(SQLModel, table=True):
 
 class Project(SQLModel, table=True):
     """项目表"""
+    __table_args__ = (
+        Index("ix_project_created_at_id", "created_at", "id"),  # 游标分页
+        Index("ix_project_status_location_project_type", "status", "location", "project_type"),  # 看板筛选
+    )
+
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     name: str = Field(index=True)  # 项目名称
     project_type: str = Field()  # 项目类型 (改为字符串以匹配API)
-    location: str = Field()  # 项目属地
+    location: str = Field(index=True)  # 项目属地
     contract_amount: Optional[float] = Field(default=None)  # 合同金额
     background: Optional[str] = Field(default=None)  # 项目背景信息
     import_time: Optional[datetime] = Field(default=None)  # 项目导入时间
@@ -119,6 +142,26 @@ class Project(SQLModel, table=True):
     progresses: List[Progress] = Relationship(back_populates="project")
 
 
+class ProjectStatCounter(SQLModel, table=True):
+    """项目统计计数表，按 属地/项目类型/状态/产品 维度由 ProjectService 增量维护"""
+    __tablename__ = "project_stat_counter"
+
+    location: str = Field(primary_key=True)
+    project_type: str = Field(primary_key=True)
+    status: str = Field(primary_key=True)
+    product_name: str = Field(default="", primary_key=True)  # 空字符串表示项目级计数
+    project_count: int = Field(default=0)  # 去重后的项目数
+    product_count: int = Field(default=0)  # 项目产品行数
+
+
+class DataVersion(SQLModel, table=True):
+    """数据版本计数表，写操作在同一事务内递增，用于生成 ETag"""
+    __tablename__ = "data_version"
+
+    name: str = Field(primary_key=True)
+    version: int = Field(default=0, sa_type=BigInteger)
+
+
 # Pydantic models for API
 class ProjectProductCreate(SQLModel):
     product_name: str
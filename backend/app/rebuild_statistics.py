@@ -0,0 +1,24 @@
+import logging
+
+from sqlmodel import Session
+
+from app.core.db import engine
+from app.services.statistics_service import ProjectStatisticsService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def rebuild() -> None:
+    with Session(engine) as session:
+        ProjectStatisticsService(session).rebuild()
+
+
+def main() -> None:
+    logger.info("Rebuilding project statistics counters")
+    rebuild()
+    logger.info("Project statistics counters rebuilt")
+
+
+if __name__ == "__main__":
+    main()
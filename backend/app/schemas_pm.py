@@ -1,7 +1,7 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Literal, Optional
 from datetime import datetime
 from uuid import UUID
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from app.models_pm import ProjectType, MilestoneStatus, ProgressType
 
 
@@ -33,6 +33,11 @@ class ProductDict(ProductDictInDBBase):
     pass
 
 
+class ProductDictPage(BaseModel):
+    data: List[ProductDict]
+    next_cursor: Optional[str] = None
+
+
 # 产品模型
 class ProjectProductBase(BaseModel):
     product_name: str
@@ -205,6 +210,89 @@ class Project(ProjectInDBBase):
     progresses: List[Progress] = []
 
 
+class ProjectPage(BaseModel):
+    data: List[Project]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None  # 过滤后的总数，只在第一页返回
+
+
+# 列表视图使用的项目摘要，不含子表明细
+class ProjectSummary(BaseModel):
+    id: UUID
+    name: str
+    project_type: str
+    location: str
+    status: Optional[str] = None
+    contract_amount: Optional[float] = None
+    created_at: datetime
+    updated_at: datetime
+    product_names: List[str] = []
+
+    class Config:
+        from_attributes = True
+
+
+class ProjectSummaryPage(BaseModel):
+    data: List[ProjectSummary]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None  # 过滤后的总数，只在第一页返回
+
+
+ProjectView = Literal["full", "summary"]
+
+
+class ProjectFilter(BaseModel):
+    """项目列表/导出的过滤条件，日期范围按创建时间过滤"""
+    status: Optional[str] = None
+    project_type: Optional[str] = None
+    location: Optional[str] = None
+    product: Optional[str] = None  # 包含该产品的项目
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    min_amount: Optional[float] = None  # 合同金额范围
+    max_amount: Optional[float] = None
+
+
+ProjectSortKey = Literal[
+    "created_at", "-created_at", "updated_at", "-updated_at",
+    "name", "-name", "contract_amount", "-contract_amount",
+]
+
+
+class ProjectBulkDelete(BaseModel):
+    project_ids: List[UUID] = Field(min_length=1, max_length=1000)
+
+
+# 搜索结果模型
+class ProjectSearchHit(BaseModel):
+    project_id: UUID
+    project_name: str
+    source: Literal["project", "progress", "milestone"]  # 命中的记录类型
+    source_id: UUID
+    rank: float
+    snippet: str  # 命中片段，关键词用 <mark></mark> 标出
+
+
+class ProjectSearchPage(BaseModel):
+    data: List[ProjectSearchHit]
+    next_offset: Optional[int] = None
+
+
+# 批量导入结果模型
+class ProjectImportError(BaseModel):
+    row: int  # 文件中的行号（CSV 含表头行）
+    errors: List[Dict[str, Any]]
+
+
+class ProjectImportResult(BaseModel):
+    total: int = 0
+    imported: int = 0
+    failed: int = 0
+    errors: List[ProjectImportError] = []
+    errors_truncated: bool = False
+    file_error: Optional[str] = None  # 文件级错误（如不是 UTF-8 编码），出错位置之后的内容未读取
+
+
 # 统计模型
 class ProjectCountByLocation(BaseModel):
     location: str
@@ -227,3 +315,87 @@ class ProjectStatistics(BaseModel):
     by_type: List[ProjectCountByType]
     total_projects: int
     total_contract_amount: float
+
+
+# 统计看板：一次返回统计、属地-产品桑基图和产品-类型矩阵
+class ProjectDashboard(BaseModel):
+    statistics: ProjectStatistics
+    location_product: List[Dict[str, Any]]
+    product_type: List[Dict[str, Any]]
+
+
+# 趋势分析：按时间桶聚合的序列
+AnalyticsGranularity = Literal["day", "week", "month", "quarter", "year"]
+
+
+class ProjectAnalyticsFilter(BaseModel):
+    start_date: Optional[datetime] = None  # 时间桶所用日期列的范围
+    end_date: Optional[datetime] = None
+    location: Optional[str] = None
+    project_type: Optional[str] = None
+
+
+class ProjectsCreatedPoint(BaseModel):
+    bucket: datetime
+    location: str
+    count: int
+
+
+class MilestoneRatePoint(BaseModel):
+    bucket: datetime
+    total: int
+    completed: int
+    delayed: int
+    completion_rate: float
+    delay_rate: float
+
+
+class ProgressVelocityPoint(BaseModel):
+    bucket: datetime
+    user_id: UUID
+    user_name: Optional[str] = None
+    count: int
+
+
+class ProjectsCreatedSeries(BaseModel):
+    granularity: AnalyticsGranularity
+    data: List[ProjectsCreatedPoint]
+
+
+class MilestoneRateSeries(BaseModel):
+    granularity: AnalyticsGranularity
+    data: List[MilestoneRatePoint]
+
+
+class ProgressVelocitySeries(BaseModel):
+    granularity: AnalyticsGranularity
+    data: List[ProgressVelocityPoint]
+
+
+# 跨项目的里程碑，带所属项目名称
+class ProjectMilestone(BaseModel):
+    id: UUID
+    project_id: UUID
+    project_name: str
+    location: str
+    project_type: str
+    milestone_date: datetime
+    description: str
+    status: MilestoneStatus
+
+    class Config:
+        from_attributes = True
+
+
+class ProjectMilestonePage(BaseModel):
+    data: List[ProjectMilestone]
+    next_cursor: Optional[str] = None
+
+
+class OverdueMilestone(ProjectMilestone):
+    days_overdue: int
+
+
+class OverdueMilestonePage(BaseModel):
+    data: List[OverdueMilestone]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,247 @@
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, TypeVar
+from uuid import UUID
+
+from pydantic import BaseModel
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app import schemas_pm as schemas
+from app.models_pm import Project, ProgressType
+from app.services.data_version import get_data_version
+from app.services.project_service import ProjectService
+from app.services.search_service import ProjectSearchService
+from app.services.statistics_service import ProjectStatisticsService
+
+T = TypeVar("T")
+S = TypeVar("S", bound=BaseModel)
+
+
+def _to_schema(schema: Type[S], obj: Any) -> Optional[S]:
+    return schema.model_validate(obj) if obj is not None else None
+
+
+class AsyncProjectService:
+    """
+    项目服务的异步版本，供异步路由使用
+
+    业务逻辑复用 ProjectService：每个方法通过 AsyncSession.run_sync 在异步连接上执行同步实现，
+    并在同一次调用内把 ORM 对象转换为响应模型，避免在事件循环中触发延迟加载。
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def _run(self, fn: Callable[[ProjectService], T]) -> T:
+        return await self.session.run_sync(lambda db: fn(ProjectService(db)))
+
+    async def _run_statistics(self, fn: Callable[[ProjectStatisticsService], T]) -> T:
+        return await self.session.run_sync(lambda db: fn(ProjectStatisticsService(db)))
+
+    async def get_data_version(self) -> int:
+        """项目数据版本，任何项目相关写操作都会递增，用于生成 ETag"""
+        return await self.session.run_sync(get_data_version)
+
+    # 项目CRUD操作
+    async def create_project(self, project_data: schemas.ProjectCreate) -> schemas.Project:
+        return await self._run(
+            lambda service: schemas.Project.model_validate(service.create_project(project_data))
+        )
+
+    async def project_exists(self, project_id: UUID) -> bool:
+        """只检查项目是否存在，不加载关联数据"""
+        def exists(db: Session) -> bool:
+            return db.get(Project, project_id) is not None
+        return await self.session.run_sync(exists)
+
+    async def get_project(self, project_id: UUID) -> Optional[schemas.Project]:
+        return await self._run(
+            lambda service: _to_schema(schemas.Project, service.get_project(project_id))
+        )
+
+    async def get_projects(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[schemas.ProjectFilter] = None,
+        sort: str = "-created_at",
+    ) -> List[schemas.Project]:
+        return await self._run(
+            lambda service: [
+                schemas.Project.model_validate(project)
+                for project in service.get_projects(skip=skip, limit=limit, filters=filters, sort=sort)
+            ]
+        )
+
+    async def get_projects_with_total(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[schemas.ProjectFilter] = None,
+        sort: str = "-created_at",
+    ) -> Tuple[List[schemas.Project], int]:
+        def page(service: ProjectService) -> Tuple[List[schemas.Project], int]:
+            projects, total = service.get_projects_with_total(
+                skip=skip, limit=limit, filters=filters, sort=sort
+            )
+            return [schemas.Project.model_validate(project) for project in projects], total
+        return await self._run(page)
+
+    async def count_projects(self, filters: Optional[schemas.ProjectFilter] = None) -> int:
+        return await self._run(lambda service: service.count_projects(filters))
+
+    async def get_projects_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        filters: Optional[schemas.ProjectFilter] = None,
+        sort: str = "-created_at",
+    ) -> Tuple[List[schemas.Project], Optional[str]]:
+        def page(service: ProjectService) -> Tuple[List[schemas.Project], Optional[str]]:
+            projects, next_cursor = service.get_projects_page(
+                cursor=cursor, limit=limit, filters=filters, sort=sort
+            )
+            return [schemas.Project.model_validate(project) for project in projects], next_cursor
+        return await self._run(page)
+
+    async def get_project_summary(self, project_id: UUID) -> Optional[schemas.ProjectSummary]:
+        return await self._run(
+            lambda service: _to_schema(schemas.ProjectSummary, service.get_project_summary(project_id))
+        )
+
+    async def get_project_summaries(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[schemas.ProjectFilter] = None,
+        sort: str = "-created_at",
+    ) -> Tuple[List[schemas.ProjectSummary], int]:
+        def page(service: ProjectService) -> Tuple[List[schemas.ProjectSummary], int]:
+            rows, total = service.get_project_summaries(skip=skip, limit=limit, filters=filters, sort=sort)
+            return [schemas.ProjectSummary.model_validate(row) for row in rows], total
+        return await self._run(page)
+
+    async def get_project_summaries_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        filters: Optional[schemas.ProjectFilter] = None,
+        sort: str = "-created_at",
+    ) -> Tuple[List[schemas.ProjectSummary], Optional[str]]:
+        def page(service: ProjectService) -> Tuple[List[schemas.ProjectSummary], Optional[str]]:
+            rows, next_cursor = service.get_project_summaries_page(
+                cursor=cursor, limit=limit, filters=filters, sort=sort
+            )
+            return [schemas.ProjectSummary.model_validate(row) for row in rows], next_cursor
+        return await self._run(page)
+
+    async def update_project(
+        self, project_id: UUID, project_data: schemas.ProjectUpdate
+    ) -> Optional[schemas.Project]:
+        return await self._run(
+            lambda service: _to_schema(schemas.Project, service.update_project(project_id, project_data))
+        )
+
+    async def delete_project(self, project_id: UUID) -> bool:
+        return await self._run(lambda service: service.delete_project(project_id))
+
+    async def delete_projects(self, project_ids: List[UUID]) -> int:
+        return await self._run(lambda service: service.delete_projects(project_ids))
+
+    # 角色分配
+    async def add_role_assignment(
+        self, project_id: UUID, role_data: schemas.RoleAssignmentCreate
+    ) -> Optional[schemas.RoleAssignment]:
+        return await self._run(
+            lambda service: _to_schema(
+                schemas.RoleAssignment, service.add_role_assignment(project_id, role_data)
+            )
+        )
+
+    async def delete_role_assignment(self, role_assignment_id: UUID) -> bool:
+        return await self._run(lambda service: service.delete_role_assignment(role_assignment_id))
+
+    # 里程碑
+    async def add_milestone(
+        self, project_id: UUID, milestone_data: schemas.MilestoneCreate
+    ) -> Optional[schemas.Milestone]:
+        return await self._run(
+            lambda service: _to_schema(schemas.Milestone, service.add_milestone(project_id, milestone_data))
+        )
+
+    async def update_milestone(
+        self, milestone_id: UUID, milestone_data: Dict[str, Any]
+    ) -> Optional[schemas.Milestone]:
+        return await self._run(
+            lambda service: _to_schema(
+                schemas.Milestone, service.update_milestone(milestone_id, milestone_data)
+            )
+        )
+
+    async def get_project_milestones(self, project_id: UUID) -> List[schemas.Milestone]:
+        return await self._run(
+            lambda service: [
+                schemas.Milestone.model_validate(milestone)
+                for milestone in service.get_project_milestones(project_id)
+            ]
+        )
+
+    async def delete_milestone(self, milestone_id: UUID) -> bool:
+        return await self._run(lambda service: service.delete_milestone(milestone_id))
+
+    # 进展
+    async def add_progress(
+        self, project_id: UUID, progress_data: schemas.ProgressCreate
+    ) -> Optional[schemas.Progress]:
+        return await self._run(
+            lambda service: _to_schema(schemas.Progress, service.add_progress(project_id, progress_data))
+        )
+
+    async def update_progress(
+        self, progress_id: UUID, progress_data: Dict[str, Any]
+    ) -> Optional[schemas.Progress]:
+        return await self._run(
+            lambda service: _to_schema(schemas.Progress, service.update_progress(progress_id, progress_data))
+        )
+
+    async def get_project_progresses(
+        self,
+        project_id: UUID,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        progress_type: Optional[ProgressType] = None,
+        limit: Optional[int] = None,
+    ) -> List[dict]:
+        return await self._run(
+            lambda service: service.get_project_progresses(
+                project_id,
+                start_date=start_date,
+                end_date=end_date,
+                progress_type=progress_type,
+                limit=limit,
+            )
+        )
+
+    async def delete_progress(self, progress_id: UUID) -> bool:
+        return await self._run(lambda service: service.delete_progress(progress_id))
+
+    # 检索
+    async def search_projects(self, q: str, limit: int = 20, offset: int = 0) -> schemas.ProjectSearchPage:
+        return await self.session.run_sync(
+            lambda db: ProjectSearchService(db).search(q, limit=limit, offset=offset)
+        )
+
+    # 统计
+    async def get_project_statistics(self) -> schemas.ProjectStatistics:
+        return await self._run_statistics(lambda statistics: statistics.get_project_statistics())
+
+    async def get_location_product_relationship(self) -> List[Dict[str, Any]]:
+        return await self._run_statistics(
+            lambda statistics: statistics.get_location_product_relationship()
+        )
+
+    async def get_product_type_statistics(self) -> List[Dict[str, Any]]:
+        return await self._run_statistics(lambda statistics: statistics.get_product_type_statistics())
+
+    async def get_dashboard(self) -> schemas.ProjectDashboard:
+        return await self._run_statistics(lambda statistics: statistics.get_dashboard())
@@ -0,0 +1,28 @@
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, select
+
+from app.models_pm import DataVersion
+
+# 项目及其子表、统计计数共用的数据版本
+PROJECTS_DATA_VERSION = "projects"
+# 用户资料（姓名、邮箱等）的数据版本，引用用户显示名的响应以它生成 ETag
+USERS_DATA_VERSION = "users"
+
+
+def bump_data_version(db: Session, name: str = PROJECTS_DATA_VERSION) -> None:
+    """
+    在调用方的事务内递增数据版本（不提交）
+
+    版本行在提交前一直被锁住，调用方应在提交前最后一步调用，缩短持锁时间。
+    """
+    statement = insert(DataVersion).values(name=name, version=1)
+    statement = statement.on_conflict_do_update(
+        index_elements=["name"], set_={"version": DataVersion.version + 1}
+    )
+    db.execute(statement)
+
+
+def get_data_version(db: Session, name: str = PROJECTS_DATA_VERSION) -> int:
+    """读取当前数据版本，从未写入过时为 0"""
+    version = db.exec(select(DataVersion.version).where(DataVersion.name == name)).first()
+    return version or 0
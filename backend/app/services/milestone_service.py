@@ -0,0 +1,117 @@
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import literal_column, update
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.pagination import keyset_paginate, split_page
+from app.models_pm import Milestone, MilestoneStatus, Project
+from app.schemas_pm import OverdueMilestone, ProjectMilestone
+from app.services.data_version import bump_data_version
+
+# 谓词以字面量写出，与部分索引的 WHERE 条件完全一致，规划器才能使用这些索引
+PENDING = Milestone.status == literal_column(f"'{MilestoneStatus.NORMAL.name}'")
+OPEN = Milestone.status != literal_column(f"'{MilestoneStatus.COMPLETED.name}'")
+
+
+class MilestoneService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def mark_overdue(self, now: Optional[datetime] = None, batch_size: Optional[int] = None) -> int:
+        """
+        把已过期且未完成的正常里程碑标记为延期，返回标记的数量
+
+        只扫描 ix_milestone_pending_milestone_date 部分索引，按日期分批更新，每批单独提交；
+        候选行以 SKIP LOCKED 锁定，多个 worker 同时运行也不会互相等待或重复处理。
+        """
+        now = now or datetime.utcnow()
+        batch_size = batch_size or settings.MILESTONE_OVERDUE_BATCH_SIZE
+        marked = 0
+        while True:
+            candidates = (
+                select(Milestone.id)
+                .where(PENDING, Milestone.milestone_date < now)
+                .order_by(Milestone.milestone_date)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            statement = (
+                update(Milestone)
+                .where(Milestone.id.in_(candidates))
+                .values(status=MilestoneStatus.DELAYED, updated_at=now)
+                .execution_options(synchronize_session=False)
+            )
+            count = self.db.execute(statement).rowcount
+            if count:
+                bump_data_version(self.db)
+            self.db.commit()
+            marked += count
+            if count < batch_size:
+                return marked
+
+    @staticmethod
+    def _with_project(location: Optional[str], project_type: Optional[str]) -> Any:
+        """里程碑列关联所属项目的名称、属地和类型，按页一次查出"""
+        statement = select(
+            Milestone.id, Milestone.project_id, Project.name.label("project_name"), Project.location,
+            Project.project_type, Milestone.milestone_date, Milestone.description, Milestone.status,
+        ).join(Project, Project.id == Milestone.project_id)
+        if location is not None:
+            statement = statement.where(Project.location == location)
+        if project_type is not None:
+            statement = statement.where(Project.project_type == project_type)
+        return statement
+
+    def _page(self, statement: Any, cursor: Optional[str], limit: int) -> Tuple[List[Any], Optional[str]]:
+        columns = [Milestone.milestone_date, Milestone.id]
+        statement = keyset_paginate(statement, columns, cursor=cursor, limit=limit)
+        return split_page(self.db.exec(statement).all(), limit, lambda row: (row.milestone_date, row.id))
+
+    def get_milestones(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        statuses: Optional[List[MilestoneStatus]] = None,
+        location: Optional[str] = None,
+        project_type: Optional[str] = None,
+    ) -> Tuple[List[ProjectMilestone], Optional[str]]:
+        """
+        跨项目的里程碑日历：日期窗口 [start_date, end_date) 内的里程碑，按 (milestone_date, id) 游标分页
+
+        ix_milestone_milestone_date_status 索引完成日期范围和状态过滤，行已按日期有序，
+        同一日期内按 id 增量排序即可，读满一页即停止
+        """
+        statement = self._with_project(location, project_type)
+        if start_date is not None:
+            statement = statement.where(Milestone.milestone_date >= start_date)
+        if end_date is not None:
+            statement = statement.where(Milestone.milestone_date < end_date)
+        if statuses:
+            statement = statement.where(Milestone.status.in_(statuses))
+        rows, next_cursor = self._page(statement, cursor, limit)
+        return [ProjectMilestone.model_validate(row) for row in rows], next_cursor
+
+    def get_overdue(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        now: Optional[datetime] = None,
+        location: Optional[str] = None,
+        project_type: Optional[str] = None,
+    ) -> Tuple[List[OverdueMilestone], Optional[str]]:
+        """
+        跨项目查询已过期未完成的里程碑（正常和延期），按 (milestone_date, id) 从最早开始游标分页
+
+        部分索引 ix_milestone_open_milestone_date_id 的顺序就是分页顺序，规划器可沿索引读满一页即停止，无需排序
+        """
+        now = now or datetime.utcnow()
+        statement = self._with_project(location, project_type).where(OPEN, Milestone.milestone_date < now)
+        rows, next_cursor = self._page(statement, cursor, limit)
+        return [
+            OverdueMilestone(**row._mapping, days_overdue=(now - row.milestone_date).days)
+            for row in rows
+        ], next_cursor
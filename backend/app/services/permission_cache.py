@@ -0,0 +1,74 @@
+import threading
+from dataclasses import dataclass
+from typing import Callable, FrozenSet, Iterable, Optional, Tuple
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class CompiledPermissions:
+    """用户编译后的权限：是否超级用户 + (resource, action) 集合"""
+    is_superuser: bool
+    permissions: FrozenSet[Tuple[str, str]]
+    version: int = 0
+
+    def has(self, resource: str, action: str) -> bool:
+        return (resource, action) in self.permissions
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[bool, Optional[str], Optional[str]]]) -> "CompiledPermissions":
+        """由 (is_superuser, resource, action) 行构建，左连接产生的空权限行会被忽略"""
+        is_superuser = False
+        permissions = set()
+        for superuser, resource, action in rows:
+            is_superuser = bool(superuser)
+            if resource is not None:
+                permissions.add((resource, action))
+        return cls(is_superuser=is_superuser, permissions=frozenset(permissions))
+
+
+class PermissionCache:
+    """
+    进程内的用户权限缓存
+
+    角色/权限变更时调用 bump() 递增全局版本号，所有旧版本的缓存条目随之失效；
+    其他 worker 进程的缓存最迟在 TTL 到期后刷新。
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._entries: TTLCache[str, CompiledPermissions] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._version = 0
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def bump(self) -> None:
+        with self._lock:
+            self._version += 1
+
+    def invalidate(self, user_id: str) -> None:
+        self._entries.invalidate(str(user_id))
+
+    def get(self, user_id: str, loader: Callable[[], CompiledPermissions]) -> CompiledPermissions:
+        entry = self._entries.get(user_id)
+        if entry is not None and entry.version == self._version:
+            return entry
+        # 先记下版本再加载，加载期间发生的变更会让这次结果在下次读取时失效
+        version = self._version
+        compiled = loader()
+        entry = CompiledPermissions(
+            is_superuser=compiled.is_superuser, permissions=compiled.permissions, version=version
+        )
+        self._entries.set(user_id, entry)
+        return entry
+
+    def stats(self) -> dict:
+        return {**self._entries.stats(), "version": self._version}
+
+
+permission_cache = PermissionCache(
+    maxsize=settings.PERMISSION_CACHE_MAX_SIZE, ttl=settings.PERMISSION_CACHE_TTL_SECONDS
+)
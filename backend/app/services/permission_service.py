@@ -2,6 +2,7 @@ from typing import List, Optional
 from sqlmodel import Session, select
 from app.models import User
 from app.models_extended import Role, Permission, UserRole, RolePermission
+from app.services.permission_cache import CompiledPermissions, permission_cache
 
 
 class PermissionService:
@@ -28,24 +29,28 @@ class PermissionService:
         )
         return self.session.exec(statement).all()
 
-    def has_permission(self, user_id: str, resource: str, action: str) -> bool:
-        """检查用户是否有特定权限"""
+    def get_compiled_permissions(self, user_id: str) -> CompiledPermissions:
+        """获取用户编译后的权限集合（进程内缓存，未命中时一次查询加载）"""
+        return permission_cache.get(str(user_id), lambda: self._load_compiled_permissions(user_id))
+
+    def _load_compiled_permissions(self, user_id: str) -> CompiledPermissions:
         statement = (
-            select(Permission)
-            .join(RolePermission, Permission.id == RolePermission.permission_id)
-            .join(UserRole, RolePermission.role_id == UserRole.role_id)
-            .where(
-                UserRole.user_id == user_id,
-                Permission.resource == resource,
-                Permission.action == action
-            )
+            select(User.is_superuser, Permission.resource, Permission.action)
+            .select_from(User)
+            .outerjoin(UserRole, UserRole.user_id == User.id)
+            .outerjoin(RolePermission, RolePermission.role_id == UserRole.role_id)
+            .outerjoin(Permission, Permission.id == RolePermission.permission_id)
+            .where(User.id == user_id)
         )
-        return self.session.exec(statement).first() is not None
+        return CompiledPermissions.from_rows(self.session.exec(statement).all())
+
+    def has_permission(self, user_id: str, resource: str, action: str) -> bool:
+        """检查用户是否有特定权限"""
+        return self.get_compiled_permissions(user_id).has(resource, action)
 
     def is_superuser(self, user_id: str) -> bool:
         """检查用户是否为超级用户"""
-        user = self.session.get(User, user_id)
-        return user.is_superuser if user else False
+        return self.get_compiled_permissions(user_id).is_superuser
 
     # 角色管理方法
     def create_role(self, name: str, description: Optional[str] = None) -> Role:
@@ -81,6 +86,7 @@ class PermissionService:
         user_role = UserRole(user_id=user_id, role_id=role_id)
         self.session.add(user_role)
         self.session.commit()
+        permission_cache.bump()
         return True
 
     def remove_role_from_user(self, user_id: str, role_id: str) -> bool:
@@ -96,6 +102,7 @@ class PermissionService:
         
         self.session.delete(user_role)
         self.session.commit()
+        permission_cache.bump()
         return True
 
     # 权限管理方法
@@ -137,6 +144,7 @@ class PermissionService:
         role_permission = RolePermission(role_id=role_id, permission_id=permission_id)
         self.session.add(role_permission)
         self.session.commit()
+        permission_cache.bump()
         return True
 
     def remove_permission_from_role(self, role_id: str, permission_id: str) -> bool:
@@ -152,6 +160,7 @@ class PermissionService:
         
         self.session.delete(role_permission)
         self.session.commit()
+        permission_cache.bump()
         return True
 
     # 初始化默认数据
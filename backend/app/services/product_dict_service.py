@@ -1,9 +1,10 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from uuid import UUID
 from datetime import datetime
 from sqlmodel import Session, select, func
 from fastapi import HTTPException
 
+from app.core.pagination import keyset_paginate, split_page
 from app.models_pm import ProductDict, ProjectProduct
 from app.schemas_pm import ProductDictCreate, ProductDictUpdate
 
@@ -32,6 +33,14 @@ class ProductDictService:
         statement = select(ProductDict).offset(skip).limit(limit).order_by(ProductDict.name)
         return list(self.db.exec(statement).all())
 
+    def get_product_dicts_page(self, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[ProductDict], Optional[str]]:
+        """按 (name, id) 游标分页获取产品字典列表，返回当前页和下一页游标"""
+        statement = keyset_paginate(
+            select(ProductDict), [ProductDict.name, ProductDict.id], cursor=cursor, limit=limit
+        )
+        product_dicts = self.db.exec(statement).all()
+        return split_page(product_dicts, limit, lambda product_dict: (product_dict.name, product_dict.id))
+
     def get_product_dict(self, product_dict_id: UUID) -> Optional[ProductDict]:
         """获取单个产品字典"""
         return self.db.get(ProductDict, product_dict_id)
@@ -0,0 +1,77 @@
+import csv
+import io
+import json
+from typing import Any, Dict, Iterator
+
+from sqlalchemy.orm import noload, selectinload
+from sqlmodel import Session, select
+
+from app.core.db import engine
+from app.models_pm import Project
+from app.schemas_pm import Project as ProjectSchema, ProjectFilter
+from app.services.project_service import ProjectService
+
+# CSV 中以 JSON 数组输出的子表列，格式与导入接口一致，导出文件可以直接重新导入
+CSV_COLUMNS = [
+    "id", "name", "project_type", "location", "contract_amount", "background",
+    "import_time", "status", "created_at", "updated_at",
+]
+CSV_CHILD_COLUMNS = ["products", "milestones", "role_assignments"]
+
+
+class ProjectExportService:
+    """
+    项目流式导出
+
+    使用独立的会话和服务端游标（yield_per）按批读取项目，每批的子表各用一条 IN 查询预加载，
+    处理完的对象不再被引用即被回收，内存占用与导出总行数无关。
+    """
+
+    def __init__(self, filters: ProjectFilter, include_progresses: bool = False, batch_size: int = 500):
+        self.filters = filters
+        self.include_progresses = include_progresses
+        self.batch_size = batch_size
+
+    def _iter_projects(self) -> Iterator[Dict[str, Any]]:
+        options = [
+            selectinload(Project.products),
+            selectinload(Project.milestones),
+            selectinload(Project.role_assignments),
+        ]
+        # 不导出进展时用 noload，避免逐个项目触发延迟加载
+        options.append(selectinload(Project.progresses) if self.include_progresses else noload(Project.progresses))
+        exclude = None if self.include_progresses else {"progresses"}
+
+        with Session(engine) as session:
+            statement = ProjectService.apply_filters(select(Project), self.filters)
+            statement = statement.options(*options).order_by(Project.created_at, Project.id)
+            result = session.exec(statement.execution_options(yield_per=self.batch_size))
+            for projects in result.partitions():
+                # 会话的标识映射是弱引用，上一批对象在这里释放后即被回收
+                for project in projects:
+                    yield ProjectSchema.model_validate(project).model_dump(mode="json", exclude=exclude)
+
+    def iter_ndjson(self) -> Iterator[str]:
+        for project in self._iter_projects():
+            yield json.dumps(project, ensure_ascii=False) + "\n"
+
+    def iter_csv(self) -> Iterator[str]:
+        columns = CSV_COLUMNS + CSV_CHILD_COLUMNS
+        if self.include_progresses:
+            columns.append("progresses")
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+
+        for project in self._iter_projects():
+            writer.writerow([
+                json.dumps(project[column], ensure_ascii=False)
+                if column in CSV_CHILD_COLUMNS or column == "progresses" else project[column]
+                for column in columns
+            ])
+            # 攒够一批再输出，减少分块数量
+            if buffer.tell() > 64 * 1024:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
@@ -0,0 +1,135 @@
+import codecs
+import csv
+import json
+from datetime import datetime
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session
+
+from app.schemas_pm import ProjectCreate, ProjectImportError, ProjectImportResult
+from app.services.project_service import ProjectService
+
+# CSV 中以 JSON 数组形式填写的子表列
+CSV_JSON_COLUMNS = ("products", "milestones", "role_assignments")
+
+# 返回的逐行错误数上限，超出的只计数
+MAX_REPORTED_ERRORS = 1000
+
+
+def iter_csv_rows(stream: IO[bytes]) -> Iterator[Tuple[int, Any]]:
+    """
+    逐行读取 CSV，返回 (行号, 行数据)
+
+    表头为 ProjectCreate 的字段名；products / milestones / role_assignments 列填写 JSON 数组，
+    空单元格视为未填写。文件不是 UTF-8 编码时返回 UnicodeDecodeError 并停止读取。
+    """
+    reader = csv.DictReader(codecs.iterdecode(stream, "utf-8-sig"))
+    try:
+        for row in reader:
+            data: Dict[str, Any] = {}
+            try:
+                for key, value in row.items():
+                    if key is None or value is None or value.strip() == "":
+                        continue
+                    data[key] = json.loads(value) if key in CSV_JSON_COLUMNS else value
+            except json.JSONDecodeError as exc:
+                yield reader.line_num, exc
+                continue
+            yield reader.line_num, data
+    except UnicodeDecodeError as exc:
+        yield reader.line_num + 1, exc
+
+
+def iter_jsonl_rows(stream: IO[bytes]) -> Iterator[Tuple[int, Any]]:
+    """逐行读取 JSON Lines，每行一个 ProjectCreate 对象，空行跳过；编码错误的处理同 iter_csv_rows"""
+    line_num = 0
+    try:
+        for line_num, line in enumerate(codecs.iterdecode(stream, "utf-8-sig"), start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_num, json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield line_num, exc
+    except UnicodeDecodeError as exc:
+        yield line_num + 1, exc
+
+
+class ProjectImportService:
+    """
+    项目批量导入
+
+    文件逐行流式读取并按 ProjectCreate 校验，合法行每攒够 batch_size 条就批量写入一次，
+    内存占用只与批大小和错误上限有关，与文件行数无关。
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.project_service = ProjectService(db)
+
+    def import_rows(
+        self, rows: Iterator[Tuple[int, Any]], batch_size: int = 500
+    ) -> ProjectImportResult:
+        result = ProjectImportResult()
+        import_time = datetime.utcnow()
+        batch: List[Tuple[int, ProjectCreate]] = []
+
+        for row_num, data in rows:
+            if isinstance(data, UnicodeDecodeError):
+                # 解码器状态已损坏，无法继续读取；之前读到的行照常写入
+                result.file_error = f"第 {row_num} 行不是 UTF-8 编码，从该行起未导入"
+                break
+            result.total += 1
+            project_in = self._validate(row_num, data, result)
+            if project_in is None:
+                continue
+            if project_in.import_time is None:
+                project_in.import_time = import_time
+            batch.append((row_num, project_in))
+            if len(batch) >= batch_size:
+                self._flush(batch, result)
+                batch = []
+        self._flush(batch, result)
+        return result
+
+    def _validate(self, row_num: int, data: Any, result: ProjectImportResult) -> Optional[ProjectCreate]:
+        if isinstance(data, Exception):
+            self._add_error(result, row_num, [{"msg": f"JSON 解析失败: {data}"}])
+            return None
+        try:
+            return ProjectCreate.model_validate(data)
+        except ValidationError as exc:
+            errors = [
+                {"loc": list(error["loc"]), "msg": error["msg"], "type": error["type"]}
+                for error in exc.errors()
+            ]
+            self._add_error(result, row_num, errors)
+            return None
+
+    def _flush(self, batch: List[Tuple[int, ProjectCreate]], result: ProjectImportResult) -> None:
+        if not batch:
+            return
+        try:
+            self.project_service.create_projects([project_in for _, project_in in batch])
+            result.imported += len(batch)
+            return
+        except SQLAlchemyError:
+            self.db.rollback()
+        # 整批写入失败时逐行重试，定位出错的行
+        for row_num, project_in in batch:
+            try:
+                self.project_service.create_projects([project_in])
+                result.imported += 1
+            except SQLAlchemyError as exc:
+                self.db.rollback()
+                self._add_error(result, row_num, [{"msg": f"写入失败: {exc.__class__.__name__}"}])
+
+    @staticmethod
+    def _add_error(result: ProjectImportResult, row_num: int, errors: List[Dict[str, Any]]) -> None:
+        result.failed += 1
+        if len(result.errors) < MAX_REPORTED_ERRORS:
+            result.errors.append(ProjectImportError(row=row_num, errors=errors))
+        else:
+            result.errors_truncated = True
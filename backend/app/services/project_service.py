@@ -1,124 +1,294 @@
-from typing import List, Optional, Dict, Any
+from collections import Counter
+from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
-from sqlmodel import Session, select, func, or_
+from sqlalchemy import delete, insert, update
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import make_transient_to_detached, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlmodel import Session, SQLModel, func, select
 from datetime import datetime
 
+from app.core.pagination import keyset_paginate, split_page
 from app.models_pm import (
-    Project, ProjectProduct, RoleAssignment, Milestone, Progress
+    Project, ProjectProduct, RoleAssignment, Milestone, Progress, ProgressType
 )
 from app.schemas_pm import (
-    ProjectCreate, ProjectUpdate,
-    ProjectProductCreate, RoleAssignmentCreate, MilestoneCreate, ProgressCreate,
-    ProjectStatistics, ProjectCountByLocation, ProjectCountByProduct, ProjectCountByType
+    ProjectCreate, ProjectUpdate, ProjectFilter,
+    ProjectProductCreate, RoleAssignmentCreate, MilestoneCreate, ProgressCreate
 )
+from app.services.data_version import bump_data_version
+from app.services.statistics_service import ProjectStatisticsService, project_contribution
+
+
+# 列表模式下按集合批量预加载子表，每个集合只发一条 IN 查询
+PROJECT_LIST_OPTIONS = (
+    selectinload(Project.products),
+    selectinload(Project.role_assignments),
+    selectinload(Project.milestones),
+    selectinload(Project.progresses),
+)
+
+# 列表可用的排序键
+PROJECT_SORT_COLUMNS = {
+    "created_at": Project.created_at,
+    "updated_at": Project.updated_at,
+    "name": Project.name,
+    "contract_amount": Project.contract_amount,
+}
+# contract_amount 可为空，不能作为游标分页的排序键
+PROJECT_CURSOR_SORT_KEYS = ("created_at", "updated_at", "name")
+
+# 子表差量更新时用于匹配已有行的自然键
+CHILD_NATURAL_KEYS = {
+    ProjectProduct: ("product_name",),
+    Milestone: ("milestone_date",),
+    RoleAssignment: ("role_name", "user_name"),
+}
 
 
 class ProjectService:
     def __init__(self, db: Session):
         self.db = db
+        self.statistics = ProjectStatisticsService(db)
 
     # 项目CRUD操作
     def create_project(self, project_data: ProjectCreate) -> Project:
         """创建新项目"""
-        # 提取产品、里程碑和角色分配数据
-        products_data = project_data.products or []
-        milestones_data = project_data.milestones or []
-        role_assignments_data = project_data.role_assignments or []
-        
-        # 创建项目（不包含产品、里程碑和角色分配）
-        project_dict = project_data.model_dump(exclude={'products', 'milestones', 'role_assignments'})
-        project = Project(**project_dict)
-        self.db.add(project)
+        return self.create_projects([project_data])[0]
+
+    def create_projects(self, projects_data: List[ProjectCreate]) -> List[Project]:
+        """
+        批量创建项目
+
+        项目 id 在客户端生成，项目和各子表分别用一条多行 INSERT 写入，统计计数在内存中算出后累加，
+        全部在一个事务内提交；返回的对象直接由提交的数据构建，不再回查数据库。
+        """
+        projects: List[Project] = []
+        children: Dict[type, List[SQLModel]] = {ProjectProduct: [], Milestone: [], RoleAssignment: []}
+        contributions: Counter = Counter()
+        for project_data in projects_data:
+            project_dict = project_data.model_dump(exclude={'products', 'milestones', 'role_assignments'})
+            project = Project(**project_dict)
+            products = [ProjectProduct(**self._as_dict(item), project_id=project.id)
+                        for item in project_data.products or []]
+            milestones = [Milestone(**self._as_dict(item), project_id=project.id)
+                          for item in project_data.milestones or []]
+            role_assignments = [RoleAssignment(**self._as_dict(item), project_id=project.id)
+                                for item in project_data.role_assignments or []]
+            # 以已提交的状态构建返回对象：关系集合直接赋值，无需 refresh
+            set_committed_value(project, "products", products)
+            set_committed_value(project, "milestones", milestones)
+            set_committed_value(project, "role_assignments", role_assignments)
+            set_committed_value(project, "progresses", [])
+            projects.append(project)
+            children[ProjectProduct].extend(products)
+            children[Milestone].extend(milestones)
+            children[RoleAssignment].extend(role_assignments)
+            contributions.update(project_contribution(
+                project.location, project.project_type, project.status,
+                [product.product_name for product in products],
+            ))
+        if not projects:
+            return []
+
+        # 列表参数走 insertmanyvalues：每张表一条多行 INSERT，且语句编译可缓存
+        self.db.execute(insert(Project), [project.model_dump() for project in projects])
+        for model, rows in children.items():
+            if rows:
+                self.db.execute(insert(model), [row.model_dump() for row in rows])
+        self.statistics.apply(after=contributions)
+        bump_data_version(self.db)
         self.db.commit()
-        self.db.refresh(project)
-        
-        # 创建产品
-        if products_data:
-            for product_data in products_data:
-                product_dict = product_data if isinstance(product_data, dict) else product_data.model_dump()
-                product = ProjectProduct(**product_dict, project_id=project.id)
-                self.db.add(product)
-        
-        # 创建里程碑
-        if milestones_data:
-            for milestone_data in milestones_data:
-                milestone_dict = milestone_data if isinstance(milestone_data, dict) else milestone_data.model_dump()
-                milestone = Milestone(**milestone_dict, project_id=project.id)
-                self.db.add(milestone)
-        
-        # 创建角色分配
-        if role_assignments_data:
-            for role_data in role_assignments_data:
-                role_dict = role_data if isinstance(role_data, dict) else role_data.model_dump()
-                role_assignment = RoleAssignment(**role_dict, project_id=project.id)
-                self.db.add(role_assignment)
-        
-        if products_data or milestones_data or role_assignments_data:
-            self.db.commit()
-            self.db.refresh(project)
-        
-        return project
+
+        for obj in (*projects, *(row for rows in children.values() for row in rows)):
+            make_transient_to_detached(obj)
+        return projects
+
+    @staticmethod
+    def _as_dict(item: Any) -> Dict[str, Any]:
+        return item if isinstance(item, dict) else item.model_dump()
 
     def get_project(self, project_id: UUID) -> Optional[Project]:
         """获取项目详情"""
         return self.db.get(Project, project_id)
 
-    def get_projects(self, skip: int = 0, limit: int = 100) -> List[Project]:
+    @staticmethod
+    def apply_filters(statement: Any, filters: Optional[ProjectFilter]) -> Any:
+        """把过滤条件转换为 WHERE 子句，产品条件用 EXISTS 子查询，避免连接后重复行"""
+        if filters is None:
+            return statement
+        if filters.status is not None:
+            statement = statement.where(Project.status == filters.status)
+        if filters.project_type is not None:
+            statement = statement.where(Project.project_type == filters.project_type)
+        if filters.location is not None:
+            statement = statement.where(Project.location == filters.location)
+        if filters.product is not None:
+            statement = statement.where(
+                select(ProjectProduct.id).where(
+                    ProjectProduct.project_id == Project.id,
+                    ProjectProduct.product_name == filters.product,
+                ).exists()
+            )
+        if filters.start_date is not None:
+            statement = statement.where(Project.created_at >= filters.start_date)
+        if filters.end_date is not None:
+            statement = statement.where(Project.created_at <= filters.end_date)
+        if filters.min_amount is not None:
+            statement = statement.where(Project.contract_amount >= filters.min_amount)
+        if filters.max_amount is not None:
+            statement = statement.where(Project.contract_amount <= filters.max_amount)
+        return statement
+
+    @staticmethod
+    def _sort_columns(sort: str) -> Tuple[List[Any], bool]:
+        """解析排序键（前缀 - 表示倒序），以 id 作为次级排序保证顺序稳定"""
+        descending = sort.startswith("-")
+        return [PROJECT_SORT_COLUMNS[sort.lstrip("-")], Project.id], descending
+
+    def get_projects(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[ProjectFilter] = None,
+        sort: str = "-created_at",
+    ) -> List[Project]:
         """获取项目列表"""
-        statement = select(Project).order_by(Project.created_at.desc()).offset(skip).limit(limit)
+        columns, descending = self._sort_columns(sort)
+        statement = (
+            self.apply_filters(select(Project), filters)
+            .options(*PROJECT_LIST_OPTIONS)
+            .order_by(*self._order_by(sort, columns, descending))
+            .offset(skip)
+            .limit(limit)
+        )
+        return self.db.exec(statement).all()
+
+    def get_projects_with_total(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[ProjectFilter] = None,
+        sort: str = "-created_at",
+    ) -> Tuple[List[Project], int]:
+        """获取项目列表和过滤后的总数"""
+        projects = self.get_projects(skip, limit, filters, sort)
+        return projects, self._page_total(skip, limit, len(projects), filters)
+
+    @staticmethod
+    def _order_by(sort: str, columns: List[Any], descending: bool) -> List[Any]:
+        order_by = [column.desc() if descending else column.asc() for column in columns]
+        if sort.lstrip("-") not in PROJECT_CURSOR_SORT_KEYS:
+            # 可为空的排序列把空值排在最后
+            order_by[0] = order_by[0].nulls_last()
+        return order_by
+
+    def _page_total(self, skip: int, limit: int, page_size: int, filters: Optional[ProjectFilter]) -> int:
+        """
+        分页列表的总数
+
+        不在列表查询里加 count(*) OVER ()：窗口函数要先数完所有匹配行，LIMIT 无法提前停止。
+        不满一页的非空页已能推出总数；否则单独执行只查 project 表的计数查询。
+        """
+        if 0 < page_size < limit or (skip == 0 and page_size == 0):
+            return skip + page_size
+        return self.count_projects(filters)
+
+    def count_projects(self, filters: Optional[ProjectFilter] = None) -> int:
+        """过滤后的项目总数"""
+        statement = self.apply_filters(select(func.count()).select_from(Project), filters)
+        return self.db.exec(statement).one()
+
+    def get_projects_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        filters: Optional[ProjectFilter] = None,
+        sort: str = "-created_at",
+    ) -> Tuple[List[Project], Optional[str]]:
+        """按 (排序列, id) 游标分页获取项目列表，返回当前页和下一页游标；排序列不能为空值"""
+        columns, descending = self._sort_columns(sort)
+        statement = keyset_paginate(
+            self.apply_filters(select(Project), filters).options(*PROJECT_LIST_OPTIONS),
+            columns,
+            cursor=cursor,
+            limit=limit,
+            descending=descending,
+        )
         projects = self.db.exec(statement).all()
-        # 预加载关系数据
-        for project in projects:
-            self.db.refresh(project)
-        return projects
+        return split_page(projects, limit, lambda project: tuple(getattr(project, c.key) for c in columns))
+
+    # 摘要视图：只查列表需要的列，产品名称在 SQL 中聚合，不加载任何子表行
+    def _summary_statement(self) -> Any:
+        product_names = func.array_remove(
+            func.array_agg(aggregate_order_by(ProjectProduct.product_name, ProjectProduct.product_name)),
+            None,
+        )
+        columns = [
+            Project.id, Project.name, Project.project_type, Project.location, Project.status,
+            Project.contract_amount, Project.created_at, Project.updated_at,
+            product_names.label("product_names"),
+        ]
+        return select(*columns).outerjoin(
+            ProjectProduct, ProjectProduct.project_id == Project.id
+        ).group_by(Project.id)
+
+    def get_project_summary(self, project_id: UUID) -> Optional[Any]:
+        """获取单个项目摘要"""
+        return self.db.exec(self._summary_statement().where(Project.id == project_id)).first()
+
+    def get_project_summaries(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[ProjectFilter] = None,
+        sort: str = "-created_at",
+    ) -> Tuple[List[Any], int]:
+        """获取项目摘要列表和过滤后的总数"""
+        columns, descending = self._sort_columns(sort)
+        statement = (
+            self.apply_filters(self._summary_statement(), filters)
+            .order_by(*self._order_by(sort, columns, descending))
+            .offset(skip)
+            .limit(limit)
+        )
+        rows = self.db.exec(statement).all()
+        return list(rows), self._page_total(skip, limit, len(rows), filters)
+
+    def get_project_summaries_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        filters: Optional[ProjectFilter] = None,
+        sort: str = "-created_at",
+    ) -> Tuple[List[Any], Optional[str]]:
+        """按 (排序列, id) 游标分页获取项目摘要"""
+        columns, descending = self._sort_columns(sort)
+        statement = keyset_paginate(
+            self.apply_filters(self._summary_statement(), filters),
+            columns,
+            cursor=cursor,
+            limit=limit,
+            descending=descending,
+        )
+        rows = self.db.exec(statement).all()
+        return split_page(rows, limit, lambda row: tuple(getattr(row, c.key) for c in columns))
 
     def update_project(self, project_id: UUID, project_data: ProjectUpdate) -> Optional[Project]:
         """更新项目信息"""
-        project = self.get_project(project_id)
-        if not project:
+        locked = self._lock_projects([project_id])
+        if not locked:
             return None
+        project = locked[0]
+        statistics_before = self.statistics.get_contributions([project_id])
 
-        # 处理产品更新
+        # 子表按差量同步：只对变化的行执行 INSERT / UPDATE / DELETE
         if project_data.products is not None:
-            # 删除现有产品
-            statement = select(ProjectProduct).where(ProjectProduct.project_id == project_id)
-            existing_products = self.db.exec(statement).all()
-            for product in existing_products:
-                self.db.delete(product)
-            
-            # 添加新产品
-            for product_data in project_data.products:
-                product_dict = product_data if isinstance(product_data, dict) else product_data.model_dump()
-                product = ProjectProduct(**product_dict, project_id=project_id)
-                self.db.add(product)
-
-        # 处理里程碑更新
+            self._sync_children(ProjectProduct, project_id, project_data.products)
         if project_data.milestones is not None:
-            # 删除现有里程碑
-            statement = select(Milestone).where(Milestone.project_id == project_id)
-            existing_milestones = self.db.exec(statement).all()
-            for milestone in existing_milestones:
-                self.db.delete(milestone)
-            
-            # 添加新里程碑
-            for milestone_data in project_data.milestones:
-                milestone_dict = milestone_data if isinstance(milestone_data, dict) else milestone_data.model_dump()
-                milestone = Milestone(**milestone_dict, project_id=project_id)
-                self.db.add(milestone)
-
-        # 处理角色分配更新
+            self._sync_children(Milestone, project_id, project_data.milestones)
         if project_data.role_assignments is not None:
-            # 删除现有角色分配
-            statement = select(RoleAssignment).where(RoleAssignment.project_id == project_id)
-            existing_roles = self.db.exec(statement).all()
-            for role in existing_roles:
-                self.db.delete(role)
-            
-            # 添加新角色分配
-            for role_data in project_data.role_assignments:
-                role_dict = role_data if isinstance(role_data, dict) else role_data.model_dump()
-                role_assignment = RoleAssignment(**role_dict, project_id=project_id)
-                self.db.add(role_assignment)
+            self._sync_children(RoleAssignment, project_id, project_data.role_assignments)
 
         # 更新项目基本信息
         update_data = project_data.model_dump(exclude_unset=True, exclude={'products', 'milestones', 'role_assignments'})
@@ -127,44 +297,102 @@ class ProjectService:
 
         project.updated_at = datetime.utcnow()
         self.db.add(project)
+        self.db.flush()
+        self.statistics.apply(statistics_before, self.statistics.get_contributions([project_id]))
+        bump_data_version(self.db)
         self.db.commit()
         self.db.refresh(project)
         return project
 
+    def _lock_projects(self, project_ids: List[UUID]) -> List[Project]:
+        """
+        锁定要修改的项目行，返回最新的行
+
+        统计计数按变更前后的贡献差值增减，变更前的贡献必须在持有行锁后读取，
+        否则并发修改同一项目时会重复扣减；按 id 排序加锁，避免批量操作互相死锁。
+        """
+        statement = (
+            select(Project)
+            .where(Project.id.in_(project_ids))
+            .order_by(Project.id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        return list(self.db.exec(statement).all())
+
+    def _sync_children(self, model: type[SQLModel], project_id: UUID, items: List[Any]) -> None:
+        """
+        把提交的子表集合与已有行做差量同步
+
+        先按全部提交字段精确匹配（不改动），再按自然键匹配（只更新变化的字段），
+        剩余的已有行删除、剩余的提交项插入；每类变更各用一条集合语句执行。
+        """
+        table = model.__table__
+        submitted = [item if isinstance(item, dict) else item.model_dump() for item in items]
+        fields = sorted({field for item in submitted for field in item})
+        existing = [
+            dict(row) for row in self.db.execute(
+                select(table).where(table.c.project_id == project_id)
+            ).mappings()
+        ]
+
+        # 精确匹配：内容相同的行保持不变
+        unmatched = []
+        for item in submitted:
+            match = next(
+                (row for row in existing if all(row[f] == item.get(f, row[f]) for f in fields)), None
+            )
+            if match is not None:
+                existing.remove(match)
+            else:
+                unmatched.append(item)
+
+        # 自然键匹配：保留 id，只更新变化的字段
+        natural_key = CHILD_NATURAL_KEYS[model]
+        updates, inserts = [], []
+        for item in unmatched:
+            match = next(
+                (row for row in existing if all(row[k] == item.get(k) for k in natural_key)), None
+            )
+            if match is None:
+                inserts.append(model(**item, project_id=project_id).model_dump())
+                continue
+            existing.remove(match)
+            changes = {f: item[f] for f in item if match[f] != item[f]}
+            if "updated_at" in table.c:
+                changes["updated_at"] = datetime.utcnow()
+            updates.append({"id": match["id"], **changes})
+
+        if existing:
+            self.db.execute(delete(model).where(table.c.id.in_([row["id"] for row in existing])))
+        if updates:
+            # ORM 按主键批量更新，相同字段集合的行合并为 executemany
+            self.db.execute(update(model), updates)
+        if inserts:
+            self.db.execute(insert(model), inserts)
+
     def delete_project(self, project_id: UUID) -> bool:
         """删除项目"""
-        project = self.get_project(project_id)
-        if not project:
-            return False
-
-        # 删除关联的角色分配
-        statement = select(RoleAssignment).where(RoleAssignment.project_id == project_id)
-        role_assignments = self.db.exec(statement).all()
-        for role_assignment in role_assignments:
-            self.db.delete(role_assignment)
-
-        # 删除关联的里程碑
-        statement = select(Milestone).where(Milestone.project_id == project_id)
-        milestones = self.db.exec(statement).all()
-        for milestone in milestones:
-            self.db.delete(milestone)
-
-        # 删除关联的进展
-        statement = select(Progress).where(Progress.project_id == project_id)
-        progresses = self.db.exec(statement).all()
-        for progress in progresses:
-            self.db.delete(progress)
-
-        # 删除关联的项目产品
-        statement = select(ProjectProduct).where(ProjectProduct.project_id == project_id)
-        project_products = self.db.exec(statement).all()
-        for project_product in project_products:
-            self.db.delete(project_product)
-
-        # 删除项目
-        self.db.delete(project)
+        return self.delete_projects([project_id]) > 0
+
+    def delete_projects(self, project_ids: List[UUID]) -> int:
+        """
+        批量删除项目及其子表，返回实际删除的项目数
+
+        子表按 project_id 集合直接 DELETE，不把行加载进会话；所有删除与统计计数扣减在同一事务内完成。
+        """
+        if not project_ids:
+            return 0
+        project_ids = list(set(project_ids))
+        self._lock_projects(project_ids)
+        self.statistics.apply(before=self.statistics.get_contributions(project_ids))
+
+        for model in (RoleAssignment, Milestone, Progress, ProjectProduct):
+            self.db.execute(delete(model).where(model.project_id.in_(project_ids)))
+        result = self.db.execute(delete(Project).where(Project.id.in_(project_ids)))
+        bump_data_version(self.db)
         self.db.commit()
-        return True
+        return result.rowcount
 
     # 角色分配操作
     def add_role_assignment(self, project_id: UUID, role_data: RoleAssignmentCreate) -> Optional[RoleAssignment]:
@@ -175,6 +403,7 @@ class ProjectService:
 
         role_assignment = RoleAssignment(**role_data.model_dump(), project_id=project_id)
         self.db.add(role_assignment)
+        bump_data_version(self.db)
         self.db.commit()
         self.db.refresh(role_assignment)
         return role_assignment
@@ -186,6 +415,7 @@ class ProjectService:
             return False
 
         self.db.delete(role_assignment)
+        bump_data_version(self.db)
         self.db.commit()
         return True
 
@@ -198,6 +428,7 @@ class ProjectService:
 
         milestone = Milestone(**milestone_data.model_dump(), project_id=project_id)
         self.db.add(milestone)
+        bump_data_version(self.db)
         self.db.commit()
         self.db.refresh(milestone)
         return milestone
@@ -214,6 +445,7 @@ class ProjectService:
 
         milestone.updated_at = datetime.utcnow()
         self.db.add(milestone)
+        bump_data_version(self.db)
         self.db.commit()
         self.db.refresh(milestone)
         return milestone
@@ -230,6 +462,7 @@ class ProjectService:
             return False
 
         self.db.delete(milestone)
+        bump_data_version(self.db)
         self.db.commit()
         return True
 
@@ -249,6 +482,7 @@ class ProjectService:
             progress = Progress(**progress_data.model_dump(), project_id=project_id)
             
         self.db.add(progress)
+        bump_data_version(self.db)
         self.db.commit()
         self.db.refresh(progress)
         return progress
@@ -265,49 +499,42 @@ class ProjectService:
 
         progress.updated_at = datetime.utcnow()
         self.db.add(progress)
+        bump_data_version(self.db)
         self.db.commit()
         self.db.refresh(progress)
         return progress
 
-    def get_project_progresses(self, project_id: UUID) -> List[dict]:
-        """获取项目进展列表"""
+    def get_project_progresses(
+        self,
+        project_id: UUID,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        progress_type: Optional[ProgressType] = None,
+        limit: Optional[int] = None,
+    ) -> List[dict]:
+        """获取项目进展列表（按进展日期倒序），跟踪人姓名通过 LEFT JOIN 一次查出"""
         from app.models import User
-        try:
-            # 先获取进展数据
-            progress_statement = select(Progress).where(Progress.project_id == project_id)
-            progresses_data = self.db.exec(progress_statement).all()
-            
-            progresses = []
-            for progress in progresses_data:
-                progress_dict = progress.model_dump()
-                
-                # 单独查询每个进展的跟踪人信息
-                try:
-                    user_statement = select(User.full_name, User.email).where(User.id == progress.tracking_user_id)
-                    user_result = self.db.exec(user_statement).first()
-                    
-                    if user_result:
-                        full_name, email = user_result
-                        display_name = full_name or email or '未知用户'
-                    else:
-                        display_name = '未知用户'
-                except Exception as e:
-                    display_name = '未知用户'
-                
-                progress_dict['tracking_user_name'] = display_name
-                progresses.append(progress_dict)
-            
-            return progresses
-        except Exception as e:
-            # 如果查询失败，返回原始数据
-            statement = select(Progress).where(Progress.project_id == project_id)
-            results = self.db.exec(statement).all()
-            progresses = []
-            for progress in results:
-                progress_dict = progress.model_dump()
-                progress_dict['tracking_user_name'] = '未知用户'
-                progresses.append(progress_dict)
-            return progresses
+        statement = (
+            select(Progress, User.full_name, User.email)
+            .outerjoin(User, User.id == Progress.tracking_user_id)
+            .where(Progress.project_id == project_id)
+        )
+        if start_date is not None:
+            statement = statement.where(Progress.progress_date >= start_date)
+        if end_date is not None:
+            statement = statement.where(Progress.progress_date <= end_date)
+        if progress_type is not None:
+            statement = statement.where(Progress.progress_type == progress_type)
+        statement = statement.order_by(Progress.progress_date.desc(), Progress.id.desc())
+        if limit is not None:
+            statement = statement.limit(limit)
+
+        progresses = []
+        for progress, full_name, email in self.db.exec(statement).all():
+            progress_dict = progress.model_dump()
+            progress_dict['tracking_user_name'] = full_name or email or '未知用户'
+            progresses.append(progress_dict)
+        return progresses
 
     def delete_progress(self, progress_id: UUID) -> bool:
         """删除进展"""
@@ -316,113 +543,6 @@ class ProjectService:
             return False
 
         self.db.delete(progress)
+        bump_data_version(self.db)
         self.db.commit()
         return True
-
-    # 统计功能
-    def get_project_statistics(self) -> ProjectStatistics:
-        """获取项目统计信息（只统计非关闭项目）"""
-        # 按区域统计（排除关闭项目，只统计正常和完成状态的项目）
-        location_stats = []
-        statement = select(Project.location, func.count(Project.id)).where(
-            or_(Project.status == '正常', Project.status == '完成', Project.status.is_(None))
-        ).group_by(Project.location)
-        results = self.db.exec(statement).all()
-        for location, count in results:
-            location_stats.append(ProjectCountByLocation(location=location, count=count))
-
-        # 按产品统计 - 统计每个产品涉及的去重项目数（排除关闭项目）
-        product_stats = []
-        # 使用 distinct 统计每个产品名称对应的不同项目数量，需要join Project表来过滤状态
-        statement = select(
-            ProjectProduct.product_name, 
-            func.count(func.distinct(ProjectProduct.project_id))
-        ).join(
-            Project, Project.id == ProjectProduct.project_id
-        ).where(
-            or_(Project.status == '正常', Project.status == '完成', Project.status.is_(None))
-        ).group_by(ProjectProduct.product_name)
-        results = self.db.exec(statement).all()
-        for product_name, count in results:
-            product_stats.append(ProjectCountByProduct(product=product_name, count=count))
-
-        # 按项目类型统计（排除关闭项目，只统计正常和完成状态的项目）
-        type_stats = []
-        statement = select(Project.project_type, func.count(Project.id)).where(
-            or_(Project.status == '正常', Project.status == '完成', Project.status.is_(None))
-        ).group_by(Project.project_type)
-        results = self.db.exec(statement).all()
-        for project_type, count in results:
-            type_stats.append(ProjectCountByType(project_type=project_type, count=count))
-
-        # 总项目数（排除关闭项目，只统计正常和完成状态的项目）
-        statement = select(func.count(Project.id)).where(
-            or_(Project.status == '正常', Project.status == '完成', Project.status.is_(None))
-        )
-        total_projects = self.db.exec(statement).one()
-
-        return ProjectStatistics(
-            by_location=location_stats,
-            by_product=product_stats,
-            by_type=type_stats,
-            total_projects=total_projects,
-            total_contract_amount=0  # 不再计算合同总金额
-        )
-
-    def get_location_product_relationship(self) -> List[Dict[str, Any]]:
-        """获取区域-产品关联数据，用于桑基图（只统计非关闭项目）"""
-        # 查询项目、区域和产品的关联数据（排除关闭项目）
-        statement = select(
-            Project.location,
-            ProjectProduct.product_name,
-            func.count(ProjectProduct.id).label('count')
-        ).join(
-            ProjectProduct, Project.id == ProjectProduct.project_id
-        ).where(
-            or_(Project.status == '正常', Project.status == '完成', Project.status.is_(None))
-        ).group_by(
-            Project.location, ProjectProduct.product_name
-        )
-        
-        results = self.db.exec(statement).all()
-        relationship_data = []
-        
-        for location, product_name, count in results:
-            relationship_data.append({
-                'location': location,
-                'product': product_name,
-                'count': count
-            })
-        
-        return relationship_data
-
-    def get_product_type_statistics(self) -> List[Dict[str, Any]]:
-        """获取按产品和项目类型的统计数据（只统计非关闭项目）"""
-        # 查询项目、产品和项目类型的关联数据（排除关闭项目）
-        statement = select(
-            ProjectProduct.product_name,
-            Project.project_type,
-            func.count(func.distinct(ProjectProduct.project_id)).label('count')
-        ).join(
-            Project, Project.id == ProjectProduct.project_id
-        ).where(
-            or_(Project.status == '正常', Project.status == '完成', Project.status.is_(None))
-        ).group_by(
-            ProjectProduct.product_name, Project.project_type
-        )
-        
-        results = self.db.exec(statement).all()
-        # 按产品名称组织数据
-        product_type_data = {}
-        
-        for product_name, project_type, count in results:
-            if product_name not in product_type_data:
-                product_type_data[product_name] = {
-                    'product': product_name,
-                    '机会点': 0,
-                    '交付': 0,
-                    'PoC': 0
-                }
-            product_type_data[product_name][project_type] = count
-        
-        return list(product_type_data.values())
@@ -0,0 +1,187 @@
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, func, literal, literal_column, or_, text, union_all
+from sqlmodel import Session, select
+
+from app.models_pm import Milestone, Progress, Project
+from app.schemas_pm import ProjectSearchHit, ProjectSearchPage
+
+# 与迁移 e7c2d9a3b514 中生成列使用的配置一致
+SEARCH_CONFIG = literal_column("'simple'::regconfig")
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=30, MinWords=10, MaxFragments=2"
+
+# 进程内检索的字段权重，与 ts_rank 默认的 A/B/D 权重一致
+NAME_WEIGHT = 1.0
+BACKGROUND_WEIGHT = 0.4
+DESCRIPTION_WEIGHT = 0.1
+SNIPPET_CONTEXT = 40
+
+
+@dataclass(frozen=True)
+class SearchSupport:
+    """数据库是否具备全文检索列 / pg_trgm 扩展"""
+    fulltext: bool = False
+    trigram: bool = False
+
+
+_support_cache: Dict[str, SearchSupport] = {}
+
+
+def detect_search_support(db: Session) -> SearchSupport:
+    """检测并缓存当前数据库的检索能力，每个数据库只查询一次"""
+    bind = db.get_bind()
+    key = str(bind.url)
+    if key not in _support_cache:
+        if bind.dialect.name != "postgresql":
+            _support_cache[key] = SearchSupport()
+        else:
+            tables = db.execute(text(
+                "SELECT table_name FROM information_schema.columns "
+                "WHERE table_schema = current_schema() AND column_name = 'search_vector' "
+                "AND table_name IN ('project', 'progress', 'milestone')"
+            )).scalars().all()
+            trigram = db.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")).first()
+            _support_cache[key] = SearchSupport(fulltext=len(set(tables)) == 3, trigram=trigram is not None)
+    return _support_cache[key]
+
+
+def highlight(content: str, terms: List[str]) -> str:
+    """截取第一个关键词附近的片段，并用 <mark></mark> 标出所有关键词"""
+    pattern = re.compile("|".join(re.escape(term) for term in terms), re.IGNORECASE)
+    match = pattern.search(content)
+    start = max(match.start() - SNIPPET_CONTEXT, 0) if match else 0
+    end = min((match.end() if match else 0) + SNIPPET_CONTEXT, len(content))
+    snippet = pattern.sub(lambda m: f"<mark>{m.group(0)}</mark>", content[start:end])
+    return ("…" if start > 0 else "") + snippet + ("…" if end < len(content) else "")
+
+
+class ProjectSearchService:
+    """
+    项目检索：项目名称/背景、进展描述、里程碑描述
+
+    PostgreSQL 且已执行检索迁移时使用 tsvector + GIN 索引排序并由 ts_headline 生成片段，
+    项目名称另外用 pg_trgm 支持中文子串匹配；否则退化为 ILIKE 过滤后在进程内打分，
+    供未执行该迁移的数据库和小数据量环境使用。
+    """
+
+    def __init__(self, db: Session, support: Optional[SearchSupport] = None):
+        self.db = db
+        self.support = support if support is not None else detect_search_support(db)
+
+    def search(self, q: str, limit: int = 20, offset: int = 0) -> ProjectSearchPage:
+        q = q.strip()
+        if not q:
+            return ProjectSearchPage(data=[])
+        if self.support.fulltext:
+            hits = self._search_fulltext(q, limit + 1, offset)
+        else:
+            hits = self._search_in_process(q, limit + 1, offset)
+        next_offset = offset + limit if len(hits) > limit else None
+        return ProjectSearchPage(data=hits[:limit], next_offset=next_offset)
+
+    def _search_fulltext(self, q: str, limit: int, offset: int) -> List[ProjectSearchHit]:
+        query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+        project_vector = literal_column("project.search_vector")
+        progress_vector = literal_column("progress.search_vector")
+        milestone_vector = literal_column("milestone.search_vector")
+
+        project_match = project_vector.op("@@")(query)
+        project_rank = func.ts_rank(project_vector, query)
+        if self.support.trigram:
+            # ILIKE 可以使用 gin_trgm_ops 索引
+            project_match = or_(project_match, Project.name.icontains(q, autoescape=True))
+            project_rank = project_rank + func.similarity(Project.name, q)
+
+        projects = select(
+            Project.id.label("project_id"),
+            Project.name.label("project_name"),
+            literal("project").label("source"),
+            Project.id.label("source_id"),
+            project_rank.label("rank"),
+            func.concat_ws(" ", Project.name, Project.background).label("content"),
+        ).where(project_match)
+        progresses = select(
+            Progress.project_id,
+            Project.name,
+            literal("progress"),
+            Progress.id,
+            func.ts_rank(progress_vector, query),
+            Progress.description,
+        ).join(Project, Project.id == Progress.project_id).where(progress_vector.op("@@")(query))
+        milestones = select(
+            Milestone.project_id,
+            Project.name,
+            literal("milestone"),
+            Milestone.id,
+            func.ts_rank(milestone_vector, query),
+            Milestone.description,
+        ).join(Project, Project.id == Milestone.project_id).where(milestone_vector.op("@@")(query))
+
+        hits = union_all(projects, progresses, milestones).subquery()
+        page = (
+            select(hits)
+            .order_by(hits.c.rank.desc(), hits.c.source_id)
+            .offset(offset)
+            .limit(limit)
+            .subquery()
+        )
+        # 片段只对当前页的命中生成
+        statement = select(
+            page.c.project_id,
+            page.c.project_name,
+            page.c.source,
+            page.c.source_id,
+            page.c.rank,
+            func.ts_headline(SEARCH_CONFIG, page.c.content, query, HEADLINE_OPTIONS),
+        ).order_by(page.c.rank.desc(), page.c.source_id)
+        return [
+            ProjectSearchHit(
+                project_id=project_id,
+                project_name=project_name,
+                source=source,
+                source_id=source_id,
+                rank=rank,
+                snippet=snippet,
+            )
+            for project_id, project_name, source, source_id, rank, snippet in self.db.execute(statement).all()
+        ]
+
+    def _search_in_process(self, q: str, limit: int, offset: int) -> List[ProjectSearchHit]:
+        terms = [term for term in q.split() if term]
+
+        def matches_all(*columns):  # type: ignore[no-untyped-def]
+            return and_(*[
+                or_(*[column.icontains(term, autoescape=True) for column in columns]) for term in terms
+            ])
+
+        def score(content: Optional[str], weight: float) -> float:
+            content = (content or "").lower()
+            return weight * sum(content.count(term.lower()) for term in terms)
+
+        hits: List[Tuple[float, ProjectSearchHit]] = []
+        for project_id, name, background in self.db.execute(
+            select(Project.id, Project.name, Project.background).where(
+                matches_all(Project.name, Project.background)
+            )
+        ).all():
+            content = " ".join(part for part in (name, background) if part)
+            rank = score(name, NAME_WEIGHT) + score(background, BACKGROUND_WEIGHT)
+            hits.append((rank, ProjectSearchHit(
+                project_id=project_id, project_name=name, source="project", source_id=project_id,
+                rank=rank, snippet=highlight(content, terms),
+            )))
+        for model, source in ((Progress, "progress"), (Milestone, "milestone")):
+            statement = select(model.id, model.project_id, Project.name, model.description).join(
+                Project, Project.id == model.project_id
+            ).where(matches_all(model.description))
+            for source_id, project_id, name, description in self.db.execute(statement).all():
+                rank = score(description, DESCRIPTION_WEIGHT)
+                hits.append((rank, ProjectSearchHit(
+                    project_id=project_id, project_name=name, source=source, source_id=source_id,
+                    rank=rank, snippet=highlight(description, terms),
+                )))
+
+        hits.sort(key=lambda hit: (-hit[0], str(hit[1].source_id)))
+        return [hit for _, hit in hits[offset:offset + limit]]
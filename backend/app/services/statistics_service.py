@@ -0,0 +1,271 @@
+from collections import Counter
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import delete, literal, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, select, func
+
+from app.models_pm import Project, ProjectProduct, ProjectStatCounter, ProjectStatus
+from app.schemas_pm import (
+    ProjectStatistics, ProjectCountByLocation, ProjectCountByProduct, ProjectCountByType, ProjectDashboard
+)
+from app.services.data_version import bump_data_version
+
+# 统计只包含正常和完成状态的项目（排除关闭项目）
+STATISTICS_STATUSES = (ProjectStatus.NORMAL.value, ProjectStatus.COMPLETED.value)
+
+# 计数键：(location, project_type, status, product_name)，product_name 为空表示项目级计数
+CounterKey = Tuple[str, str, str, str]
+
+
+def project_contribution(
+    location: str, project_type: str, status: str, product_names: Iterable[str]
+) -> Counter:
+    """计算单个项目对统计计数表的贡献，返回 {(key, 字段): 数量}"""
+    contribution: Counter = Counter()
+    contribution[((location, project_type, status, ""), "project_count")] += 1
+    for product_name in product_names:
+        key = (location, project_type, status, product_name)
+        contribution[(key, "product_count")] += 1
+        contribution[(key, "project_count")] = 1  # 同一项目的同名产品只计一次
+    return contribution
+
+
+class ProjectStatisticsService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    # 增量维护
+    def get_contributions(self, project_ids: List[UUID]) -> Counter:
+        """从数据库读取一批项目当前对计数表的贡献"""
+        if not project_ids:
+            return Counter()
+        statement = (
+            select(Project.id, Project.location, Project.project_type, Project.status, ProjectProduct.product_name)
+            .outerjoin(ProjectProduct, ProjectProduct.project_id == Project.id)
+            .where(Project.id.in_(project_ids))
+        )
+        projects: Dict[UUID, Tuple[str, str, str, List[str]]] = {}
+        for project_id, location, project_type, status, product_name in self.db.exec(statement).all():
+            entry = projects.setdefault(project_id, (location, project_type, status, []))
+            if product_name is not None:
+                entry[3].append(product_name)
+
+        contributions: Counter = Counter()
+        for location, project_type, status, product_names in projects.values():
+            contributions.update(project_contribution(location, project_type, status, product_names))
+        return contributions
+
+    def apply(self, before: Optional[Counter] = None, after: Optional[Counter] = None) -> None:
+        """把项目变更前后的贡献差值累加到计数表（在调用方的事务内，不提交）"""
+        delta: Counter = Counter(after or {})
+        delta.subtract(before or {})
+
+        rows: Dict[CounterKey, Dict[str, Any]] = {}
+        for (key, field), value in delta.items():
+            if value:
+                row = rows.setdefault(key, {"project_count": 0, "product_count": 0})
+                row[field] += value
+        if not rows:
+            return
+
+        # 按主键排序写入，避免并发事务交叉加锁造成死锁
+        values = [
+            {
+                "location": location,
+                "project_type": project_type,
+                "status": status,
+                "product_name": product_name,
+                **counts,
+            }
+            for (location, project_type, status, product_name), counts in sorted(rows.items())
+        ]
+        statement = insert(ProjectStatCounter).values(values)
+        statement = statement.on_conflict_do_update(
+            index_elements=["location", "project_type", "status", "product_name"],
+            set_={
+                "project_count": ProjectStatCounter.project_count + statement.excluded.project_count,
+                "product_count": ProjectStatCounter.product_count + statement.excluded.product_count,
+            },
+        )
+        self.db.execute(statement)
+
+    def rebuild(self) -> None:
+        """根据 project / project_product 全量重建计数表，用于修复漂移"""
+        columns = ["location", "project_type", "status", "product_name", "project_count", "product_count"]
+        project_level = select(
+            Project.location,
+            Project.project_type,
+            Project.status,
+            literal(""),
+            func.count(Project.id),
+            literal(0),
+        ).group_by(Project.location, Project.project_type, Project.status)
+        product_level = select(
+            Project.location,
+            Project.project_type,
+            Project.status,
+            ProjectProduct.product_name,
+            func.count(func.distinct(Project.id)),
+            func.count(ProjectProduct.id),
+        ).join(
+            ProjectProduct, ProjectProduct.project_id == Project.id
+        ).group_by(Project.location, Project.project_type, Project.status, ProjectProduct.product_name)
+
+        self.db.execute(delete(ProjectStatCounter))
+        self.db.execute(insert(ProjectStatCounter).from_select(columns, project_level))
+        self.db.execute(insert(ProjectStatCounter).from_select(columns, product_level))
+        bump_data_version(self.db)
+        self.db.commit()
+
+    # 查询
+    def _counters(self, *columns: Any, product_level: bool):
+        product_filter = (
+            ProjectStatCounter.product_name != "" if product_level else ProjectStatCounter.product_name == ""
+        )
+        return select(*columns).where(
+            ProjectStatCounter.status.in_(STATISTICS_STATUSES), product_filter
+        )
+
+    def get_project_statistics(self) -> ProjectStatistics:
+        """获取项目统计信息（只统计非关闭项目）"""
+        projects = func.sum(ProjectStatCounter.project_count)
+
+        statement = self._counters(ProjectStatCounter.location, projects, product_level=False).group_by(
+            ProjectStatCounter.location
+        ).having(projects > 0)
+        location_stats = [
+            ProjectCountByLocation(location=location, count=count)
+            for location, count in self.db.exec(statement).all()
+        ]
+
+        statement = self._counters(ProjectStatCounter.product_name, projects, product_level=True).group_by(
+            ProjectStatCounter.product_name
+        ).having(projects > 0)
+        product_stats = [
+            ProjectCountByProduct(product=product_name, count=count)
+            for product_name, count in self.db.exec(statement).all()
+        ]
+
+        statement = self._counters(ProjectStatCounter.project_type, projects, product_level=False).group_by(
+            ProjectStatCounter.project_type
+        ).having(projects > 0)
+        type_stats = [
+            ProjectCountByType(project_type=project_type, count=count)
+            for project_type, count in self.db.exec(statement).all()
+        ]
+
+        statement = self._counters(func.coalesce(projects, 0), product_level=False)
+        total_projects = self.db.exec(statement).one()
+
+        return ProjectStatistics(
+            by_location=location_stats,
+            by_product=product_stats,
+            by_type=type_stats,
+            total_projects=total_projects,
+            total_contract_amount=0  # 不再计算合同总金额
+        )
+
+    def get_location_product_relationship(self) -> List[Dict[str, Any]]:
+        """获取区域-产品关联数据，用于桑基图（只统计非关闭项目）"""
+        products = func.sum(ProjectStatCounter.product_count)
+        statement = self._counters(
+            ProjectStatCounter.location, ProjectStatCounter.product_name, products, product_level=True
+        ).group_by(
+            ProjectStatCounter.location, ProjectStatCounter.product_name
+        ).having(products > 0)
+        return [
+            {'location': location, 'product': product_name, 'count': count}
+            for location, product_name, count in self.db.exec(statement).all()
+        ]
+
+    def get_product_type_statistics(self) -> List[Dict[str, Any]]:
+        """获取按产品和项目类型的统计数据（只统计非关闭项目）"""
+        projects = func.sum(ProjectStatCounter.project_count)
+        statement = self._counters(
+            ProjectStatCounter.product_name, ProjectStatCounter.project_type, projects, product_level=True
+        ).group_by(
+            ProjectStatCounter.product_name, ProjectStatCounter.project_type
+        ).having(projects > 0)
+
+        return self._pivot_product_type(self.db.exec(statement).all())
+
+    @staticmethod
+    def _pivot_product_type(rows: Iterable[Tuple[str, str, int]]) -> List[Dict[str, Any]]:
+        """把 (产品, 项目类型, 项目数) 行按产品名称组织为矩阵"""
+        product_type_data = {}
+        for product_name, project_type, count in rows:
+            if product_name not in product_type_data:
+                product_type_data[product_name] = {
+                    'product': product_name,
+                    '机会点': 0,
+                    '交付': 0,
+                    'PoC': 0
+                }
+            product_type_data[product_name][project_type] = count
+        return list(product_type_data.values())
+
+    def get_dashboard(self) -> ProjectDashboard:
+        """
+        一次查询计算看板所需的全部统计（只统计非关闭项目）
+
+        用 GROUPING SETS 在计数表上一遍算出属地、产品、类型、总数、属地×产品和产品×类型，
+        项目级计数行（product_name 为空）和产品级计数行用 FILTER 区分。
+        """
+        counter = ProjectStatCounter
+        is_project_row = counter.product_name == ""
+        projects = func.sum(counter.project_count).filter(is_project_row)
+        product_projects = func.sum(counter.project_count).filter(~is_project_row)
+        product_rows = func.sum(counter.product_count).filter(~is_project_row)
+        grouping = func.grouping(counter.location, counter.product_name, counter.project_type)
+        statement = select(
+            grouping, counter.location, counter.product_name, counter.project_type,
+            projects, product_projects, product_rows,
+        ).where(
+            counter.status.in_(STATISTICS_STATUSES)
+        ).group_by(
+            func.grouping_sets(
+                tuple_(counter.location),
+                tuple_(counter.product_name),
+                tuple_(counter.project_type),
+                tuple_(counter.location, counter.product_name),
+                tuple_(counter.product_name, counter.project_type),
+                tuple_(),
+            )
+        )
+
+        # grouping() 的位依次对应 location、product_name、project_type，置 1 表示该列未参与分组
+        location_stats: List[ProjectCountByLocation] = []
+        product_stats: List[ProjectCountByProduct] = []
+        type_stats: List[ProjectCountByType] = []
+        location_product: List[Dict[str, Any]] = []
+        product_type_rows: List[Tuple[str, str, int]] = []
+        total_projects = 0
+        for grouped, location, product_name, project_type, project_count, product_project_count, product_count in (
+            self.db.exec(statement).all()
+        ):
+            if grouped == 0b011 and project_count:
+                location_stats.append(ProjectCountByLocation(location=location, count=project_count))
+            elif grouped == 0b101 and product_name and product_project_count:
+                product_stats.append(ProjectCountByProduct(product=product_name, count=product_project_count))
+            elif grouped == 0b110 and project_count:
+                type_stats.append(ProjectCountByType(project_type=project_type, count=project_count))
+            elif grouped == 0b001 and product_name and product_count:
+                location_product.append({'location': location, 'product': product_name, 'count': product_count})
+            elif grouped == 0b100 and product_name and product_project_count:
+                product_type_rows.append((product_name, project_type, product_project_count))
+            elif grouped == 0b111:
+                total_projects = project_count or 0
+
+        return ProjectDashboard(
+            statistics=ProjectStatistics(
+                by_location=location_stats,
+                by_product=product_stats,
+                by_type=type_stats,
+                total_projects=total_projects,
+                total_contract_amount=0,
+            ),
+            location_product=location_product,
+            product_type=self._pivot_product_type(product_type_rows),
+        )
@@ -0,0 +1,99 @@
+import asyncio
+import logging
+import uuid
+from typing import Any
+
+import psycopg
+from sqlalchemy import func
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import make_transient_to_detached
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models import User
+from app.services.data_version import USERS_DATA_VERSION, bump_data_version
+from app.services.permission_cache import permission_cache
+
+logger = logging.getLogger(__name__)
+
+# 用户变更通过 PostgreSQL NOTIFY 广播，每个 worker LISTEN 后清除自己的缓存
+USER_CHANGED_CHANNEL = "user_changed"
+LISTEN_RETRY_SECONDS = 5
+
+# 快照不含密码哈希：校验密码时访问 hashed_password 会从数据库读取
+CACHED_EXCLUDE = {"hashed_password"}
+
+# 只缓存活跃用户的列快照（不缓存 ORM 实例，避免跨会话共享对象）
+user_cache: TTLCache[str, dict[str, Any]] = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS
+)
+
+
+def get_user(session: Session, user_id: uuid.UUID | str) -> User | None:
+    """
+    按 id 获取用户，命中缓存时不访问数据库
+
+    命中时用快照构造一个"已持久化、未修改"的实例并并入当前会话，
+    后续的修改、删除和关系加载与 session.get 得到的对象行为一致。
+    其他 worker 中的变更经 NOTIFY 立即生效；监听断开时最迟 TTL 秒后生效。
+    """
+    key = str(user_id)
+    data = user_cache.get(key)
+    if data is None:
+        user = session.get(User, user_id)
+        if user is not None and user.is_active:
+            user_cache.set(key, user.model_dump(exclude=CACHED_EXCLUDE))
+        return user
+    user = User(**data)
+    make_transient_to_detached(user)
+    return session.merge(user, load=False)
+
+
+async def get_user_async(session: AsyncSession, user_id: uuid.UUID | str) -> User | None:
+    """get_user 的异步版本，供运行在 AsyncSession 上的接口使用"""
+    key = str(user_id)
+    data = user_cache.get(key)
+    if data is None:
+        user = await session.get(User, user_id)
+        if user is not None and user.is_active:
+            user_cache.set(key, user.model_dump(exclude=CACHED_EXCLUDE))
+        return user
+    user = User(**data)
+    make_transient_to_detached(user)
+    return await session.merge(user, load=False)
+
+
+def invalidate_user(session: Session, user_id: uuid.UUID | str) -> None:
+    """
+    在用户变更提交之后调用：清除本进程的缓存，通知其他 worker 清除，并递增用户数据版本
+
+    NOTIFY 和版本递增在单独的小事务中提交，其他 worker 收到通知时变更一定已经可见。
+    """
+    key = str(user_id)
+    user_cache.invalidate(key)
+    session.execute(select(func.pg_notify(USER_CHANGED_CHANNEL, key)))
+    bump_data_version(session, USERS_DATA_VERSION)
+    session.commit()
+
+
+async def listen_for_user_changes() -> None:
+    """
+    LISTEN 用户变更通知并清除本进程的缓存条目，作为应用生命周期内的后台任务运行
+
+    使用独立连接，不占用连接池；断线后重连，重连时清空缓存，断线期间错过的通知不会留下过期条目。
+    """
+    url = make_url(str(settings.SQLALCHEMY_DATABASE_URI)).set(drivername="postgresql")
+    conninfo = url.render_as_string(hide_password=False)
+    while True:
+        try:
+            async with await psycopg.AsyncConnection.connect(conninfo, autocommit=True) as connection:
+                await connection.execute(f"LISTEN {USER_CHANGED_CHANNEL}")
+                user_cache.clear()
+                async for notify in connection.notifies():
+                    user_cache.invalidate(notify.payload)
+                    permission_cache.invalidate(notify.payload)
+        except psycopg.Error:
+            logger.exception("Listening for user changes failed, reconnecting")
+        await asyncio.sleep(LISTEN_RETRY_SECONDS)
@@ -0,0 +1,160 @@
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app import crud
+from app.core.config import settings
+from app.models import UserUpdate
+from app.models_pm import MilestoneStatus
+from app.schemas_pm import MilestoneCreate, ProgressCreate
+from app.services.project_service import ProjectService
+from tests.utils.project import create_random_project
+from tests.utils.user import create_random_user
+from tests.utils.utils import random_lower_string
+
+
+def test_projects_created_per_week_by_location(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    location = random_lower_string()
+    for _ in range(3):
+        create_random_project(db, location=location)
+    response = client.get(
+        f"{settings.API_V1_STR}/analytics/projects-created",
+        headers=superuser_token_headers,
+        params={"location": location},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["granularity"] == "week"
+    assert len(content["data"]) == 1
+    point = content["data"][0]
+    assert point["location"] == location
+    assert point["count"] == 3
+    bucket = datetime.fromisoformat(point["bucket"])
+    assert bucket.weekday() == 0 and bucket.hour == 0
+
+
+def test_milestone_rates_per_month(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    # future dates, so the overdue job leaves the NORMAL milestones alone
+    year = datetime.utcnow().year + 2
+    location = random_lower_string()
+    project = create_random_project(db, location=location, milestones=0)
+    service = ProjectService(db)
+    for day, status in (
+        (3, MilestoneStatus.COMPLETED),
+        (10, MilestoneStatus.DELAYED),
+        (20, MilestoneStatus.NORMAL),
+        (25, MilestoneStatus.COMPLETED),
+    ):
+        service.add_milestone(
+            project.id,
+            MilestoneCreate(
+                milestone_date=datetime(year, 3, day), description=random_lower_string(), status=status
+            ),
+        )
+    service.add_milestone(
+        project.id,
+        MilestoneCreate(milestone_date=datetime(year, 4, 2), description=random_lower_string()),
+    )
+
+    response = client.get(
+        f"{settings.API_V1_STR}/analytics/milestone-rates",
+        headers=superuser_token_headers,
+        params={"location": location},
+    )
+    assert response.status_code == 200
+    march, april = response.json()["data"]
+    assert datetime.fromisoformat(march["bucket"]) == datetime(year, 3, 1)
+    assert (march["total"], march["completed"], march["delayed"]) == (4, 2, 1)
+    assert march["completion_rate"] == 0.5
+    assert march["delay_rate"] == 0.25
+    assert (april["total"], april["completed"], april["delay_rate"]) == (1, 0, 0)
+
+    response = client.get(
+        f"{settings.API_V1_STR}/analytics/milestone-rates",
+        headers=superuser_token_headers,
+        params={"location": location, "granularity": "year", "end_date": f"{year}-04-01T00:00:00"},
+    )
+    assert [point["total"] for point in response.json()["data"]] == [4]
+
+
+def test_progress_velocity_per_user(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    location = random_lower_string()
+    project = create_random_project(db, location=location)
+    users = [create_random_user(db) for _ in range(2)]
+    service = ProjectService(db)
+    for user, day in ((users[0], 1), (users[0], 2), (users[1], 2), (users[0], 9)):
+        service.add_progress(
+            project.id,
+            ProgressCreate(
+                description=random_lower_string(),
+                tracking_user_id=user.id,
+                progress_date=datetime(2024, 1, day, 12),
+            ),
+        )
+
+    response = client.get(
+        f"{settings.API_V1_STR}/analytics/progress-velocity",
+        headers=superuser_token_headers,
+        params={"location": location, "granularity": "day", "start_date": "2024-01-02T00:00:00"},
+    )
+    assert response.status_code == 200
+    points = {
+        (point["bucket"][:10], point["user_id"]): point["count"] for point in response.json()["data"]
+    }
+    assert points == {
+        ("2024-01-02", str(users[0].id)): 1,
+        ("2024-01-02", str(users[1].id)): 1,
+        ("2024-01-09", str(users[0].id)): 1,
+    }
+    assert all(point["user_name"] for point in response.json()["data"])
+
+
+def test_progress_velocity_etag_follows_user_names(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    location = random_lower_string()
+    project = create_random_project(db, location=location)
+    user = create_random_user(db)
+    ProjectService(db).add_progress(
+        project.id,
+        ProgressCreate(description=random_lower_string(), tracking_user_id=user.id),
+    )
+    url = f"{settings.API_V1_STR}/analytics/progress-velocity"
+    response = client.get(url, headers=superuser_token_headers, params={"location": location})
+    etag = response.headers["etag"]
+    response = client.get(
+        url, headers={**superuser_token_headers, "If-None-Match": etag}, params={"location": location}
+    )
+    assert response.status_code == 304
+
+    full_name = random_lower_string()
+    crud.update_user(session=db, db_user=user, user_in=UserUpdate(full_name=full_name))
+    response = client.get(
+        url, headers={**superuser_token_headers, "If-None-Match": etag}, params={"location": location}
+    )
+    assert response.status_code == 200
+    assert [point["user_name"] for point in response.json()["data"]] == [full_name]
+
+
+def test_analytics_rejects_unknown_granularity(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/analytics/projects-created",
+        headers=superuser_token_headers,
+        params={"granularity": "minute"},
+    )
+    assert response.status_code == 422
+
+
+def test_analytics_require_a_user(client: TestClient) -> None:
+    for path in ("projects-created", "milestone-rates", "progress-velocity"):
+        response = client.get(f"{settings.API_V1_STR}/analytics/{path}")
+        assert response.status_code == 401
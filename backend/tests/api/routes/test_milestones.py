@@ -0,0 +1,182 @@
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.pagination import encode_cursor
+from app.core.db import engine
+from app.models_pm import Milestone, MilestoneStatus
+from app.schemas_pm import MilestoneCreate
+from app.services.milestone_service import MilestoneService
+from app.services.project_service import ProjectService
+from tests.utils.project import create_random_project
+from tests.utils.utils import count_queries, random_lower_string
+
+
+def add_milestone(db: Session, project_id, days: int, status=MilestoneStatus.NORMAL) -> Milestone:
+    return ProjectService(db).add_milestone(
+        project_id,
+        MilestoneCreate(
+            milestone_date=datetime.utcnow() + timedelta(days=days),
+            description=random_lower_string(),
+            status=status,
+        ),
+    )
+
+
+def test_mark_overdue_milestones_in_batches(db: Session) -> None:
+    project = create_random_project(db, milestones=0)
+    overdue = [add_milestone(db, project.id, -days) for days in (1, 2, 3)]
+    done = add_milestone(db, project.id, -4, MilestoneStatus.COMPLETED)
+    upcoming = add_milestone(db, project.id, 5)
+
+    with Session(engine) as session, count_queries(engine) as statements:
+        marked = MilestoneService(session).mark_overdue(batch_size=2)
+    assert marked >= 3
+    updates = [s for s in statements if s.startswith("UPDATE milestone")]
+    assert len(updates) >= 2
+    assert all("FOR UPDATE SKIP LOCKED" in s for s in updates)
+
+    statuses = dict(
+        db.exec(
+            select(Milestone.id, Milestone.status).where(
+                Milestone.id.in_([m.id for m in (*overdue, done, upcoming)])
+            ).execution_options(populate_existing=True)
+        ).all()
+    )
+    assert [statuses[m.id] for m in overdue] == [MilestoneStatus.DELAYED] * 3
+    assert statuses[done.id] == MilestoneStatus.COMPLETED
+    assert statuses[upcoming.id] == MilestoneStatus.NORMAL
+
+    # nothing left to do: one UPDATE that finds no candidates
+    with Session(engine) as session, count_queries(engine) as statements:
+        assert MilestoneService(session).mark_overdue() == 0
+    assert len([s for s in statements if s.startswith("UPDATE")]) == 1
+
+
+def test_read_overdue_milestones(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    location = random_lower_string()
+    project = create_random_project(db, location=location, milestones=0)
+    delayed = add_milestone(db, project.id, -10, MilestoneStatus.DELAYED)
+    pending = add_milestone(db, project.id, -3)
+    add_milestone(db, project.id, -5, MilestoneStatus.COMPLETED)
+    add_milestone(db, project.id, 3)
+
+    ids: list[str] = []
+    cursor = ""
+    while cursor is not None:
+        response = client.get(
+            f"{settings.API_V1_STR}/milestones/overdue",
+            headers=superuser_token_headers,
+            params={"cursor": cursor, "limit": 1, "location": location},
+        )
+        assert response.status_code == 200
+        page = response.json()
+        ids.extend(milestone["id"] for milestone in page["data"])
+        cursor = page["next_cursor"]
+    assert ids == [str(delayed.id), str(pending.id)]
+
+    response = client.get(
+        f"{settings.API_V1_STR}/milestones/overdue",
+        headers=superuser_token_headers,
+        params={"location": location},
+    )
+    first = response.json()["data"][0]
+    assert first["project_name"] == project.name
+    assert first["days_overdue"] == 10
+
+
+def test_mark_overdue_milestones_requires_superuser(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    normal_user_token_headers: dict[str, str],
+) -> None:
+    response = client.post(
+        f"{settings.API_V1_STR}/milestones/overdue/mark", headers=normal_user_token_headers
+    )
+    assert response.status_code == 403
+    response = client.post(
+        f"{settings.API_V1_STR}/milestones/overdue/mark", headers=superuser_token_headers
+    )
+    assert response.status_code == 200
+    assert response.json()["marked"] >= 0
+
+
+def test_read_milestone_calendar(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    location = random_lower_string()
+    projects = [create_random_project(db, location=location, milestones=0) for _ in range(2)]
+    in_window = [
+        add_milestone(db, projects[0].id, 40),
+        add_milestone(db, projects[1].id, 41, MilestoneStatus.COMPLETED),
+        add_milestone(db, projects[0].id, 42, MilestoneStatus.DELAYED),
+    ]
+    add_milestone(db, projects[1].id, 60)
+    start = (datetime.utcnow() + timedelta(days=39)).isoformat()
+    end = (datetime.utcnow() + timedelta(days=50)).isoformat()
+
+    milestones: list[dict] = []
+    cursor = ""
+    while cursor is not None:
+        response = client.get(
+            f"{settings.API_V1_STR}/milestones/",
+            headers=superuser_token_headers,
+            params={
+                "start_date": start, "end_date": end, "location": location,
+                "cursor": cursor, "limit": 2,
+            },
+        )
+        assert response.status_code == 200
+        page = response.json()
+        milestones.extend(page["data"])
+        cursor = page["next_cursor"]
+    assert [m["id"] for m in milestones] == [str(m.id) for m in in_window]
+    names = {str(p.id): p.name for p in projects}
+    assert all(m["project_name"] == names[m["project_id"]] for m in milestones)
+
+    response = client.get(
+        f"{settings.API_V1_STR}/milestones/",
+        headers=superuser_token_headers,
+        params=[
+            ("start_date", start), ("end_date", end), ("location", location),
+            ("status", MilestoneStatus.NORMAL.value), ("status", MilestoneStatus.DELAYED.value),
+        ],
+    )
+    assert [m["id"] for m in response.json()["data"]] == [str(in_window[0].id), str(in_window[2].id)]
+
+
+def test_milestone_calendar_is_one_query_per_page(db: Session) -> None:
+    project = create_random_project(db, milestones=0)
+    for days in (70, 71, 72):
+        add_milestone(db, project.id, days)
+    with Session(engine) as session, count_queries(engine) as statements:
+        milestones, _ = MilestoneService(session).get_milestones(
+            start_date=datetime.utcnow() + timedelta(days=69), limit=3
+        )
+    assert len(milestones) == 3
+    assert all(m.project_name == project.name for m in milestones)
+    assert len(statements) == 1
+
+
+def test_milestone_cursors_with_wrong_value_types(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    cursor = encode_cursor("not-a-date", "not-a-uuid")
+    for path in ("/milestones/", "/milestones/overdue"):
+        response = client.get(
+            f"{settings.API_V1_STR}{path}",
+            headers=superuser_token_headers,
+            params={"cursor": cursor},
+        )
+        assert response.status_code == 400
+        assert response.json() == {"detail": "Invalid cursor"}
+
+
+def test_milestone_routes_require_a_user(client: TestClient) -> None:
+    for path in ("/milestones/", "/milestones/overdue"):
+        response = client.get(f"{settings.API_V1_STR}{path}")
+        assert response.status_code == 401
@@ -0,0 +1,867 @@
+import csv
+import io
+import json
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlmodel import Session, select
+
+from app.core import compression
+from app.core.config import settings
+from app.core.pagination import encode_cursor
+from app.core.db import engine
+from app.models_pm import ProgressType, Project
+from app.schemas_pm import Project as ProjectSchema
+from app.schemas_pm import (
+    MilestoneCreate,
+    ProjectFilter,
+    ProgressCreate,
+    ProjectProductCreate,
+    ProjectUpdate,
+)
+from app.services.project_export_service import ProjectExportService
+from app.services.project_service import ProjectService
+from app.services.statistics_service import ProjectStatisticsService
+from app.services.user_cache import user_cache
+from tests.utils.project import create_random_project
+from tests.utils.user import create_random_user
+from tests.utils.utils import count_queries, random_lower_string
+
+
+def test_read_projects(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    create_random_project(db)
+    create_random_project(db)
+    response = client.get(
+        f"{settings.API_V1_STR}/projects/",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert len(content) >= 2
+    assert all(len(project["products"]) == 2 for project in content[:2])
+    assert all(len(project["milestones"]) == 2 for project in content[:2])
+
+
+def test_project_routes_authenticate_on_the_async_pool(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    project = create_random_project(db)
+    user_cache.clear()
+    checkouts = engine.pool.checkouts  # type: ignore[attr-defined]
+    response = client.get(
+        f"{settings.API_V1_STR}/projects/{project.id}", headers=superuser_token_headers
+    )
+    assert response.status_code == 200
+    assert engine.pool.checkouts == checkouts  # type: ignore[attr-defined]
+
+
+def test_read_projects_query_count_is_constant(db: Session) -> None:
+    for _ in range(5):
+        create_random_project(db)
+
+    counts = []
+    for limit in (1, 5):
+        with Session(engine) as session, count_queries(engine) as statements:
+            projects = ProjectService(session).get_projects(limit=limit)
+            [ProjectSchema.model_validate(project) for project in projects]
+        assert len(projects) == limit
+        counts.append(len(statements))
+    # one SELECT for projects plus one batched SELECT per child collection
+    assert counts == [5, 5]
+
+
+def test_read_projects_with_cursor(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    for _ in range(3):
+        create_random_project(db)
+    response = client.get(
+        f"{settings.API_V1_STR}/projects/", headers=superuser_token_headers
+    )
+    expected = [project["id"] for project in response.json()]
+
+    ids: list[str] = []
+    cursor = ""
+    while cursor is not None:
+        response = client.get(
+            f"{settings.API_V1_STR}/projects/",
+            headers=superuser_token_headers,
+            params={"cursor": cursor, "limit": 2},
+        )
+        assert response.status_code == 200
+        page = response.json()
+        ids.extend(project["id"] for project in page["data"])
+        cursor = page["next_cursor"]
+
+    assert ids == expected
+
+
+def test_projects_cursor_page_seeks_instead_of_offset(db: Session) -> None:
+    create_random_project(db)
+    create_random_project(db)
+    service = ProjectService(db)
+    first_page, cursor = service.get_projects_page(limit=1)
+    assert cursor is not None
+    with count_queries(engine) as statements:
+        second_page, _ = service.get_projects_page(cursor=cursor, limit=1)
+    assert second_page[0].created_at <= first_page[0].created_at
+    assert second_page[0].id != first_page[0].id
+    assert "OFFSET" not in statements[0].upper()
+
+
+def test_read_project_progresses(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    project = create_random_project(db)
+    user = create_random_user(db)
+    service = ProjectService(db)
+    start = datetime(2024, 1, 1)
+    for day in range(5):
+        service.add_progress(
+            project.id,
+            ProgressCreate(
+                description=random_lower_string(),
+                progress_type=ProgressType.WEEKLY if day % 2 else ProgressType.DAILY,
+                tracking_user_id=user.id,
+                progress_date=start + timedelta(days=day),
+            ),
+        )
+
+    response = client.get(
+        f"{settings.API_V1_STR}/projects/{project.id}/progresses",
+        headers=superuser_token_headers,
+        params={"progress_type": ProgressType.DAILY.value, "limit": 2},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert [p["progress_date"][:10] for p in content] == ["2024-01-05", "2024-01-03"]
+    assert all(p["tracking_user_name"] == user.email for p in content)
+
+    with count_queries(engine) as statements:
+        progresses = service.get_project_progresses(
+            project.id, start_date=start + timedelta(days=1), end_date=start + timedelta(days=3)
+        )
+    assert len(progresses) == 3
+    assert len(statements) == 1
+
+
+def _statistics_snapshot(service: ProjectStatisticsService) -> tuple:
+    statistics = service.get_project_statistics()
+    return (
+        statistics.total_projects,
+        sorted((s.location, s.count) for s in statistics.by_location),
+        sorted((s.product, s.count) for s in statistics.by_product),
+        sorted((s.project_type, s.count) for s in statistics.by_type),
+        sorted(tuple(r.values()) for r in service.get_location_product_relationship()),
+        sorted(tuple(r.values()) for r in service.get_product_type_statistics()),
+    )
+
+
+def test_statistics_counters_follow_project_changes(db: Session) -> None:
+    statistics_service = ProjectStatisticsService(db)
+    project_service = ProjectService(db)
+    before = statistics_service.get_project_statistics().total_projects
+
+    kept = create_random_project(db, location="华南", project_type="PoC")
+    closed = create_random_project(db, location="华东")
+    deleted = create_random_project(db)
+    project_service.update_project(
+        kept.id,
+        ProjectUpdate(
+            location="西北",
+            products=[
+                ProjectProductCreate(product_name="product-x"),
+                ProjectProductCreate(product_name="product-x"),
+            ],
+        ),
+    )
+    project_service.update_project(closed.id, ProjectUpdate(status="关闭"))
+    project_service.delete_project(deleted.id)
+
+    incremental = _statistics_snapshot(statistics_service)
+    assert incremental[0] == before + 1
+    statistics_service.rebuild()
+    assert _statistics_snapshot(statistics_service) == incremental
+
+
+def wait_for_lock_waiters(session: Session, count: int = 1, timeout: float = 5) -> None:
+    deadline = time.monotonic() + timeout
+    statement = text(
+        "SELECT count(*) FROM pg_stat_activity "
+        "WHERE datname = current_database() AND wait_event_type = 'Lock'"
+    )
+    while session.execute(statement).scalar_one() < count:
+        assert time.monotonic() < deadline, "the concurrent change never blocked"
+        time.sleep(0.02)
+
+
+def test_concurrent_project_changes_keep_statistics_consistent(db: Session) -> None:
+    project = create_random_project(db, location="华中")
+
+    def close() -> None:
+        with Session(engine) as session:
+            ProjectService(session).update_project(project.id, ProjectUpdate(status="关闭"))
+
+    with Session(engine) as session, Session(engine) as observer:
+        session.exec(select(Project).where(Project.id == project.id).with_for_update()).one()
+        worker = threading.Thread(target=close)
+        worker.start()
+        # the worker waits for the row lock before it reads the project's old contribution
+        wait_for_lock_waiters(observer)
+        ProjectService(session).update_project(project.id, ProjectUpdate(location="华西"))
+        worker.join(timeout=10)
+    assert not worker.is_alive()
+
+    statistics_service = ProjectStatisticsService(db)
+    incremental = _statistics_snapshot(statistics_service)
+    statistics_service.rebuild()
+    assert _statistics_snapshot(statistics_service) == incremental
+
+
+def test_read_project_statistics(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    create_random_project(db, location="东北")
+    response = client.get(
+        f"{settings.API_V1_STR}/projects/statistics",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["total_projects"] >= 1
+    assert any(s["location"] == "东北" for s in content["by_location"])
+
+
+def test_project_lifecycle(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    data = {
+        "name": random_lower_string(),
+        "project_type": "交付",
+        "location": "华中",
+        "products": [{"product_name": "product-a", "product_amount": 10.0}],
+        "milestones": [
+            {"milestone_date": "2030-01-01T00:00:00", "description": random_lower_string()}
+        ],
+    }
+    response = client.post(
+        f"{settings.API_V1_STR}/projects/", headers=superuser_token_headers, json=data
+    )
+    assert response.status_code == 200
+    project = response.json()
+    assert [p["product_name"] for p in project["products"]] == ["product-a"]
+    assert len(project["milestones"]) == 1
+
+    url = f"{settings.API_V1_STR}/projects/{project['id']}"
+    response = client.put(
+        url,
+        headers=superuser_token_headers,
+        json={"name": "renamed", "products": [{"product_name": "product-b"}]},
+    )
+    assert response.status_code == 200
+    assert response.json()["name"] == "renamed"
+    assert [p["product_name"] for p in response.json()["products"]] == ["product-b"]
+
+    response = client.post(f"{url}/close", headers=superuser_token_headers)
+    assert response.status_code == 200
+    assert response.json()["project"]["status"] == "关闭"
+
+    response = client.delete(url, headers=superuser_token_headers)
+    assert response.status_code == 200
+    response = client.get(url, headers=superuser_token_headers)
+    assert response.status_code == 404
+
+
+def test_update_project_only_writes_changed_children(db: Session) -> None:
+    project = create_random_project(db, products=3, milestones=3)
+    with Session(engine) as session:
+        before = ProjectSchema.model_validate(ProjectService(session).get_project(project.id))
+    milestones = [
+        MilestoneCreate.model_validate(m, from_attributes=True) for m in before.milestones
+    ]
+    milestones[1] = milestones[1].model_copy(update={"description": "changed"})
+    products = [
+        ProjectProductCreate.model_validate(p, from_attributes=True) for p in before.products
+    ]
+    products = products[1:] + [ProjectProductCreate(product_name="product-new")]
+
+    with Session(engine) as session, count_queries(engine) as statements:
+        updated = ProjectSchema.model_validate(
+            ProjectService(session).update_project(
+                project.id, ProjectUpdate(milestones=milestones, products=products)
+            )
+        )
+    writes = [s.split()[0] for s in statements if s.split()[0] in ("INSERT", "UPDATE", "DELETE")]
+    # one product DELETE, one product INSERT, one milestone UPDATE, the project
+    # UPDATE, the statistics counter upsert and the data version bump
+    assert sorted(writes) == ["DELETE", "INSERT", "INSERT", "INSERT", "UPDATE", "UPDATE"]
+
+    assert {m.id for m in updated.milestones} == {m.id for m in before.milestones}
+    assert {m.description for m in updated.milestones} == {
+        before.milestones[0].description, "changed", before.milestones[2].description
+    }
+    kept_ids = {p.id for p in before.products[1:]}
+    assert kept_ids < {p.id for p in updated.products}
+    assert sorted(p.product_name for p in updated.products) == [
+        "product-1", "product-2", "product-new"
+    ]
+
+
+def test_bulk_delete_projects(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    user = create_random_user(db)
+    projects = [create_random_project(db) for _ in range(3)]
+    ProjectService(db).add_progress(
+        projects[0].id,
+        ProgressCreate(description=random_lower_string(), tracking_user_id=user.id),
+    )
+    ids = [str(project.id) for project in projects[:2]]
+
+    with count_queries(engine) as statements:
+        ProjectService(db).delete_projects([])
+    assert statements == []
+
+    response = client.post(
+        f"{settings.API_V1_STR}/projects/bulk-delete",
+        headers=superuser_token_headers,
+        json={"project_ids": ids + [ids[0]]},
+    )
+    assert response.status_code == 200
+    assert response.json()["deleted"] == 2
+    for project_id in ids:
+        response = client.get(
+            f"{settings.API_V1_STR}/projects/{project_id}", headers=superuser_token_headers
+        )
+        assert response.status_code == 404
+    response = client.get(
+        f"{settings.API_V1_STR}/projects/{projects[2].id}", headers=superuser_token_headers
+    )
+    assert response.status_code == 200
+
+
+def test_delete_project_uses_set_based_statements(db: Session) -> None:
+    project = create_random_project(db, products=5, milestones=5, roles=5)
+    with Session(engine) as session, count_queries(engine) as statements:
+        assert ProjectService(session).delete_project(project.id)
+    deletes = [s for s in statements if s.startswith("DELETE")]
+    assert len(deletes) == 5
+    assert not any(s.startswith("SELECT milestone") for s in statements)
+
+
+def test_create_project_is_one_transaction_with_bulk_inserts() -> None:
+    with Session(engine) as session, count_queries(engine) as statements:
+        project = create_random_project(session, products=50, milestones=50, roles=20)
+        schema = ProjectSchema.model_validate(project)
+    # project, three multi-row child INSERTs, the statistics upsert and the data
+    # version bump; no refresh SELECTs
+    assert len(statements) == 6
+    assert not any(s.startswith("SELECT") for s in statements)
+    assert (len(schema.products), len(schema.milestones), len(schema.role_assignments)) == (
+        50,
+        50,
+        20,
+    )
+
+    with Session(engine) as session:
+        stored = ProjectSchema.model_validate(ProjectService(session).get_project(project.id))
+    for collection in ("products", "milestones", "role_assignments"):
+        assert sorted(getattr(stored, collection), key=lambda c: c.id) == sorted(
+            getattr(schema, collection), key=lambda c: c.id
+        )
+    assert stored.model_dump(exclude={"products", "milestones", "role_assignments"}) == (
+        schema.model_dump(exclude={"products", "milestones", "role_assignments"})
+    )
+
+
+def test_import_projects_csv(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    name = random_lower_string()
+    csv_content = (
+        "name,project_type,location,contract_amount,products,milestones\n"
+        f'{name}-1,交付,华北,100,"[{{""product_name"": ""product-a""}}]",\n'
+        f"{name}-2,PoC,华南,,,\n"
+        f"{name}-3,PoC,华南,not-a-number,,\n"
+        f'{name}-4,交付,,,"[broken",\n'
+    )
+    response = client.post(
+        f"{settings.API_V1_STR}/projects/import",
+        headers=superuser_token_headers,
+        files={"file": ("projects.csv", csv_content.encode(), "text/csv")},
+        params={"batch_size": 1},
+    )
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["total"], result["imported"], result["failed"]) == (4, 2, 2)
+    assert [error["row"] for error in result["errors"]] == [4, 5]
+    assert result["errors"][0]["errors"][0]["loc"] == ["contract_amount"]
+
+    response = client.get(f"{settings.API_V1_STR}/projects/", headers=superuser_token_headers)
+    imported = {p["name"]: p for p in response.json() if p["name"].startswith(name)}
+    assert set(imported) == {f"{name}-1", f"{name}-2"}
+    assert [p["product_name"] for p in imported[f"{name}-1"]["products"]] == ["product-a"]
+    assert imported[f"{name}-1"]["import_time"] is not None
+
+
+def test_import_projects_jsonl(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    name = random_lower_string()
+    lines = [
+        {"name": f"{name}-{i}", "project_type": "交付", "location": "华东",
+         "role_assignments": [{"role_name": "行解", "user_name": "someone"}]}
+        for i in range(5)
+    ]
+    content = "\n".join(json.dumps(line, ensure_ascii=False) for line in lines)
+    content += '\n\n{"name": "missing fields"}\nnot json\n'
+    response = client.post(
+        f"{settings.API_V1_STR}/projects/import",
+        headers=superuser_token_headers,
+        files={"file": ("projects.jsonl", content.encode(), "application/x-ndjson")},
+        params={"batch_size": 2},
+    )
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["total"], result["imported"], result["failed"]) == (7, 5, 2)
+    assert [error["row"] for error in result["errors"]] == [7, 8]
+
+
+def test_import_projects_that_are_not_utf8(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    name = random_lower_string()
+    csv_content = (
+        "name,project_type,location\n".encode()
+        + f"{name}-1,交付,华北\n".encode()
+        + f"{name}-2,交付,华北\n".encode("gbk")
+    )
+    jsonl_content = (
+        json.dumps({"name": f"{name}-3", "project_type": "交付", "location": "华北"}).encode()
+        + b"\n"
+        + json.dumps({"name": f"{name}-4", "project_type": "交付", "location": "华北"},
+                     ensure_ascii=False).encode("gbk")
+    )
+    for filename, content, row in (("projects.csv", csv_content, 3), ("projects.jsonl", jsonl_content, 2)):
+        response = client.post(
+            f"{settings.API_V1_STR}/projects/import",
+            headers=superuser_token_headers,
+            files={"file": (filename, content)},
+        )
+        assert response.status_code == 200
+        result = response.json()
+        assert (result["total"], result["imported"], result["failed"]) == (1, 1, 0)
+        assert result["file_error"] == f"第 {row} 行不是 UTF-8 编码，从该行起未导入"
+
+
+def test_export_projects(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    location = random_lower_string()
+    projects = [create_random_project(db, location=location) for _ in range(3)]
+    user = create_random_user(db)
+    ProjectService(db).add_progress(
+        projects[0].id,
+        ProgressCreate(description=random_lower_string(), tracking_user_id=user.id),
+    )
+
+    response = client.get(
+        f"{settings.API_V1_STR}/projects/export",
+        headers=superuser_token_headers,
+        params={"location": location, "include_progresses": True},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    exported = [json.loads(line) for line in response.text.splitlines()]
+    assert [p["id"] for p in exported] == [str(p.id) for p in projects]
+    assert all(len(p["products"]) == 2 for p in exported)
+    assert len(exported[0]["progresses"]) == 1
+
+    response = client.get(
+        f"{settings.API_V1_STR}/projects/export",
+        headers=superuser_token_headers,
+        params={"location": location, "format": "csv"},
+    )
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["id"] for row in rows] == [str(p.id) for p in projects]
+    assert "progresses" not in rows[0]
+    assert len(json.loads(rows[0]["milestones"])) == 2
+
+    # the CSV export can be imported again
+    response = client.post(
+        f"{settings.API_V1_STR}/projects/import",
+        headers=superuser_token_headers,
+        files={"file": ("projects.csv", response.content, "text/csv")},
+    )
+    assert response.json()["imported"] == 3
+
+
+def test_export_projects_uses_server_side_batches(db: Session) -> None:
+    location = random_lower_string()
+    for _ in range(5):
+        create_random_project(db, location=location)
+    export_service = ProjectExportService(ProjectFilter(location=location), batch_size=2)
+    with count_queries(engine) as statements:
+        exported = list(export_service.iter_ndjson())
+    assert len(exported) == 5
+    # one cursor plus three batched child loads per batch of two projects
+    assert len([s for s in statements if s.startswith("SELECT")]) == 1 + 3 * 3
+
+
+def test_read_projects_with_filters_and_sort(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    location = random_lower_string()
+    service = ProjectService(db)
+    projects = [create_random_project(db, location=location) for _ in range(4)]
+    for amount, project in zip((300.0, 100.0, 200.0), projects):
+        service.update_project(project.id, ProjectUpdate(contract_amount=amount))
+    service.update_project(
+        projects[0].id, ProjectUpdate(products=[ProjectProductCreate(product_name="special")])
+    )
+    service.update_project(projects[3].id, ProjectUpdate(status="关闭"))
+    url = f"{settings.API_V1_STR}/projects/"
+
+    response = client.get(
+        url,
+        headers=superuser_token_headers,
+        params={"location": location, "status": "正常", "sort": "-contract_amount", "limit": 2},
+    )
+    assert response.status_code == 200
+    assert response.headers["X-Total-Count"] == "3"
+    assert [p["id"] for p in response.json()] == [str(projects[0].id), str(projects[2].id)]
+
+    response = client.get(
+        url,
+        headers=superuser_token_headers,
+        params={"location": location, "min_amount": 150, "max_amount": 250},
+    )
+    assert [p["id"] for p in response.json()] == [str(projects[2].id)]
+
+    response = client.get(
+        url, headers=superuser_token_headers, params={"location": location, "product": "special"}
+    )
+    assert [p["id"] for p in response.json()] == [str(projects[0].id)]
+    assert response.headers["X-Total-Count"] == "1"
+
+    response = client.get(
+        url,
+        headers=superuser_token_headers,
+        params={"location": location, "skip": 10},
+    )
+    assert response.json() == []
+    assert response.headers["X-Total-Count"] == "4"
+
+    response = client.get(
+        url,
+        headers=superuser_token_headers,
+        params={"location": location, "cursor": "", "limit": 3, "sort": "name"},
+    )
+    page = response.json()
+    assert page["total"] == 4
+    assert [p["name"] for p in page["data"]] == sorted(p.name for p in projects)[:3]
+    response = client.get(
+        url,
+        headers=superuser_token_headers,
+        params={"location": location, "cursor": page["next_cursor"], "limit": 3, "sort": "name"},
+    )
+    assert response.json()["total"] is None
+    assert len(response.json()["data"]) == 1
+
+    response = client.get(
+        url, headers=superuser_token_headers, params={"cursor": "", "sort": "contract_amount"}
+    )
+    assert response.status_code == 400
+
+
+def test_read_projects_total_is_a_narrow_count(db: Session) -> None:
+    location = random_lower_string()
+    for _ in range(3):
+        create_random_project(db, location=location)
+    filters = ProjectFilter(location=location)
+
+    with Session(engine) as session, count_queries(engine) as statements:
+        projects, total = ProjectService(session).get_projects_with_total(limit=2, filters=filters)
+    assert (len(projects), total) == (2, 3)
+    # the list query plus its child loads, then a count over project alone
+    assert len(statements) == 6
+    assert not any("OVER" in statement for statement in statements)
+    assert statements[-1].startswith("SELECT count(*)")
+    assert "JOIN" not in statements[-1]
+
+    # a partial page already gives the total
+    with Session(engine) as session, count_queries(engine) as statements:
+        projects, total = ProjectService(session).get_projects_with_total(
+            skip=2, limit=2, filters=filters
+        )
+    assert (len(projects), total) == (1, 3)
+    assert len(statements) == 5
+
+
+def test_read_projects_summary_view(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    project = create_random_project(db, products=3)
+    full = client.get(
+        f"{settings.API_V1_STR}/projects/", headers=superuser_token_headers
+    )
+    response = client.get(
+        f"{settings.API_V1_STR}/projects/",
+        headers=superuser_token_headers,
+        params={"view": "summary"},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert [p["id"] for p in content] == [p["id"] for p in full.json()]
+    assert response.headers["X-Total-Count"] == full.headers["X-Total-Count"]
+    summary = next(p for p in content if p["id"] == str(project.id))
+    assert summary["product_names"] == ["product-0", "product-1", "product-2"]
+    assert "milestones" not in summary and "background" not in summary
+    assert len(response.content) < len(full.content)
+
+    response = client.get(
+        f"{settings.API_V1_STR}/projects/{project.id}",
+        headers=superuser_token_headers,
+        params={"view": "summary"},
+    )
+    assert response.status_code == 200
+    assert response.json() == summary
+
+
+def test_read_projects_summary_view_with_cursor(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    for _ in range(3):
+        create_random_project(db, products=0)
+    response = client.get(
+        f"{settings.API_V1_STR}/projects/",
+        headers=superuser_token_headers,
+        params={"view": "summary"},
+    )
+    expected = [project["id"] for project in response.json()]
+
+    ids: list[str] = []
+    cursor = ""
+    while cursor is not None:
+        page = client.get(
+            f"{settings.API_V1_STR}/projects/",
+            headers=superuser_token_headers,
+            params={"cursor": cursor, "limit": 2, "view": "summary"},
+        ).json()
+        ids.extend(project["id"] for project in page["data"])
+        cursor = page["next_cursor"]
+    assert ids == expected
+
+
+def test_project_summaries_are_one_statement(db: Session) -> None:
+    for _ in range(3):
+        create_random_project(db)
+    with Session(engine) as session, count_queries(engine) as statements:
+        summaries, total = ProjectService(session).get_project_summaries(limit=3)
+    assert len(summaries) == 3
+    assert total >= 3
+    # columns and product names in one statement, no child rows; the full page adds the count
+    assert len(statements) == 2
+    assert "progress" not in statements[0].lower()
+    assert statements[1].startswith("SELECT count(*)")
+
+
+def test_project_list_is_compressed(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    for _ in range(3):
+        create_random_project(db)
+    plain = client.get(
+        f"{settings.API_V1_STR}/projects/",
+        headers={**superuser_token_headers, "Accept-Encoding": "identity"},
+    )
+    assert "content-encoding" not in plain.headers
+
+    # brotli is an optional extra; without it only gzip is offered
+    encodings = ["gzip"] if compression.brotli is None else ["gzip", "br"]
+    for encoding in encodings:
+        response = client.get(
+            f"{settings.API_V1_STR}/projects/",
+            headers={**superuser_token_headers, "Accept-Encoding": encoding},
+        )
+        assert response.headers["content-encoding"] == encoding
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert int(response.headers["content-length"]) < len(plain.content)
+        assert response.json() == plain.json()
+
+    # clients that refuse brotli fall back to gzip
+    response = client.get(
+        f"{settings.API_V1_STR}/projects/",
+        headers={**superuser_token_headers, "Accept-Encoding": "br;q=0, gzip"},
+    )
+    assert response.headers["content-encoding"] == "gzip"
+
+
+def test_small_and_streamed_responses_compression(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    project = create_random_project(db)
+    response = client.get(
+        f"{settings.API_V1_STR}/utils/health-check/",
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert response.status_code == 200
+    assert len(response.content) < settings.COMPRESSION_MINIMUM_SIZE
+    assert "content-encoding" not in response.headers
+
+    response = client.get(
+        f"{settings.API_V1_STR}/projects/export",
+        headers={**superuser_token_headers, "Accept-Encoding": "gzip"},
+    )
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert str(project.id) in response.text
+
+
+def test_statistics_and_detail_honour_if_none_match(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    project = create_random_project(db)
+    urls = [
+        f"{settings.API_V1_STR}/projects/statistics",
+        f"{settings.API_V1_STR}/projects/statistics/location-product-relationship",
+        f"{settings.API_V1_STR}/projects/statistics/product-type",
+        f"{settings.API_V1_STR}/projects/{project.id}",
+    ]
+    etags = {}
+    for url in urls:
+        response = client.get(url, headers=superuser_token_headers)
+        assert response.status_code == 200
+        assert "must-revalidate" in response.headers["cache-control"]
+        etags[url] = response.headers["etag"]
+
+        with count_queries(engine) as statements:
+            response = client.get(
+                url, headers={**superuser_token_headers, "If-None-Match": etags[url]}
+            )
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etags[url]
+        # only the data version is read; no statistics or project queries run
+        assert len([s for s in statements if "data_version" not in s]) == 0
+    assert len(set(etags.values())) == len(urls)
+
+    summary = client.get(
+        urls[-1], headers={**superuser_token_headers, "If-None-Match": etags[urls[-1]]},
+        params={"view": "summary"},
+    )
+    assert summary.status_code == 200
+
+    # any project write moves every ETag on
+    ProjectService(db).update_project(project.id, ProjectUpdate(status="完成"))
+    for url in urls:
+        response = client.get(
+            url, headers={**superuser_token_headers, "If-None-Match": etags[url]}
+        )
+        assert response.status_code == 200
+        assert response.headers["etag"] != etags[url]
+
+
+def test_compressed_responses_have_their_own_etag(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    create_random_project(db, products=3)
+    url = f"{settings.API_V1_STR}/projects/statistics/location-product-relationship"
+    plain = client.get(url, headers={**superuser_token_headers, "Accept-Encoding": "identity"})
+    assert len(plain.content) >= settings.COMPRESSION_MINIMUM_SIZE
+    assert "content-encoding" not in plain.headers
+
+    etags = {plain.headers["etag"]}
+    encodings = ["gzip"] if compression.brotli is None else ["gzip", "br"]
+    for encoding in encodings:
+        response = client.get(url, headers={**superuser_token_headers, "Accept-Encoding": encoding})
+        assert response.headers["content-encoding"] == encoding
+        assert response.headers["etag"] == f'{plain.headers["etag"][:-1]}-{encoding}"'
+        etags.add(response.headers["etag"])
+
+        # the compressed tag revalidates and the 304 carries it back unchanged
+        response = client.get(
+            url,
+            headers={
+                **superuser_token_headers,
+                "Accept-Encoding": encoding,
+                "If-None-Match": response.headers["etag"],
+            },
+        )
+        assert response.status_code == 304
+        assert response.headers["etag"] == f'{plain.headers["etag"][:-1]}-{encoding}"'
+    assert len(etags) == len(encodings) + 1
+
+
+def test_dashboard_matches_statistics_endpoints_in_one_query(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    create_random_project(db, location="华南", project_type="PoC", products=3)
+    closed_location = random_lower_string()
+    closed = create_random_project(db, location=closed_location, products=1)
+    ProjectService(db).update_project(closed.id, ProjectUpdate(status="关闭"))
+
+    response = client.get(
+        f"{settings.API_V1_STR}/projects/dashboard", headers=superuser_token_headers
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"]
+    dashboard = response.json()
+
+    def fetch(path: str) -> Any:
+        return client.get(
+            f"{settings.API_V1_STR}/projects/{path}", headers=superuser_token_headers
+        ).json()
+
+    def by(key: str, rows: list[dict[str, Any]]) -> dict[Any, Any]:
+        return {row[key]: row for row in rows}
+
+    statistics = fetch("statistics")
+    assert dashboard["statistics"]["total_projects"] == statistics["total_projects"]
+    for field, key in (("by_location", "location"), ("by_product", "product"), ("by_type", "project_type")):
+        assert by(key, dashboard["statistics"][field]) == by(key, statistics[field])
+    assert closed_location not in by("location", dashboard["statistics"]["by_location"])
+
+    def link(row: dict[str, Any]) -> tuple[str, str, int]:
+        return (row["location"], row["product"], row["count"])
+
+    assert sorted(map(link, dashboard["location_product"])) == sorted(
+        map(link, fetch("statistics/location-product-relationship"))
+    )
+    assert by("product", dashboard["product_type"]) == by(
+        "product", fetch("statistics/product-type")
+    )
+
+    with Session(engine) as session, count_queries(engine) as statements:
+        ProjectStatisticsService(session).get_dashboard()
+    assert len(statements) == 1
+    assert "GROUPING SETS" in statements[0].upper()
+
+
+def test_read_projects_cursor_with_wrong_value_types(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    for cursor in (
+        encode_cursor("not-a-date", "not-a-uuid"),
+        encode_cursor(uuid.uuid4(), datetime.utcnow()),
+        encode_cursor({"uuid": 1}, {"dt": 2}),
+        # wrong number of values
+        encode_cursor(datetime.utcnow()),
+        encode_cursor(datetime.utcnow(), uuid.uuid4(), uuid.uuid4()),
+    ):
+        for sort in ("-created_at", "name"):
+            response = client.get(
+                f"{settings.API_V1_STR}/projects/",
+                headers=superuser_token_headers,
+                params={"cursor": cursor, "sort": sort},
+            )
+            assert response.status_code == 400, (cursor, sort)
+            assert response.json() == {"detail": "Invalid cursor"}
@@ -168,6 +168,44 @@ def test_retrieve_users(
         assert "email" in item
 
 
+def test_retrieve_users_with_cursor(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    for _ in range(3):
+        user_in = UserCreate(email=random_email(), password=random_lower_string())
+        crud.create_user(session=db, user_create=user_in)
+
+    emails: list[str] = []
+    cursor = ""
+    while True:
+        r = client.get(
+            f"{settings.API_V1_STR}/users/",
+            headers=superuser_token_headers,
+            params={"cursor": cursor, "limit": 2},
+        )
+        assert r.status_code == 200
+        page = r.json()
+        assert len(page["data"]) <= 2
+        emails.extend(user["email"] for user in page["data"])
+        if page["next_cursor"] is None:
+            break
+        cursor = page["next_cursor"]
+
+    assert len(emails) == len(set(emails)) == page["count"]
+
+
+def test_retrieve_users_invalid_cursor(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/users/",
+        headers=superuser_token_headers,
+        params={"cursor": "not-a-cursor"},
+    )
+    assert r.status_code == 400
+    assert r.json() == {"detail": "Invalid cursor"}
+
+
 def test_update_user_me(
     client: TestClient, normal_user_token_headers: dict[str, str], db: Session
 ) -> None:
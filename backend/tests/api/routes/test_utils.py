@@ -0,0 +1,54 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app.core.config import settings
+
+
+def test_pool_stats(client: TestClient, superuser_token_headers: dict[str, str]) -> None:
+    # the project routes run on the async engine
+    client.get(f"{settings.API_V1_STR}/projects/", headers=superuser_token_headers)
+    r = client.get(f"{settings.API_V1_STR}/utils/pool-stats/", headers=superuser_token_headers)
+    assert r.status_code == 200
+    for stats in (r.json()["sync_pool"], r.json()["async_pool"]):
+        assert stats["size"] == settings.DB_POOL_SIZE
+        assert stats["max_overflow"] == settings.DB_MAX_OVERFLOW
+        assert stats["checkouts"] > 0
+        assert stats["wait_time_total"] >= 0
+
+
+def test_cache_stats(client: TestClient, superuser_token_headers: dict[str, str]) -> None:
+    client.get(f"{settings.API_V1_STR}/users/me", headers=superuser_token_headers)
+    r = client.get(f"{settings.API_V1_STR}/utils/cache-stats/", headers=superuser_token_headers)
+    assert r.status_code == 200
+    stats = r.json()
+    assert stats["user"]["hits"] + stats["user"]["misses"] > 0
+    assert stats["user"]["size"] >= 1
+    assert set(stats["permission"]) == {"hits", "misses", "size"}
+
+
+def test_password_hasher_stats(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/password-hasher-stats/", headers=superuser_token_headers
+    )
+    assert r.status_code == 200
+    stats = r.json()
+    assert stats["processes"] == settings.PASSWORD_HASH_PROCESSES
+    assert stats["max_concurrency"] == settings.PASSWORD_HASH_MAX_CONCURRENCY
+    # the superuser logged in through the pool to get its token
+    assert stats["completed"] > 0
+    assert stats["in_flight"] == stats["waiting"] == 0
+
+
+def test_pool_stats_requires_superuser(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.get(f"{settings.API_V1_STR}/utils/pool-stats/", headers=normal_user_token_headers)
+    assert r.status_code == 403
+
+
+def test_connection_application_name(db: Session) -> None:
+    application_name = db.execute(text("SHOW application_name")).scalar_one()
+    assert application_name == settings.DB_APPLICATION_NAME
@@ -8,6 +8,15 @@ from app.core.config import settings
 from app.core.db import engine, init_db
 from app.main import app
 from app.models import Item, User
+from app.models_pm import (
+    Milestone,
+    Progress,
+    Project,
+    ProjectProduct,
+    ProjectStatCounter,
+    RoleAssignment,
+)
+from app.models_rbac import UserRole
 from tests.utils.user import authentication_token_from_email
 from tests.utils.utils import get_superuser_token_headers
 
@@ -17,6 +26,16 @@ def db() -> Generator[Session, None, None]:
     with Session(engine) as session:
         init_db(session)
         yield session
+        for model in (
+            Progress,
+            Milestone,
+            RoleAssignment,
+            ProjectProduct,
+            Project,
+            ProjectStatCounter,
+            UserRole,
+        ):
+            session.execute(delete(model))
         statement = delete(Item)
         session.execute(statement)
         statement = delete(User)
@@ -0,0 +1,55 @@
+import asyncio
+import threading
+import time
+
+from app.core.security import PasswordHasher, pwd_context
+
+
+def test_password_hasher_replaces_a_broken_pool() -> None:
+    hasher = PasswordHasher(processes=1, max_concurrency=2)
+    try:
+        assert pwd_context.verify("secret", hasher.hash("secret"))
+        executor = hasher._get_executor()
+        for process in list(executor._processes.values()):  # type: ignore[attr-defined]
+            process.kill()
+            process.join()
+
+        assert pwd_context.verify("secret", hasher.hash("secret"))
+        assert hasher.stats()["restarts"] == 1
+        assert hasher._get_executor() is not executor
+    finally:
+        hasher.shutdown()
+
+
+def test_password_hasher_async_callers_share_a_bounded_semaphore() -> None:
+    hasher = PasswordHasher(processes=0, max_concurrency=2)
+    lock = threading.Lock()
+    running = peak = 0
+
+    def work(value: int) -> int:
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+        return value
+
+    async def burst() -> list[int]:
+        return await asyncio.gather(*(hasher._run_async(work, i) for i in range(6)))
+
+    assert asyncio.run(burst()) == list(range(6))
+    assert peak == 2
+    stats = hasher.stats()
+    assert (stats["completed"], stats["in_flight"], stats["waiting"]) == (6, 0, 0)
+
+
+def test_password_hasher_async_uses_the_pool() -> None:
+    hasher = PasswordHasher(processes=1, max_concurrency=1)
+    try:
+        hashed = asyncio.run(hasher.hash_async("secret"))
+        verified, new_hash = asyncio.run(hasher.verify_and_update_async("secret", hashed))
+        assert verified and new_hash is None
+    finally:
+        hasher.shutdown()
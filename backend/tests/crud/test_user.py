@@ -1,8 +1,9 @@
 from fastapi.encoders import jsonable_encoder
+from passlib.context import CryptContext
 from sqlmodel import Session
 
 from app import crud
-from app.core.security import verify_password
+from app.core.security import password_hasher, verify_password
 from app.models import User, UserCreate, UserUpdate
 from tests.utils.utils import random_email, random_lower_string
 
@@ -26,6 +27,26 @@ def test_authenticate_user(db: Session) -> None:
     assert user.email == authenticated_user.email
 
 
+def test_authenticate_user_rehashes_outdated_hash(db: Session) -> None:
+    email = random_email()
+    password = random_lower_string()
+    user = crud.create_user(
+        session=db, user_create=UserCreate(email=email, password=password)
+    )
+    weak_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4)
+    user.hashed_password = weak_context.hash(password)
+    db.add(user)
+    db.commit()
+
+    completed = password_hasher.stats()["completed"]
+    authenticated_user = crud.authenticate(session=db, email=email, password=password)
+    assert authenticated_user
+    assert not authenticated_user.hashed_password.startswith("$2b$04$")
+    assert verify_password(password, authenticated_user.hashed_password)
+    assert password_hasher.stats()["completed"] == completed + 2
+    assert password_hasher.stats()["in_flight"] == 0
+
+
 def test_not_authenticate_user(db: Session) -> None:
     email = random_email()
     password = random_lower_string()
@@ -0,0 +1,40 @@
+import pytest
+from fastapi import HTTPException
+from sqlmodel import Session
+
+from app.core.db import engine
+from app.decorators.permissions import (
+    require_all_permissions,
+    require_any_permission,
+    require_permission,
+    require_superuser,
+)
+from app.services.rbac_service import RBACService
+from tests.utils.user import create_random_user
+from tests.utils.utils import count_queries, random_lower_string
+
+
+def test_permission_dependencies(db: Session) -> None:
+    user = create_random_user(db)
+    rbac_service = RBACService(db)
+    role = rbac_service.create_role(random_lower_string())
+    permission = rbac_service.create_permission(random_lower_string(), "reports", "read")
+    rbac_service.assign_permission_to_role(str(role.id), str(permission.id))
+    rbac_service.assign_role_to_user(str(user.id), str(role.id))
+
+    required = [("reports", "read"), ("reports", "write")]
+    db.refresh(user)
+    with count_queries(engine) as statements:
+        assert require_permission("reports", "read")(session=db, current_user=user) == user
+        assert require_any_permission(required)(session=db, current_user=user) == user
+        with pytest.raises(HTTPException) as exc_info:
+            require_all_permissions(required)(session=db, current_user=user)
+    assert exc_info.value.status_code == 403
+    assert exc_info.value.detail == (
+        "Insufficient permissions. Required: reports:read and reports:write"
+    )
+    # every pair is answered from the permission set loaded by one query
+    assert len(statements) <= 1
+
+    with pytest.raises(HTTPException):
+        require_superuser(current_user=user)
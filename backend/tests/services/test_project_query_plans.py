@@ -0,0 +1,149 @@
+from collections.abc import Generator
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import event
+from sqlmodel import Session
+
+from app.core.db import engine
+from app.models_pm import MilestoneStatus, ProgressType
+from app.schemas_pm import (
+    MilestoneCreate,
+    ProjectFilter,
+    ProgressCreate,
+    ProjectProductCreate,
+    ProjectUpdate,
+)
+from app.services.milestone_service import MilestoneService
+from app.services.project_service import ProjectService
+from tests.utils.project import create_random_project
+from tests.utils.user import create_random_user
+from tests.utils.utils import random_lower_string
+
+
+@contextmanager
+def capture_queries() -> Generator[list[tuple[str, Any]], None, None]:
+    """Collect (statement, parameters) of every single-row statement run on the engine."""
+    queries: list[tuple[str, Any]] = []
+
+    def before_cursor_execute(
+        _conn: Any, _cursor: Any, statement: str, parameters: Any, _context: Any, executemany: bool
+    ) -> None:
+        if not executemany:
+            queries.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield queries
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def seq_scans(queries: list[tuple[str, Any]]) -> list[str]:
+    """
+    Return the statements whose plan still contains a sequential scan.
+
+    With enable_seqscan off the planner only falls back to a Seq Scan when no
+    index can serve the query, so small test tables behave like large ones.
+    """
+    offenders = []
+    with engine.connect() as connection:
+        connection.exec_driver_sql("SET enable_seqscan = off")
+        for statement, parameters in queries:
+            if statement.lstrip().upper().startswith("INSERT"):
+                continue
+            plan = connection.exec_driver_sql(f"EXPLAIN {statement}", parameters).all()
+            if any("Seq Scan" in row[0] for row in plan):
+                offenders.append(statement)
+        connection.rollback()
+    return offenders
+
+
+def test_project_service_queries_use_indexes(db: Session) -> None:
+    user = create_random_user(db)
+    other = create_random_project(db)
+    project_id = create_random_project(db).id
+    update = ProjectUpdate(
+        name=random_lower_string(),
+        products=[ProjectProductCreate(product_name="product-x")],
+        milestones=[MilestoneCreate(milestone_date=datetime(2030, 1, 1), description="m")],
+    )
+    progress = ProgressCreate(
+        description=random_lower_string(),
+        progress_type=ProgressType.WEEKLY,
+        tracking_user_id=user.id,
+        progress_date=datetime(2030, 1, 1),
+    )
+    # one session per call, as one request would
+    calls = [
+        lambda service: service.get_project(project_id),
+        lambda service: service.get_projects(limit=10),
+        lambda service: service.get_projects_with_total(
+            limit=10,
+            filters=ProjectFilter(status="正常", location="华北", product="product-1"),
+        ),
+        lambda service: service.get_projects_page(
+            cursor=service.get_projects_page(limit=1)[1], limit=10
+        ),
+        lambda service: service.update_project(project_id, update),
+        lambda service: service.add_progress(project_id, progress),
+        lambda service: service.get_project_milestones(project_id),
+        lambda service: service.get_project_progresses(
+            project_id, start_date=datetime(2029, 1, 1), limit=5
+        ),
+        lambda service: service.statistics.get_project_statistics(),
+        lambda service: service.statistics.get_location_product_relationship(),
+        lambda service: service.statistics.get_product_type_statistics(),
+        lambda service: service.delete_project(project_id),
+        lambda service: service.delete_project(other.id),
+    ]
+    with capture_queries() as queries:
+        with Session(engine) as session:
+            create_random_project(session)
+        for call in calls:
+            with Session(engine) as session:
+                call(ProjectService(session))
+
+    assert len(queries) > 20
+    assert seq_scans(queries) == []
+
+
+def test_milestone_queries_use_their_indexes() -> None:
+    with capture_queries() as queries:
+        with Session(engine) as session:
+            MilestoneService(session).mark_overdue()
+        with Session(engine) as session:
+            MilestoneService(session).get_overdue(limit=10)
+        with Session(engine) as session:
+            MilestoneService(session).get_milestones(
+                start_date=datetime(2030, 1, 1),
+                end_date=datetime(2030, 2, 1),
+                statuses=[MilestoneStatus.COMPLETED, MilestoneStatus.DELAYED],
+                limit=10,
+            )
+
+    statements = [
+        (statement, parameters)
+        for statement, parameters in queries
+        if statement.startswith(("UPDATE milestone", "SELECT milestone"))
+    ]
+    assert len(statements) == 3
+    assert seq_scans(statements) == []
+
+    # With sorting disabled the planner only keeps a Sort node when no index
+    # returns the rows in keyset order, i.e. when LIMIT cannot stop the scan early.
+    def sort_nodes(statement: str, parameters: Any, *disabled: str) -> list[str]:
+        with engine.connect() as connection:
+            connection.exec_driver_sql("ANALYZE milestone")
+            for setting in ("enable_seqscan", "enable_sort", "enable_bitmapscan", *disabled):
+                connection.exec_driver_sql(f"SET {setting} = off")
+            plan = connection.exec_driver_sql(f"EXPLAIN {statement}", parameters).all()
+            connection.rollback()
+        return [row[0] for row in plan if row[0].strip().lstrip("-> ").startswith("Sort  (")]
+
+    # overdue: the partial (milestone_date, id) index already has the page order
+    assert sort_nodes(*statements[1], "enable_incremental_sort") == []
+    # calendar: (milestone_date, status) is presorted on the date, so at most an
+    # incremental sort over equal dates is left
+    assert sort_nodes(*statements[2]) == []
@@ -0,0 +1,47 @@
+from sqlmodel import Session
+
+from app.core.db import engine
+from app.services.permission_cache import permission_cache
+from app.services.rbac_service import RBACService
+from tests.utils.user import create_random_user
+from tests.utils.utils import count_queries, random_lower_string
+
+
+def test_has_permission_is_cached_and_invalidated(db: Session) -> None:
+    user = create_random_user(db)
+    user_id = str(user.id)
+    rbac_service = RBACService(db)
+    role = rbac_service.create_role(random_lower_string())
+    permission = rbac_service.create_permission(
+        random_lower_string(), "projects", "export"
+    )
+
+    assert not rbac_service.has_permission(user_id, "projects", "export")
+
+    rbac_service.assign_role_to_user(user_id, str(role.id))
+    rbac_service.assign_permission_to_role(str(role.id), str(permission.id))
+    assert rbac_service.has_permission(user_id, "projects", "export")
+
+    with count_queries(engine) as statements:
+        assert rbac_service.has_permission(user_id, "projects", "export")
+        assert not rbac_service.is_superuser(user_id)
+    assert statements == []
+
+    rbac_service.remove_permission_from_role(str(role.id), str(permission.id))
+    assert not rbac_service.has_permission(user_id, "projects", "export")
+
+
+def test_permission_cache_rejects_entries_loaded_before_bump(db: Session) -> None:
+    user = create_random_user(db)
+    rbac_service = RBACService(db)
+
+    def loader():  # type: ignore[no-untyped-def]
+        compiled = rbac_service._load_compiled_permissions(str(user.id))
+        permission_cache.bump()
+        return compiled
+
+    first = permission_cache.get(str(user.id), loader)
+    assert first.version != permission_cache.version
+    with count_queries(engine) as statements:
+        rbac_service.has_permission(str(user.id), "projects", "read")
+    assert len(statements) == 1
@@ -0,0 +1,108 @@
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.models_pm import Milestone, Progress, Project
+from app.schemas_pm import MilestoneCreate, ProgressCreate, ProjectCreate
+from app.services.project_service import ProjectService
+from app.services.search_service import (
+    ProjectSearchService,
+    SearchSupport,
+    detect_search_support,
+    highlight,
+)
+from tests.utils.user import create_random_user
+from tests.utils.utils import random_lower_string
+
+def seed_project(db: Session, keyword: str) -> tuple[Project, Progress, Milestone]:
+    service = ProjectService(db)
+    project = service.create_project(
+        ProjectCreate(
+            name=random_lower_string(),
+            project_type="交付",
+            location="华北",
+            background=f"background mentions {keyword} twice {keyword}",
+        )
+    )
+    user = create_random_user(db)
+    progress = service.add_progress(
+        project.id,
+        ProgressCreate(description=f"weekly sync about {keyword}", tracking_user_id=user.id),
+    )
+    milestone = service.add_milestone(
+        project.id,
+        MilestoneCreate(milestone_date=datetime(2030, 1, 1), description=f"deliver {keyword} phase"),
+    )
+    assert progress is not None and milestone is not None
+    return project, progress, milestone
+
+
+def test_search_projects(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    keyword = random_lower_string()
+    project, progress, milestone = seed_project(db, keyword)
+
+    response = client.get(
+        f"{settings.API_V1_STR}/projects/search",
+        headers=superuser_token_headers,
+        params={"q": keyword.upper(), "limit": 2},
+    )
+    assert response.status_code == 200
+    page = response.json()
+    assert page["data"][0]["source_id"] == str(project.id)
+    assert page["data"][1]["source"] in ("progress", "milestone")
+    assert f"<mark>{keyword}</mark>" in page["data"][0]["snippet"]
+    assert page["next_offset"] == 2
+
+    response = client.get(
+        f"{settings.API_V1_STR}/projects/search",
+        headers=superuser_token_headers,
+        params={"q": keyword, "offset": 2},
+    )
+    assert len(response.json()["data"]) == 1
+    assert response.json()["next_offset"] is None
+    assert {hit["source_id"] for hit in page["data"] + response.json()["data"]} == {
+        str(project.id), str(progress.id), str(milestone.id)
+    }
+
+
+def test_search_projects_in_process(db: Session) -> None:
+    keyword = random_lower_string()
+    project, progress, milestone = seed_project(db, keyword)
+    # the ILIKE fallback, whether or not the database has the search columns
+    search_service = ProjectSearchService(db, support=SearchSupport())
+    page = search_service.search(keyword.upper(), limit=2)
+    assert page.data[0].source_id == project.id
+    assert page.data[1].source in ("progress", "milestone")
+    assert f"<mark>{keyword}</mark>" in page.data[0].snippet
+    assert page.next_offset == 2
+
+    rest = search_service.search(keyword, offset=2)
+    assert rest.next_offset is None
+    assert {hit.source_id for hit in page.data + rest.data} == {project.id, progress.id, milestone.id}
+
+
+def test_search_projects_fulltext(db: Session) -> None:
+    if not detect_search_support(db).fulltext:
+        pytest.skip("the search_vector columns of migration e7c2d9a3b514 are missing")
+    keyword = random_lower_string()
+    project, progress, milestone = seed_project(db, keyword)
+    search_service = ProjectSearchService(db, support=SearchSupport(fulltext=True))
+    page = search_service.search(keyword, limit=5)
+    assert page.data[0].source_id == project.id
+    assert {hit.source_id for hit in page.data} == {project.id, progress.id, milestone.id}
+    assert f"<mark>{keyword}</mark>" in page.data[0].snippet
+    assert search_service.search(f"{keyword} missing").data == []
+    assert len(search_service.search(f"{keyword} -deliver").data) == 2
+
+
+def test_highlight() -> None:
+    content = "x" * 100 + " Alpha beta alpha " + "y" * 100
+    snippet = highlight(content, ["alpha"])
+    assert snippet.startswith("…") and snippet.endswith("…")
+    assert snippet.count("<mark>") == 2
+    assert "<mark>Alpha</mark>" in snippet
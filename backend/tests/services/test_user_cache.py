@@ -0,0 +1,110 @@
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func, update
+from sqlmodel import Session, select
+
+from app import crud
+from app.core.config import settings
+from app.core.db import engine
+from app.core.security import get_password_hash
+from app.models import User, UserCreate, UserUpdate
+from app.services.user_cache import USER_CHANGED_CHANNEL, get_user, user_cache
+from tests.utils.user import create_random_user, user_authentication_headers
+from tests.utils.utils import count_queries, random_email, random_lower_string
+
+
+def test_get_user_is_cached(db: Session) -> None:
+    user = create_random_user(db)
+    user_cache.invalidate(str(user.id))
+    hits = user_cache.hits
+
+    with Session(engine) as session:
+        assert get_user(session, user.id) is not None
+    with Session(engine) as session, count_queries(engine) as statements:
+        cached = get_user(session, user.id)
+        assert cached is not None
+        assert cached.email == user.email
+        assert cached in session
+    assert statements == []
+    assert user_cache.hits == hits + 1
+
+
+def test_inactive_user_is_not_cached(db: Session) -> None:
+    user = create_random_user(db)
+    crud.update_user(session=db, db_user=user, user_in=UserUpdate(is_active=False))
+
+    with Session(engine) as session:
+        assert get_user(session, user.id) is not None
+    assert user_cache.get(str(user.id)) is None
+
+
+def test_deactivated_user_is_rejected_immediately(client: TestClient, db: Session) -> None:
+    email = random_email()
+    password = random_lower_string()
+    user = crud.create_user(session=db, user_create=UserCreate(email=email, password=password))
+    headers = user_authentication_headers(client=client, email=email, password=password)
+
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+    assert r.status_code == 200
+    assert user_cache.get(str(user.id)) is not None
+
+    crud.update_user(session=db, db_user=user, user_in=UserUpdate(is_active=False))
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+    assert r.status_code == 400
+
+
+def test_update_user_me_through_cached_user(client: TestClient, db: Session) -> None:
+    email = random_email()
+    password = random_lower_string()
+    crud.create_user(session=db, user_create=UserCreate(email=email, password=password))
+    headers = user_authentication_headers(client=client, email=email, password=password)
+
+    client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+    full_name = random_lower_string()
+    r = client.patch(
+        f"{settings.API_V1_STR}/users/me", headers=headers, json={"full_name": full_name}
+    )
+    assert r.status_code == 200
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+    assert r.json()["full_name"] == full_name
+
+
+def test_password_hash_is_read_from_the_database(client: TestClient, db: Session) -> None:
+    email = random_email()
+    password = random_lower_string()
+    user = crud.create_user(session=db, user_create=UserCreate(email=email, password=password))
+    headers = user_authentication_headers(client=client, email=email, password=password)
+    client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+    assert "hashed_password" not in user_cache.get(str(user.id))
+
+    # another worker changes the password; this worker's cache entry is still there
+    new_password = random_lower_string()
+    db.execute(
+        update(User).where(User.id == user.id).values(hashed_password=get_password_hash(new_password))
+    )
+    db.commit()
+    r = client.patch(
+        f"{settings.API_V1_STR}/users/me/password",
+        headers=headers,
+        json={"current_password": new_password, "new_password": random_lower_string()},
+    )
+    assert r.status_code == 200
+
+
+def test_user_changes_in_other_workers_evict_the_entry(client: TestClient, db: Session) -> None:
+    email = random_email()
+    password = random_lower_string()
+    user = crud.create_user(session=db, user_create=UserCreate(email=email, password=password))
+    headers = user_authentication_headers(client=client, email=email, password=password)
+    client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+    assert user_cache.get(str(user.id)) is not None
+
+    # the app's listener may still be connecting, so notify until the entry goes
+    deadline = time.monotonic() + 5
+    while user_cache.get(str(user.id)) is not None:
+        assert time.monotonic() < deadline, "the invalidation was never received"
+        with Session(engine) as session:
+            session.execute(select(func.pg_notify(USER_CHANGED_CHANNEL, str(user.id))))
+            session.commit()
+        time.sleep(0.05)
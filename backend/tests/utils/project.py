@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta
+
+from sqlmodel import Session
+
+from app.models_pm import Project
+from app.schemas_pm import (
+    MilestoneCreate,
+    ProjectCreate,
+    ProjectProductCreate,
+    RoleAssignmentCreate,
+)
+from app.services.project_service import ProjectService
+from tests.utils.utils import random_lower_string
+
+
+def create_random_project(
+    db: Session,
+    *,
+    location: str = "华北",
+    project_type: str = "交付",
+    products: int = 2,
+    milestones: int = 2,
+    roles: int = 1,
+) -> Project:
+    project_in = ProjectCreate(
+        name=random_lower_string(),
+        project_type=project_type,
+        location=location,
+        background=random_lower_string(),
+        products=[
+            ProjectProductCreate(product_name=f"product-{i}", product_amount=100.0 * i)
+            for i in range(products)
+        ],
+        milestones=[
+            MilestoneCreate(
+                milestone_date=datetime.utcnow() + timedelta(days=30 * (i + 1)),
+                description=random_lower_string(),
+            )
+            for i in range(milestones)
+        ],
+        role_assignments=[
+            RoleAssignmentCreate(role_name="行解", user_name=random_lower_string())
+            for _ in range(roles)
+        ],
+    )
+    return ProjectService(db).create_project(project_in)